@@ -13,10 +13,8 @@ This script demonstrates the complete workflow:
 Run this after starting the server with: python main.py
 """
 
-import requests
-import time
-import json
-from io import StringIO
+import asyncio
+import aiohttp
 
 BASE_URL = "http://localhost:8000"
 
@@ -26,20 +24,20 @@ def print_section(title):
     print(f"  {title}")
     print("="*60)
 
-def check_server():
+async def check_server(session):
     """Check if server is running."""
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=2)
-        if response.status_code == 200:
-            print("✅ Server is running!")
-            print(f"   Response: {response.json()}")
-            return True
-    except requests.exceptions.RequestException as e:
+        async with session.get("/health", timeout=aiohttp.ClientTimeout(total=2)) as response:
+            if response.status == 200:
+                print("✅ Server is running!")
+                print(f"   Response: {await response.json()}")
+                return True
+    except aiohttp.ClientError as e:
         print(f"❌ Server is not running. Please start it with: python main.py")
         print(f"   Error: {e}")
         return False
 
-def test_import_contacts():
+async def test_import_contacts(session):
     """Test CSV import."""
     print_section("1. Import Contacts from CSV")
 
@@ -51,11 +49,12 @@ Carol Davis,carol@fintech.com,FinTech Solutions,Finance
 David Lee,david@edutech.com,EduTech,Education
 Eve Martinez,eve@retailco.com,RetailCo,Retail"""
 
-    files = {'file': ('contacts.csv', StringIO(csv_content), 'text/csv')}
+    form = aiohttp.FormData()
+    form.add_field('file', csv_content, filename='contacts.csv', content_type='text/csv')
 
     try:
-        response = requests.post(f"{BASE_URL}/api/contacts/import", files=files)
-        result = response.json()
+        async with session.post("/api/contacts/import", data=form) as response:
+            result = await response.json()
 
         print(f"✅ Import successful!")
         print(f"   - Imported: {result['success_count']} contacts")
@@ -67,13 +66,13 @@ Eve Martinez,eve@retailco.com,RetailCo,Retail"""
         print(f"❌ Import failed: {e}")
         return False
 
-def test_list_contacts():
+async def test_list_contacts(session):
     """Test listing contacts."""
     print_section("2. List All Contacts")
 
     try:
-        response = requests.get(f"{BASE_URL}/api/contacts/")
-        contacts = response.json()
+        async with session.get("/api/contacts/") as response:
+            contacts = await response.json()
 
         print(f"✅ Found {len(contacts)} contacts:")
         for i, contact in enumerate(contacts[:5], 1):  # Show first 5
@@ -84,18 +83,18 @@ def test_list_contacts():
         print(f"❌ Failed to list contacts: {e}")
         return []
 
-def test_enrich_contacts(contact_ids):
+async def test_enrich_contacts(session, contact_ids):
     """Test AI enrichment."""
     print_section("3. Enrich Contacts with AI (Mock Mode)")
 
     print(f"📝 Note: Using mock OpenAI responses (set OPENAI_API_KEY in .env for real enrichment)")
 
     try:
-        response = requests.post(
-            f"{BASE_URL}/api/contacts/enrich/batch",
+        async with session.post(
+            "/api/contacts/enrich/batch",
             json={"contact_ids": contact_ids[:3]}  # Enrich first 3
-        )
-        result = response.json()
+        ) as response:
+            result = await response.json()
 
         print(f"✅ Enrichment completed!")
         print(f"   - Enriched: {result['count']} contacts")
@@ -106,13 +105,14 @@ def test_enrich_contacts(contact_ids):
         print(f"   This is expected if OPENAI_API_KEY is not set")
         return False
 
-def test_create_draft():
+async def test_create_draft(session):
     """Test draft creation."""
     print_section("4. Create Email Draft")
 
     try:
         # Get first contact
-        contacts = requests.get(f"{BASE_URL}/api/contacts/").json()
+        async with session.get("/api/contacts/") as response:
+            contacts = await response.json()
         if not contacts:
             print("❌ No contacts available")
             return None
@@ -120,41 +120,40 @@ def test_create_draft():
         contact_id = contacts[0]['id']
 
         # Create draft
-        response = requests.post(
-            f"{BASE_URL}/api/drafts/",
+        async with session.post(
+            "/api/drafts/",
             json={
                 "contact_id": contact_id,
                 "subject": "Quick question about {{company}}",
                 "body": "Hi {{name}},\n\nI noticed your work at {{company}} and wanted to reach out...\n\nBest regards"
             }
-        )
-
-        if response.status_code == 200:
-            draft = response.json()
-            print(f"✅ Draft created!")
-            print(f"   - Draft ID: {draft['id']}")
-            print(f"   - Subject: {draft['subject']}")
-            print(f"   - Status: {draft['status']}")
-            return draft['id']
-        else:
-            print(f"❌ Draft creation failed: {response.text}")
-            return None
+        ) as response:
+            if response.status == 200:
+                draft = await response.json()
+                print(f"✅ Draft created!")
+                print(f"   - Draft ID: {draft['id']}")
+                print(f"   - Subject: {draft['subject']}")
+                print(f"   - Status: {draft['status']}")
+                return draft['id']
+            else:
+                print(f"❌ Draft creation failed: {await response.text()}")
+                return None
 
     except Exception as e:
         print(f"❌ Draft creation failed: {e}")
         return None
 
-def test_approve_draft(draft_id):
+async def test_approve_draft(session, draft_id):
     """Test draft approval."""
     print_section("5. Approve Draft")
 
     try:
-        response = requests.post(
-            f"{BASE_URL}/api/drafts/{draft_id}/approve",
+        async with session.post(
+            f"/api/drafts/{draft_id}/approve",
             json={"notes": "Looks good!"}
-        )
+        ) as response:
+            result = await response.json()
 
-        result = response.json()
         print(f"✅ Draft approved!")
         print(f"   - Message: {result['message']}")
 
@@ -163,13 +162,13 @@ def test_approve_draft(draft_id):
         print(f"❌ Approval failed: {e}")
         return False
 
-def test_spam_check(draft_id):
+async def test_spam_check(session, draft_id):
     """Test spam score checking."""
     print_section("6. Check Spam Score")
 
     try:
-        response = requests.get(f"{BASE_URL}/api/drafts/{draft_id}/spam-score")
-        result = response.json()
+        async with session.get(f"/api/drafts/{draft_id}/spam-score") as response:
+            result = await response.json()
 
         print(f"✅ Spam check completed!")
         print(f"   - Score: {result['score']}/10")
@@ -182,34 +181,33 @@ def test_spam_check(draft_id):
         print(f"❌ Spam check failed: {e}")
         return False
 
-def test_send_draft(draft_id):
+async def test_send_draft(session, draft_id):
     """Test sending draft (mock mode)."""
     print_section("7. Send Email (Mock Mode)")
 
     try:
-        response = requests.post(
-            f"{BASE_URL}/api/drafts/{draft_id}/send",
+        async with session.post(
+            f"/api/drafts/{draft_id}/send",
             json={"mock_mode": True}  # Mock mode - won't actually send
-        )
+        ) as response:
+            result = await response.json()
 
-        result = response.json()
-        print(f"✅ Email sent (mock)!")
+        print(f"✅ Email queued (mock)!")
         print(f"   - Status: {result['status']}")
-        print(f"   - Message ID: {result.get('message_id', 'N/A')}")
+        print(f"   - Draft ID: {result['draft_id']}")
 
         return True
     except Exception as e:
         print(f"❌ Send failed: {e}")
         return False
 
-def test_campaign_stats():
+async def test_campaign_stats(session):
     """Test campaign statistics."""
-    print_section("8. Campaign Statistics")
-
     try:
-        response = requests.get(f"{BASE_URL}/api/campaigns/stats")
-        stats = response.json()
+        async with session.get("/api/campaigns/stats") as response:
+            stats = await response.json()
 
+        print_section("8. Campaign Statistics")
         print(f"✅ Statistics retrieved!")
         print(f"   Contacts:")
         print(f"     - Total: {stats['contacts']['total']}")
@@ -226,19 +224,18 @@ def test_campaign_stats():
         print(f"❌ Failed to get stats: {e}")
         return False
 
-def test_export_contacts():
+async def test_export_contacts(session):
     """Test contact export."""
-    print_section("9. Export Contacts to CSV")
-
     try:
-        response = requests.get(f"{BASE_URL}/api/contacts/export/csv")
-        result = response.json()
+        async with session.get("/api/contacts/export/csv") as response:
+            csv_data = await response.text()
+            filename = response.content_disposition.filename
 
-        csv_data = result['content']
         lines = csv_data.split('\n')
 
+        print_section("9. Export Contacts to CSV")
         print(f"✅ Export successful!")
-        print(f"   - Filename: {result['filename']}")
+        print(f"   - Filename: {filename}")
         print(f"   - Lines: {len(lines)}")
         print(f"   - Preview (first 3 lines):")
         for line in lines[:3]:
@@ -249,47 +246,40 @@ def test_export_contacts():
         print(f"❌ Export failed: {e}")
         return False
 
-def main():
+async def main():
     """Run all demo tests."""
     print("\n" + "🚀 "*20)
     print("  AI-DRIVEN OUTREACH ENGINE - DEMO")
     print("🚀 "*20)
 
-    # Check server
-    if not check_server():
-        return
-
-    time.sleep(1)
-
-    # Run tests
-    test_import_contacts()
-    time.sleep(0.5)
+    # One pooled session for the whole run so every probe reuses warm connections
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=30)
+    async with aiohttp.ClientSession(base_url=BASE_URL, connector=connector) as session:
+        # Check server
+        if not await check_server(session):
+            return
 
-    contacts = test_list_contacts()
-    time.sleep(0.5)
+        # Run tests (each step depends on the previous one's data)
+        await test_import_contacts(session)
 
-    if contacts:
-        contact_ids = [c['id'] for c in contacts]
-        test_enrich_contacts(contact_ids)
-        time.sleep(0.5)
+        contacts = await test_list_contacts(session)
 
-    draft_id = test_create_draft()
-    time.sleep(0.5)
+        if contacts:
+            contact_ids = [c['id'] for c in contacts]
+            await test_enrich_contacts(session, contact_ids)
 
-    if draft_id:
-        test_spam_check(draft_id)
-        time.sleep(0.5)
+        draft_id = await test_create_draft(session)
 
-        test_approve_draft(draft_id)
-        time.sleep(0.5)
+        if draft_id:
+            await test_spam_check(session, draft_id)
+            await test_approve_draft(session, draft_id)
+            await test_send_draft(session, draft_id)
 
-        test_send_draft(draft_id)
-        time.sleep(0.5)
-
-    test_campaign_stats()
-    time.sleep(0.5)
-
-    test_export_contacts()
+        # Read-only probes are independent, fan them out
+        await asyncio.gather(
+            test_campaign_stats(session),
+            test_export_contacts(session),
+        )
 
     # Summary
     print_section("✨ DEMO COMPLETE")
@@ -306,4 +296,4 @@ For full documentation, see README.md
     """)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -6,12 +6,18 @@ FastAPI backend for managing email outreach campaigns with AI enrichment.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
 from contextlib import asynccontextmanager
 import logging
 
-from src.database import engine, Base
+from src.database import dispose_engines, init_db
+from src.services.openai_client import close_async_openai_client, close_openai_client
+from src.services.sending import close_http_client
 from src.config import config
 from src.api import contacts, drafts, campaigns, replies
+from src.api.dependencies import limiter
 
 # Configure logging
 logging.basicConfig(
@@ -27,9 +33,8 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting AI-Driven Outreach Engine...")
 
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created")
+    # Create database tables (skipped when the schema version is current)
+    init_db()
 
     # Validate configuration
     if not config.OPENAI_API_KEY:
@@ -41,6 +46,10 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down...")
+    await dispose_engines()
+    close_http_client()
+    close_openai_client()
+    await close_async_openai_client()
 
 
 # Create FastAPI app
@@ -48,17 +57,23 @@ app = FastAPI(
     title="AI-Driven Outreach Engine",
     description="Intelligent email outreach automation with AI enrichment and clustering",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Rate limits for bulk endpoints answer 429 instead of reaching the handler
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+# Add CORS middleware only when browser origins are configured
+if config.CORS_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=config.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 # Include routers
 app.include_router(contacts.router)
@@ -68,7 +83,7 @@ app.include_router(replies.router)
 
 
 @app.get("/")
-def root():
+async def root():
     """Root endpoint."""
     return {
         "message": "AI-Driven Outreach Engine API",
@@ -78,7 +93,7 @@ def root():
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
@@ -88,7 +103,7 @@ def health_check():
 
 
 @app.get("/api/config")
-def get_config():
+async def get_config():
     """Get public configuration."""
     return {
         "daily_budget_limit": config.DAILY_BUDGET_LIMIT,
@@ -2,16 +2,20 @@
 Campaign workflow API endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import String, case, cast, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 from typing import List, Optional
 from pydantic import BaseModel
-from src.database import get_db
-from src.models import Contact, EmailTemplate, EmailDraft
+from src.database import get_db, get_async_db
+from src.models import Contact, ContactStatus, DraftStatus, EmailDraft, EmailTemplate, Reply
 from src.services.clustering import cluster_contacts
 from src.services.drafting import generate_email_drafts_bulk
 from src.services.followup import check_and_generate_followups
 from src.services.cost_tracker import CostTracker
+from src.config import config
+from src.api.dependencies import get_cost_tracker, limiter
 from src.services.import_export import export_campaign_data
 
 router = APIRouter(prefix="/api/campaigns", tags=["campaigns"])
@@ -42,24 +46,41 @@ class FollowupRequest(BaseModel):
 
 
 @router.post("/cluster", response_model=List[ClusterResponse])
-def cluster_contacts_endpoint(request: ClusterRequest, db: Session = Depends(get_db)):
+def cluster_contacts_endpoint(
+    request: ClusterRequest,
+    db: Session = Depends(get_db),
+    cost_tracker: CostTracker = Depends(get_cost_tracker)
+):
     """Cluster contacts by similarity for targeted campaigns."""
-    contacts = db.query(Contact).filter(Contact.id.in_(request.contact_ids)).all()
-
-    if not contacts:
-        raise HTTPException(status_code=404, detail="No contacts found")
-
-    # Check if contacts have embeddings
-    missing_embeddings = [c for c in contacts if not c.embedding]
+    # Check for missing embeddings in SQL so vectors are never loaded just to be discarded
+    missing_embeddings = db.query(func.count(Contact.id)).filter(
+        Contact.id.in_(request.contact_ids),
+        or_(
+            Contact.embedding.is_(None),
+            func.length(Contact.embedding) == 0,
+            # Rows written before embeddings were stored as float32 bytes
+            cast(Contact.embedding, String).in_(("null", "[]"))
+        )
+    ).scalar()
     if missing_embeddings:
         raise HTTPException(
             status_code=400,
-            detail=f"{len(missing_embeddings)} contacts missing embeddings. Enrich them first."
+            detail=f"{missing_embeddings} contacts missing embeddings. Enrich them first."
         )
 
-    try:
-        cost_tracker = CostTracker(db, user_id=1)
+    # Only the fields clustering reads; stored embeddings are reused by the service
+    contacts = db.query(Contact).options(
+        load_only(
+            Contact.id, Contact.name, Contact.industry,
+            Contact.company, Contact.painpoint, Contact.title,
+            Contact.embedding
+        )
+    ).filter(Contact.id.in_(request.contact_ids)).all()
 
+    if not contacts:
+        raise HTTPException(status_code=404, detail="No contacts found")
+
+    try:
         clusters = cluster_contacts(
             contacts=contacts,
             n_clusters=request.n_clusters,
@@ -85,21 +106,25 @@ def cluster_contacts_endpoint(request: ClusterRequest, db: Session = Depends(get
 
 
 @router.post("/drafts/bulk")
-def generate_bulk_drafts(request: BulkDraftRequest, db: Session = Depends(get_db)):
+@limiter.limit(config.BULK_RATE_LIMIT)
+def generate_bulk_drafts(
+    request: Request,
+    draft_request: BulkDraftRequest,
+    db: Session = Depends(get_db),
+    cost_tracker: CostTracker = Depends(get_cost_tracker)
+):
     """Generate drafts for multiple contacts using a template."""
-    contacts = db.query(Contact).filter(Contact.id.in_(request.contact_ids)).all()
+    contacts = db.query(Contact).filter(Contact.id.in_(draft_request.contact_ids)).all()
 
     if not contacts:
         raise HTTPException(status_code=404, detail="No contacts found")
 
-    template = db.query(EmailTemplate).filter(EmailTemplate.id == request.template_id).first()
+    template = db.query(EmailTemplate).filter(EmailTemplate.id == draft_request.template_id).first()
 
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
 
     try:
-        cost_tracker = CostTracker(db, user_id=1)
-
         drafts = generate_email_drafts_bulk(
             contacts=contacts,
             template=template,
@@ -117,11 +142,13 @@ def generate_bulk_drafts(request: BulkDraftRequest, db: Session = Depends(get_db
 
 
 @router.post("/followups/generate")
-def generate_followups(request: FollowupRequest, db: Session = Depends(get_db)):
+def generate_followups(
+    request: FollowupRequest,
+    db: Session = Depends(get_db),
+    cost_tracker: CostTracker = Depends(get_cost_tracker)
+):
     """Generate follow-up emails for non-responders."""
     try:
-        cost_tracker = CostTracker(db, user_id=1)
-
         followups = check_and_generate_followups(
             db=db,
             days_since_send=request.days_since_send,
@@ -162,25 +189,21 @@ def export_campaign(
 
 
 @router.get("/stats")
-def get_campaign_stats(db: Session = Depends(get_db)):
+async def get_campaign_stats(db: AsyncSession = Depends(get_async_db)):
     """Get campaign statistics."""
-    from src.models import DraftStatus, ContactStatus
-
-    total_contacts = db.query(Contact).filter(Contact.deleted == False).count()
-    enriched_contacts = db.query(Contact).filter(
-        Contact.status == ContactStatus.ENRICHED
-    ).count()
-
-    total_drafts = db.query(EmailDraft).count()
-    sent_drafts = db.query(EmailDraft).filter(
-        EmailDraft.status == DraftStatus.SENT
-    ).count()
-    pending_drafts = db.query(EmailDraft).filter(
-        EmailDraft.status == DraftStatus.PENDING_APPROVAL
-    ).count()
-
-    from src.models import Reply
-    total_replies = db.query(Reply).count()
+    # One round-trip per table, using conditional aggregates for the breakdowns
+    total_contacts, enriched_contacts = (await db.execute(select(
+        func.count(case((Contact.deleted == False, 1))),
+        func.count(case((Contact.status == ContactStatus.ENRICHED, 1)))
+    ))).one()
+
+    total_drafts, sent_drafts, pending_drafts = (await db.execute(select(
+        func.count(EmailDraft.id),
+        func.count(case((EmailDraft.status == DraftStatus.SENT, 1))),
+        func.count(case((EmailDraft.status == DraftStatus.PENDING_APPROVAL, 1)))
+    ))).one()
+
+    total_replies = await db.scalar(select(func.count(Reply.id)))
 
     return {
         "contacts": {
@@ -2,15 +2,22 @@
 Contact management API endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 from typing import List, Optional
-from pydantic import BaseModel, EmailStr
-from src.database import get_db
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, EmailStr
+from src.database import get_db, get_async_db, get_db_context, dialect_insert
 from src.models import Contact, ContactStatus
-from src.services.import_export import import_contacts, export_contacts, delete_contact_data
-from src.services.enrichment import enrich_contact, enrich_contacts_batch
+from src.services.import_export import import_contacts_stream, iter_contacts_csv, delete_contact_data
+from src.services.enrichment import enrich_contact, enrich_contacts_batch_async
 from src.services.cost_tracker import CostTracker
+from src.config import config
+from src.api.dependencies import get_cost_tracker, limiter
 
 router = APIRouter(prefix="/api/contacts", tags=["contacts"])
 
@@ -37,10 +44,16 @@ class ContactResponse(BaseModel):
     title: Optional[str]
     status: str
     relevance_score: Optional[float]
-    created_at: str
+    created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Columns ContactResponse reads; everything else (embedding, painpoint, ...) stays unloaded
+CONTACT_RESPONSE_COLUMNS = (
+    Contact.id, Contact.name, Contact.email, Contact.company, Contact.title,
+    Contact.status, Contact.relevance_score, Contact.created_at
+)
 
 
 class ImportResponse(BaseModel):
@@ -50,46 +63,76 @@ class ImportResponse(BaseModel):
     errors: List[str]
 
 
-@router.post("/", response_model=ContactResponse)
+@router.post("/", status_code=201, response_class=Response)
 def create_contact(contact: ContactCreate, db: Session = Depends(get_db)):
-    """Create a new contact."""
-    # Check for duplicates
-    existing = db.query(Contact).filter(Contact.email == contact.email).first()
-    if existing:
+    """
+    Create a new contact.
+
+    Responds 201 with an empty body; the new contact's URL is in the
+    ``Location`` header.
+    """
+    values = {
+        key: value for key, value in contact.model_dump(exclude_unset=True).items()
+        if key in Contact.__table__.columns
+    }
+
+    # Let the unique email index reject duplicates instead of checking first
+    stmt = (
+        dialect_insert(Contact)
+        .values(**values, status=ContactStatus.IMPORTED)
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(Contact.id)
+    )
+    contact_id = db.scalar(stmt)
+    if contact_id is None:
         raise HTTPException(status_code=400, detail="Contact with this email already exists")
 
-    new_contact = Contact(**contact.dict(), status=ContactStatus.IMPORTED)
-    db.add(new_contact)
     db.commit()
-    db.refresh(new_contact)
 
-    return new_contact
+    return Response(status_code=201, headers={"Location": f"{router.prefix}/{contact_id}"})
 
 
 @router.get("/", response_model=List[ContactResponse])
-def list_contacts(
+async def list_contacts(
     skip: int = 0,
     limit: int = 100,
     status: Optional[ContactStatus] = None,
-    db: Session = Depends(get_db)
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all contacts."""
-    query = db.query(Contact).filter(Contact.deleted == False)
+    """
+    List all contacts.
+
+    Pass the last seen ``id`` as ``after_id`` for keyset pagination; it
+    avoids the cost of scanning past ``skip`` rows on deep pages.
+    """
+    stmt = select(Contact).options(
+        load_only(*CONTACT_RESPONSE_COLUMNS)
+    ).where(Contact.deleted == False).order_by(Contact.id)
 
     if status:
-        query = query.filter(Contact.status == status)
+        stmt = stmt.where(Contact.status == status)
+
+    if after_id is not None:
+        stmt = stmt.where(Contact.id > after_id)
+    elif skip:
+        stmt = stmt.offset(skip)
 
-    contacts = query.offset(skip).limit(limit).all()
+    contacts = (await db.scalars(stmt.limit(limit))).all()
     return contacts
 
 
 @router.get("/{contact_id}", response_model=ContactResponse)
-def get_contact(contact_id: int, db: Session = Depends(get_db)):
+async def get_contact(contact_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific contact."""
-    contact = db.query(Contact).filter(
-        Contact.id == contact_id,
-        Contact.deleted == False
-    ).first()
+    contact = (await db.scalars(
+        select(Contact).options(
+            load_only(*CONTACT_RESPONSE_COLUMNS)
+        ).where(
+            Contact.id == contact_id,
+            Contact.deleted == False
+        )
+    )).first()
 
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
@@ -114,10 +157,8 @@ async def import_contacts_csv(file: UploadFile = File(...), db: Session = Depend
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be CSV format")
 
-    content = await file.read()
-    csv_content = content.decode('utf-8')
-
-    result = import_contacts(csv_content, db)
+    # Parse straight off the spooled upload rather than reading it into memory
+    result = await run_in_threadpool(import_contacts_stream, file.file, db)
 
     return {
         "success_count": result.success_count,
@@ -128,30 +169,37 @@ async def import_contacts_csv(file: UploadFile = File(...), db: Session = Depend
 
 
 @router.get("/export/csv")
-def export_contacts_csv(
-    status: Optional[ContactStatus] = None,
-    db: Session = Depends(get_db)
-):
-    """Export contacts to CSV."""
-    csv_data = export_contacts(db, status=status, format="csv")
+def export_contacts_csv(status: Optional[ContactStatus] = None):
+    """Export contacts to CSV, streamed as it is generated."""
+    filename = f"contacts_{status.value if status else 'all'}.csv"
 
-    return {
-        "content": csv_data,
-        "filename": f"contacts_{status.value if status else 'all'}.csv"
-    }
+    def _stream():
+        # The request session is closed before the body is sent, so use our own
+        with get_db_context() as stream_db:
+            yield from iter_contacts_csv(stream_db, status=status)
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @router.post("/{contact_id}/enrich")
-def enrich_contact_endpoint(contact_id: int, db: Session = Depends(get_db)):
+def enrich_contact_endpoint(
+    contact_id: int,
+    db: Session = Depends(get_db),
+    cost_tracker: CostTracker = Depends(get_cost_tracker)
+):
     """Enrich a single contact with AI."""
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
+    contact = db.get(Contact, contact_id)
 
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
 
     try:
-        cost_tracker = CostTracker(db, user_id=1)  # TODO: Get real user ID
-        enriched = enrich_contact(contact, db, cost_tracker=cost_tracker)
+        # An explicit single-contact enrich always refreshes the cached result
+        enriched = enrich_contact(contact, db, cost_tracker=cost_tracker, use_cache=False)
 
         return {
             "message": "Contact enriched successfully",
@@ -163,19 +211,23 @@ def enrich_contact_endpoint(contact_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/enrich/batch")
-def enrich_contacts_batch_endpoint(
+@limiter.limit(config.BULK_RATE_LIMIT)
+async def enrich_contacts_batch_endpoint(
+    request: Request,
     contact_ids: List[int],
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    cost_tracker: CostTracker = Depends(get_cost_tracker)
 ):
     """Enrich multiple contacts in batch."""
-    contacts = db.query(Contact).filter(Contact.id.in_(contact_ids)).all()
+    # The session is synchronous; run the SELECT off the event loop
+    query = db.query(Contact).filter(Contact.id.in_(contact_ids))
+    contacts = await run_in_threadpool(query.all)
 
     if not contacts:
         raise HTTPException(status_code=404, detail="No contacts found")
 
     try:
-        cost_tracker = CostTracker(db, user_id=1)
-        enriched = enrich_contacts_batch(contacts, db, cost_tracker=cost_tracker)
+        enriched = await enrich_contacts_batch_async(contacts, db, cost_tracker=cost_tracker)
 
         return {
             "message": f"Enriched {len(enriched)} contacts",
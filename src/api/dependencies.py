@@ -0,0 +1,26 @@
+"""
+Shared FastAPI dependencies for API endpoints.
+"""
+
+from typing import Iterator
+from fastapi import Depends
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from sqlalchemy.orm import Session
+from src.config import config
+from src.database import get_db
+from src.services.cost_tracker import CostTracker
+
+# Per-client limiter for endpoints that fan out to OpenAI or the mail provider
+limiter = Limiter(key_func=get_remote_address)
+
+
+def get_cost_tracker(db: Session = Depends(get_db)) -> Iterator[CostTracker]:
+    """
+    Cost tracker for the current request; buffered costs are written when it ends.
+
+    Usage:
+        cost_tracker: CostTracker = Depends(get_cost_tracker)
+    """
+    with CostTracker(db, user_id=config.BUDGET_USER_ID) as tracker:
+        yield tracker
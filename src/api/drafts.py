@@ -2,11 +2,16 @@
 Email draft management API endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from pydantic import BaseModel
-from src.database import get_db
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import delete, lambda_stmt, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload
+from typing import List, Literal, Optional
+from datetime import datetime
+import orjson
+from pydantic import BaseModel, ConfigDict
+from src.database import get_db, get_async_db, get_db_context
 from src.models import EmailDraft, DraftStatus, EmailTemplate
 from src.services.drafting import generate_email_draft, generate_email_drafts_bulk
 from src.services.approval import approve_draft, reject_draft, get_pending_approvals
@@ -14,9 +19,25 @@ from src.services.sending import send_email, send_emails_bulk
 from src.services.spam_checker import check_spam_score
 from src.services.quota_manager import GmailQuotaManager
 from src.services.cost_tracker import CostTracker
+from src.config import config
+from src.api.dependencies import get_cost_tracker, limiter
+from src.utils.cache import invalidate_drafts, response_cache
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/drafts", tags=["drafts"])
 
+# Seconds a single-draft response is served from cache
+DRAFT_CACHE_TTL = 300
+
+# Largest page the list endpoint serves; bigger reads go through /stream
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 200
+
+# Query filter values, checked by plain membership instead of enum coercion
+DraftStatusParam = Literal[tuple(member.value for member in DraftStatus)]
+
 
 # Pydantic models
 class DraftCreate(BaseModel):
@@ -39,10 +60,9 @@ class DraftResponse(BaseModel):
     body: str
     status: str
     quality_score: Optional[float]
-    created_at: str
+    created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ApprovalRequest(BaseModel):
@@ -58,7 +78,11 @@ class SendRequest(BaseModel):
 
 
 @router.post("/", response_model=DraftResponse)
-def create_draft(draft: DraftCreate, db: Session = Depends(get_db)):
+def create_draft(
+    draft: DraftCreate,
+    db: Session = Depends(get_db),
+    cost_tracker: CostTracker = Depends(get_cost_tracker)
+):
     """Create a new email draft."""
     from src.models import Contact
 
@@ -77,7 +101,6 @@ def create_draft(draft: DraftCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Either template_id or subject+body required")
 
     try:
-        cost_tracker = CostTracker(db, user_id=1)
         new_draft = generate_email_draft(contact, template, db, cost_tracker=cost_tracker)
 
         return new_draft
@@ -87,71 +110,128 @@ def create_draft(draft: DraftCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[DraftResponse])
-def list_drafts(
+async def list_drafts(
     skip: int = 0,
-    limit: int = 100,
-    status: Optional[DraftStatus] = None,
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[DraftStatusParam] = None,
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all drafts."""
-    query = db.query(EmailDraft)
+    """
+    List all drafts.
+
+    Pass the last seen ``id`` as ``after_id`` for keyset pagination; it
+    avoids the cost of scanning past ``skip`` rows on deep pages.
+    """
+    # DraftResponse is column-only; refuse lazy relationship loads per row.
+    # Built as a lambda statement so each filter combination compiles once.
+    stmt = lambda_stmt(
+        lambda: select(EmailDraft).options(raiseload("*")).order_by(EmailDraft.id)
+    )
 
     if status:
-        query = query.filter(EmailDraft.status == status)
+        status = DraftStatus(status)
+        stmt += lambda s: s.where(EmailDraft.status == status)
 
-    drafts = query.offset(skip).limit(limit).all()
-    return drafts
+    if after_id is not None:
+        stmt += lambda s: s.where(EmailDraft.id > after_id)
+    elif skip:
+        stmt += lambda s: s.offset(skip)
+
+    stmt += lambda s: s.limit(limit)
+    drafts = (await db.scalars(stmt)).all()
+
+    # Validate once here and hand orjson plain dicts, skipping jsonable_encoder
+    return ORJSONResponse([DraftResponse.model_validate(d).model_dump() for d in drafts])
+
+
+@router.get("/stream")
+def stream_drafts(status: Optional[DraftStatusParam] = None):
+    """Stream every matching draft as newline-delimited JSON."""
+    def _stream():
+        # The request session is closed before the body is sent, so use our own
+        with get_db_context() as stream_db:
+            stmt = select(EmailDraft).options(raiseload("*")).order_by(EmailDraft.id)
+            if status:
+                stmt = stmt.where(EmailDraft.status == DraftStatus(status))
+
+            for draft in stream_db.scalars(stmt.execution_options(yield_per=STREAM_BATCH_SIZE)):
+                yield orjson.dumps(DraftResponse.model_validate(draft).model_dump()) + b"\n"
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
 
 
 @router.get("/{draft_id}", response_model=DraftResponse)
-def get_draft(draft_id: int, db: Session = Depends(get_db)):
+async def get_draft(draft_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific draft."""
-    draft = db.query(EmailDraft).filter(EmailDraft.id == draft_id).first()
+    cached = response_cache.get(f"draft:{draft_id}")
+    if cached is not None:
+        return ORJSONResponse(cached)
+
+    draft = await db.get(EmailDraft, draft_id)
 
     if not draft:
         raise HTTPException(status_code=404, detail="Draft not found")
 
-    return draft
+    response = DraftResponse.model_validate(draft).model_dump()
+    response_cache.set(f"draft:{draft_id}", response, ttl=DRAFT_CACHE_TTL)
+    return ORJSONResponse(response)
 
 
-@router.put("/{draft_id}", response_model=DraftResponse)
-def update_draft(draft_id: int, updates: DraftUpdate, db: Session = Depends(get_db)):
-    """Update a draft."""
-    draft = db.query(EmailDraft).filter(EmailDraft.id == draft_id).first()
+async def _raise_missing_or_sent(db: AsyncSession, draft_id: int, sent_detail: str):
+    """Raise 404 or 400 after a guarded write matched no row."""
+    exists = await db.scalar(select(EmailDraft.id).where(EmailDraft.id == draft_id))
 
-    if not draft:
+    if exists is None:
         raise HTTPException(status_code=404, detail="Draft not found")
 
-    if draft.status == DraftStatus.SENT:
-        raise HTTPException(status_code=400, detail="Cannot update sent draft")
+    raise HTTPException(status_code=400, detail=sent_detail)
+
+
+@router.put("/{draft_id}", response_model=DraftResponse)
+async def update_draft(draft_id: int, updates: DraftUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update a draft."""
+    values = {
+        field: value
+        for field, value in (
+            ("subject", updates.subject),
+            ("body", updates.body),
+            ("status", updates.status),
+        )
+        if value
+    }
+
+    # Check and write in one statement so a concurrent send cannot slip in between
+    stmt = select(EmailDraft)
+    if values:
+        stmt = update(EmailDraft).values(**values).returning(EmailDraft)
+    draft = await db.scalar(
+        stmt.where(EmailDraft.id == draft_id, EmailDraft.status != DraftStatus.SENT)
+    )
 
-    # Update fields
-    if updates.subject:
-        draft.subject = updates.subject
-    if updates.body:
-        draft.body = updates.body
-    if updates.status:
-        draft.status = updates.status
+    if not draft:
+        await _raise_missing_or_sent(db, draft_id, "Cannot update sent draft")
 
-    db.commit()
-    db.refresh(draft)
+    await db.commit()
+    invalidate_drafts(draft_id)
 
     return draft
 
 
 @router.delete("/{draft_id}")
-def delete_draft(draft_id: int, db: Session = Depends(get_db)):
+async def delete_draft(draft_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a draft."""
-    draft = db.query(EmailDraft).filter(EmailDraft.id == draft_id).first()
-
-    if not draft:
-        raise HTTPException(status_code=404, detail="Draft not found")
+    deleted_id = await db.scalar(
+        delete(EmailDraft)
+        .where(EmailDraft.id == draft_id, EmailDraft.status != DraftStatus.SENT)
+        .returning(EmailDraft.id)
+    )
 
-    if draft.status == DraftStatus.SENT:
-        raise HTTPException(status_code=400, detail="Cannot delete sent draft")
+    if deleted_id is None:
+        await _raise_missing_or_sent(db, draft_id, "Cannot delete sent draft")
 
-    db.delete(draft)
-    db.commit()
+    await db.commit()
+    invalidate_drafts(draft_id)
 
     return {"message": "Draft deleted successfully"}
 
@@ -165,7 +245,8 @@ def approve_draft_endpoint(
     """Approve a draft for sending."""
     try:
         draft = approve_draft(draft_id, user_id=1, db=db, notes=request.notes)
-        return {"message": "Draft approved", "draft": draft}
+        # The commit expired the draft; validating reloads it in one SELECT
+        return {"message": "Draft approved", "draft": DraftResponse.model_validate(draft)}
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -180,7 +261,8 @@ def reject_draft_endpoint(
     """Reject a draft."""
     try:
         draft = reject_draft(draft_id, user_id=1, db=db, reason=request.reason)
-        return {"message": "Draft rejected", "draft": draft}
+        # The commit expired the draft; validating reloads it in one SELECT
+        return {"message": "Draft rejected", "draft": DraftResponse.model_validate(draft)}
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -193,54 +275,91 @@ def get_pending_approvals_endpoint(db: Session = Depends(get_db)):
     return drafts
 
 
-@router.post("/{draft_id}/send")
-def send_draft(draft_id: int, request: SendRequest, db: Session = Depends(get_db)):
-    """Send an approved draft."""
-    try:
-        quota_tracker = GmailQuotaManager(db, user_id=1)
-
-        result = send_email(
-            draft_id=draft_id,
+def _send_in_background(draft_id: int, mock_mode: bool = False) -> None:
+    """Send one approved draft outside the request that queued it."""
+    # The request session is closed once the response is sent, so use our own
+    with get_db_context() as db:
+        try:
+            send_email(
+                draft_id=draft_id,
+                db=db,
+                mock_mode=mock_mode,
+                quota_tracker=GmailQuotaManager(db, user_id=1)
+            )
+        except Exception as e:
+            logger.error(f"Background send failed for draft {draft_id}: {e}")
+
+
+def _send_bulk_in_background(draft_ids: List[int], mock_mode: bool = False) -> None:
+    """Send approved drafts in order outside the request that queued them."""
+    with get_db_context() as db:
+        results = send_emails_bulk(
+            draft_ids=draft_ids,
             db=db,
-            mock_mode=request.mock_mode,
-            quota_tracker=quota_tracker
+            quota_tracker=GmailQuotaManager(db, user_id=1),
+            mock_mode=mock_mode
         )
+        for result in results:
+            if result["status"] == "SEND_FAILED":
+                logger.error(f"Background send failed for draft {result['draft_id']}: {result.get('error')}")
 
-        return result
 
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+@router.post("/{draft_id}/send", status_code=202)
+def send_draft(
+    draft_id: int,
+    request: SendRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """Queue an approved draft for sending."""
+    status = db.scalar(select(EmailDraft.status).where(EmailDraft.id == draft_id))
+
+    if status is None:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    if status == DraftStatus.SENT:
+        raise HTTPException(status_code=400, detail="Draft already sent")
+    if status != DraftStatus.APPROVED:
+        raise HTTPException(status_code=400, detail="Draft not approved")
 
+    background_tasks.add_task(_send_in_background, draft_id, request.mock_mode)
 
-@router.post("/send/bulk")
+    return {"status": "queued", "draft_id": draft_id}
+
+
+@router.post("/send/bulk", status_code=202)
+@limiter.limit(config.BULK_RATE_LIMIT)
 def send_drafts_bulk_endpoint(
+    request: Request,
     draft_ids: List[int],
+    background_tasks: BackgroundTasks,
     mock_mode: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Send multiple drafts in bulk."""
-    try:
-        quota_tracker = GmailQuotaManager(db, user_id=1)
-
-        results = send_emails_bulk(
-            draft_ids=draft_ids,
-            db=db,
-            quota_tracker=quota_tracker
+    """Queue multiple approved drafts for sending."""
+    approved = set(db.scalars(
+        select(EmailDraft.id).where(
+            EmailDraft.id.in_(draft_ids),
+            EmailDraft.status == DraftStatus.APPROVED
         )
+    ))
 
-        return {
-            "message": f"Processed {len(results)} drafts",
-            "results": results
-        }
+    queued = [draft_id for draft_id in draft_ids if draft_id in approved]
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # One task sends the whole batch in order, so quota checks stay serialized
+    if queued:
+        background_tasks.add_task(_send_bulk_in_background, queued, mock_mode)
+
+    return {
+        "message": f"Queued {len(queued)} of {len(draft_ids)} drafts",
+        "queued": queued,
+        "skipped": [draft_id for draft_id in draft_ids if draft_id not in approved]
+    }
 
 
 @router.get("/{draft_id}/spam-score")
-def check_draft_spam_score(draft_id: int, db: Session = Depends(get_db)):
+async def check_draft_spam_score(draft_id: int, db: AsyncSession = Depends(get_async_db)):
     """Check spam score for a draft."""
-    draft = db.query(EmailDraft).filter(EmailDraft.id == draft_id).first()
+    draft = await db.get(EmailDraft, draft_id)
 
     if not draft:
         raise HTTPException(status_code=404, detail="Draft not found")
@@ -2,18 +2,36 @@
 Reply management API endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from pydantic import BaseModel, EmailStr
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload
+from typing import List, Literal, Optional
+import orjson
+from pydantic import BaseModel, ConfigDict, EmailStr
 from datetime import datetime
-from src.database import get_db
+from src.database import get_db, get_async_db, get_db_context
 from src.models import Reply, ReplyIntent
 from src.services.reply_parser import ReplyParser, parse_reply_batch
 from src.services.cost_tracker import CostTracker
+from src.config import config
+from src.api.dependencies import get_cost_tracker, limiter
+from src.utils.cache import response_cache
 
 router = APIRouter(prefix="/api/replies", tags=["replies"])
 
+# Seconds a single-reply response and the intent counts are served from cache
+REPLY_CACHE_TTL = 300
+INTENT_STATS_CACHE_TTL = 60
+
+# Largest page the list endpoint serves; bigger reads go through /stream
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 200
+
+# Query filter values, checked by plain membership instead of enum coercion
+ReplyIntentParam = Literal[tuple(member.value for member in ReplyIntent)]
+
 
 # Pydantic models
 class ReplyCreate(BaseModel):
@@ -29,13 +47,12 @@ class ReplyResponse(BaseModel):
     id: int
     draft_id: int
     from_email: str
-    subject: str
+    subject: Optional[str] = None
     intent: Optional[str]
-    received_at: str
+    received_at: datetime
     availability_text: Optional[str]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ReplyBatchCreate(BaseModel):
@@ -43,10 +60,13 @@ class ReplyBatchCreate(BaseModel):
 
 
 @router.post("/", response_model=ReplyResponse)
-def create_reply(reply: ReplyCreate, db: Session = Depends(get_db)):
+def create_reply(
+    reply: ReplyCreate,
+    db: Session = Depends(get_db),
+    cost_tracker: CostTracker = Depends(get_cost_tracker)
+):
     """Parse and save a new reply."""
     try:
-        cost_tracker = CostTracker(db, user_id=1)
         parser = ReplyParser(db, cost_tracker=cost_tracker)
 
         parsed_reply = parser.parse_reply(
@@ -57,6 +77,7 @@ def create_reply(reply: ReplyCreate, db: Session = Depends(get_db)):
             received_at=reply.received_at,
             in_reply_to=reply.in_reply_to
         )
+        response_cache.delete("reply:intent_stats")
 
         return parsed_reply
 
@@ -65,13 +86,18 @@ def create_reply(reply: ReplyCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/batch", response_model=List[ReplyResponse])
-def create_replies_batch(batch: ReplyBatchCreate, db: Session = Depends(get_db)):
+@limiter.limit(config.BULK_RATE_LIMIT)
+def create_replies_batch(
+    request: Request,
+    batch: ReplyBatchCreate,
+    db: Session = Depends(get_db),
+    cost_tracker: CostTracker = Depends(get_cost_tracker)
+):
     """Parse and save multiple replies in batch."""
     try:
-        cost_tracker = CostTracker(db, user_id=1)
-
-        reply_dicts = [r.dict() for r in batch.replies]
+        reply_dicts = [r.model_dump() for r in batch.replies]
         parsed_replies = parse_reply_batch(reply_dicts, db, cost_tracker=cost_tracker)
+        response_cache.delete("reply:intent_stats")
 
         return parsed_replies
 
@@ -80,41 +106,86 @@ def create_replies_batch(batch: ReplyBatchCreate, db: Session = Depends(get_db))
 
 
 @router.get("/", response_model=List[ReplyResponse])
-def list_replies(
+async def list_replies(
     skip: int = 0,
-    limit: int = 100,
-    intent: Optional[ReplyIntent] = None,
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    intent: Optional[ReplyIntentParam] = None,
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all replies."""
-    query = db.query(Reply)
+    """
+    List all replies.
+
+    Pass the last seen ``id`` as ``after_id`` for keyset pagination; it
+    avoids the cost of scanning past ``skip`` rows on deep pages.
+    """
+    # ReplyResponse is column-only; refuse lazy relationship loads per row.
+    # Built as a lambda statement so each filter combination compiles once.
+    stmt = lambda_stmt(
+        lambda: select(Reply).options(raiseload("*")).order_by(Reply.id)
+    )
 
     if intent:
-        query = query.filter(Reply.intent == intent)
+        intent = ReplyIntent(intent)
+        stmt += lambda s: s.where(Reply.intent == intent)
+
+    if after_id is not None:
+        stmt += lambda s: s.where(Reply.id > after_id)
+    elif skip:
+        stmt += lambda s: s.offset(skip)
+
+    stmt += lambda s: s.limit(limit)
+    replies = (await db.scalars(stmt)).all()
 
-    replies = query.offset(skip).limit(limit).all()
-    return replies
+    # Validate once here and hand orjson plain dicts, skipping jsonable_encoder
+    return ORJSONResponse([ReplyResponse.model_validate(r).model_dump() for r in replies])
+
+
+@router.get("/stream")
+def stream_replies(intent: Optional[ReplyIntentParam] = None):
+    """Stream every matching reply as newline-delimited JSON."""
+    def _stream():
+        # The request session is closed before the body is sent, so use our own
+        with get_db_context() as stream_db:
+            stmt = select(Reply).options(raiseload("*")).order_by(Reply.id)
+            if intent:
+                stmt = stmt.where(Reply.intent == ReplyIntent(intent))
+
+            for reply in stream_db.scalars(stmt.execution_options(yield_per=STREAM_BATCH_SIZE)):
+                yield orjson.dumps(ReplyResponse.model_validate(reply).model_dump()) + b"\n"
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
 
 
 @router.get("/{reply_id}", response_model=ReplyResponse)
-def get_reply(reply_id: int, db: Session = Depends(get_db)):
+async def get_reply(reply_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific reply."""
-    reply = db.query(Reply).filter(Reply.id == reply_id).first()
+    cached = response_cache.get(f"reply:{reply_id}")
+    if cached is not None:
+        return ORJSONResponse(cached)
+
+    reply = await db.get(Reply, reply_id)
 
     if not reply:
         raise HTTPException(status_code=404, detail="Reply not found")
 
-    return reply
+    response = ReplyResponse.model_validate(reply).model_dump()
+    response_cache.set(f"reply:{reply_id}", response, ttl=REPLY_CACHE_TTL)
+    return ORJSONResponse(response)
 
 
 @router.post("/{reply_id}/reclassify")
-def reclassify_reply(reply_id: int, db: Session = Depends(get_db)):
+def reclassify_reply(
+    reply_id: int,
+    db: Session = Depends(get_db),
+    cost_tracker: CostTracker = Depends(get_cost_tracker)
+):
     """Re-classify a reply's intent."""
     try:
-        cost_tracker = CostTracker(db, user_id=1)
         parser = ReplyParser(db, cost_tracker=cost_tracker)
 
         intent = parser.classify_reply_intent(reply_id)
+        response_cache.delete(f"reply:{reply_id}", "reply:intent_stats")
 
         return {
             "message": "Reply reclassified",
@@ -127,24 +198,33 @@ def reclassify_reply(reply_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/draft/{draft_id}", response_model=List[ReplyResponse])
-def get_replies_for_draft(draft_id: int, db: Session = Depends(get_db)):
+async def get_replies_for_draft(draft_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get all replies for a specific draft."""
-    replies = db.query(Reply).filter(Reply.draft_id == draft_id).all()
+    replies = (await db.scalars(lambda_stmt(
+        lambda: select(Reply).options(raiseload("*")).where(Reply.draft_id == draft_id)
+    ))).all()
 
-    return replies
+    return ORJSONResponse([ReplyResponse.model_validate(r).model_dump() for r in replies])
 
 
 @router.get("/stats/intents")
-def get_reply_intent_stats(db: Session = Depends(get_db)):
+async def get_reply_intent_stats(db: AsyncSession = Depends(get_async_db)):
     """Get statistics on reply intents."""
-    from sqlalchemy import func
-
-    stats = db.query(
-        Reply.intent,
-        func.count(Reply.id).label('count')
-    ).group_by(Reply.intent).all()
-
-    return {
+    cached = response_cache.get("reply:intent_stats")
+    if cached is not None:
+        return cached
+
+    stats = (await db.execute(
+        select(
+            Reply.intent,
+            # COUNT(*) needs no column, so the intent index alone can answer it
+            func.count().label('count')
+        ).group_by(Reply.intent)
+    )).all()
+
+    response = {
         intent.value if intent else "UNCLASSIFIED": count
         for intent, count in stats
     }
+    response_cache.set("reply:intent_stats", response, ttl=INTENT_STATS_CACHE_TTL)
+    return response
@@ -4,81 +4,116 @@ Loads settings from environment variables with sensible defaults.
 """
 
 import os
+from dataclasses import dataclass, fields
 from pathlib import Path
 from dotenv import load_dotenv
-from typing import Optional
+from typing import ClassVar, Optional, Tuple
 
 # Load environment variables from .env file
 load_dotenv()
 
 
+def _parse_env(raw: str, field_type):
+    """Convert an environment string to the annotated field type."""
+    if field_type is bool:
+        return raw.lower() == "true"
+    if field_type in (int, float):
+        return field_type(raw)
+    if field_type == Tuple[str, ...]:
+        return tuple(item.strip() for item in raw.split(",") if item.strip())
+    return raw
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
     """Application configuration loaded from environment variables."""
 
     # OpenAI Configuration
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    OPENAI_MODEL_GPT: str = os.getenv("OPENAI_MODEL_GPT", "gpt-4-turbo-preview")
-    OPENAI_MODEL_EMBEDDING: str = os.getenv("OPENAI_MODEL_EMBEDDING", "text-embedding-3-large")
+    OPENAI_API_KEY: str = ""
+    OPENAI_MODEL_GPT: str = "gpt-4-turbo-preview"
+    OPENAI_MODEL_EMBEDDING: str = "text-embedding-3-large"
+    OPENAI_MAX_RETRIES: int = 5  # Backoff with jitter on 429/5xx
+    USE_BATCH_API: bool = False  # Classify reply backlogs via the half-price Batch API (up to 24h)
 
     # Email Provider Configuration
-    EMAIL_PROVIDER: str = os.getenv("EMAIL_PROVIDER", "smtp")  # "smtp", "gmail", or "powerautomate"
+    EMAIL_PROVIDER: str = "smtp"  # "smtp", "gmail", or "powerautomate"
 
     # SMTP Configuration (for any email provider)
-    SMTP_HOST: str = os.getenv("SMTP_HOST", "smtp.office365.com")
-    SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
-    SMTP_USER: str = os.getenv("SMTP_USER", "")
-    SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
-    SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+    SMTP_HOST: str = "smtp.office365.com"
+    SMTP_PORT: int = 587
+    SMTP_USER: str = ""
+    SMTP_PASSWORD: str = ""
+    SMTP_USE_TLS: bool = True
 
     # Power Automate Webhook (RECOMMENDED for Duke email with DUO 2FA)
-    POWER_AUTOMATE_WEBHOOK_URL: str = os.getenv("POWER_AUTOMATE_WEBHOOK_URL", "")
+    POWER_AUTOMATE_WEBHOOK_URL: str = ""
 
     # Gmail Configuration (optional)
-    GMAIL_CLIENT_ID: str = os.getenv("GMAIL_CLIENT_ID", "")
-    GMAIL_CLIENT_SECRET: str = os.getenv("GMAIL_CLIENT_SECRET", "")
-    GMAIL_REFRESH_TOKEN: str = os.getenv("GMAIL_REFRESH_TOKEN", "")
-    GMAIL_SENDER_EMAIL: str = os.getenv("GMAIL_SENDER_EMAIL", "")
+    GMAIL_CLIENT_ID: str = ""
+    GMAIL_CLIENT_SECRET: str = ""
+    GMAIL_REFRESH_TOKEN: str = ""
+    GMAIL_SENDER_EMAIL: str = ""
 
     # Database Configuration
-    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./outreach.db")
+    DATABASE_URL: str = "sqlite:///./outreach.db"
+    DB_POOL_SIZE: int = 20  # Ignored for SQLite
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800  # Seconds
 
     # Budget and Quota Limits
-    DAILY_BUDGET_LIMIT: float = float(os.getenv("DAILY_BUDGET_LIMIT", "100.0"))
-    GMAIL_DAILY_SEND_LIMIT: int = int(os.getenv("GMAIL_DAILY_SEND_LIMIT", "500"))
-    MAX_SPAM_SCORE: float = float(os.getenv("MAX_SPAM_SCORE", "5.0"))
+    DAILY_BUDGET_LIMIT: float = 100.0
+    BUDGET_USER_ID: int = 1  # API costs are charged to this user until requests carry one
+    GMAIL_DAILY_SEND_LIMIT: int = 500
+    MAX_SPAM_SCORE: float = 5.0
+    MAX_CONCURRENT_SENDS: int = 8
+    BULK_RATE_LIMIT: str = "10/minute"  # Per client IP
 
     # Scheduling Configuration
-    FOLLOWUP_DAYS: int = int(os.getenv("FOLLOWUP_DAYS", "7"))
-    MAX_FOLLOWUPS: int = int(os.getenv("MAX_FOLLOWUPS", "3"))
-    SKIP_WEEKENDS: bool = os.getenv("SKIP_WEEKENDS", "true").lower() == "true"
-    RESPECT_BUSINESS_HOURS: bool = os.getenv("RESPECT_BUSINESS_HOURS", "true").lower() == "true"
+    FOLLOWUP_DAYS: int = 7
+    MAX_FOLLOWUPS: int = 3
+    SKIP_WEEKENDS: bool = True
+    RESPECT_BUSINESS_HOURS: bool = True
 
     # Application Configuration
-    DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    DEBUG: bool = False
+    LOG_LEVEL: str = "INFO"
+    CACHE_ENABLED: bool = True
+
+    # Comma-separated browser origins allowed via CORS (empty disables CORS)
+    CORS_ORIGINS: Tuple[str, ...] = ()
 
     # Derived paths
-    BASE_DIR: Path = Path(__file__).resolve().parent.parent
-    CACHE_DIR: Path = BASE_DIR / "cache"
-    LOGS_DIR: Path = BASE_DIR / "logs"
+    BASE_DIR: ClassVar[Path] = Path(__file__).resolve().parent.parent
+    CACHE_DIR: ClassVar[Path] = BASE_DIR / "cache"
+    LOGS_DIR: ClassVar[Path] = BASE_DIR / "logs"
 
     @classmethod
-    def validate(cls) -> bool:
+    def from_env(cls, environ: Optional[dict] = None) -> "Config":
+        """Build a config from environment variables named after each field."""
+        environ = os.environ if environ is None else environ
+
+        overrides = {
+            field.name: _parse_env(environ[field.name], field.type)
+            for field in fields(cls)
+            if field.name in environ
+        }
+        return cls(**overrides)
+
+    def validate(self) -> bool:
         """Validate that required configuration is present."""
         required_fields = ["OPENAI_API_KEY"]
 
-        missing = [field for field in required_fields if not getattr(cls, field)]
+        missing = [field for field in required_fields if not getattr(self, field)]
 
         if missing:
             raise ValueError(f"Missing required configuration: {', '.join(missing)}")
 
         # Create necessary directories
-        cls.CACHE_DIR.mkdir(exist_ok=True)
-        cls.LOGS_DIR.mkdir(exist_ok=True)
+        self.CACHE_DIR.mkdir(exist_ok=True)
+        self.LOGS_DIR.mkdir(exist_ok=True)
 
         return True
 
 
 # Singleton instance
-config = Config()
+config = Config.from_env()
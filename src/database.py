@@ -3,32 +3,134 @@ Database initialization and session management.
 """
 
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
 from src.config import config
 from src.models import Base
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever tables or indexes change so existing SQLite files pick them up
+SCHEMA_VERSION = 8
+
+
+def _engine_options(url) -> dict:
+    """Pool settings for the configured backend."""
+    if url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        # An in-memory database lives and dies with its connection, so share one
+        if url.database in (None, "", ":memory:"):
+            options["poolclass"] = StaticPool
+        return options
+
+    options = {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "pool_use_lifo": True,
+    }
+    # Send executemany INSERTs as multi-row VALUES and batch UPDATE/DELETE pages
+    if url.get_driver_name() == "psycopg2":
+        options["executemany_mode"] = "values_plus_batch"
+    return options
+
+
 # Create database engine
 engine = create_engine(
     config.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in config.DATABASE_URL else {},
-    echo=config.DEBUG
+    echo=config.DEBUG,
+    **_engine_options(make_url(config.DATABASE_URL))
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers used for each sync backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# Lazy-load async engine (the driver is only imported once an async endpoint needs it)
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get or create the async engine for the configured database."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        url = make_url(config.DATABASE_URL)
+        backend = url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f"No async driver configured for {backend}")
+        async_url = url.set(drivername=ASYNC_DRIVERS[backend])
+        options = _engine_options(async_url)
+        options.pop("connect_args", None)
+        _async_engine = create_async_engine(async_url, echo=config.DEBUG, **options)
+        _AsyncSessionLocal = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
 
 def init_db():
-    """Initialize database tables."""
+    """
+    Initialize database tables.
+
+    On SQLite the schema version is stored in ``PRAGMA user_version``; when
+    it already matches SCHEMA_VERSION the per-table reflection done by
+    ``create_all`` is skipped entirely.
+    """
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            current = conn.execute(text("PRAGMA user_version")).scalar()
+        if current == SCHEMA_VERSION:
+            logger.info(f"Database schema is current (version {SCHEMA_VERSION})")
+            return
+
     logger.info("Initializing database...")
-    Base.metadata.create_all(bind=engine)
+    _create_schema()
     logger.info("Database initialized successfully")
 
 
+def _create_schema():
+    """Create missing tables and indexes, then record SCHEMA_VERSION."""
+    with engine.begin() as conn:
+        Base.metadata.create_all(bind=conn, checkfirst=True)
+        _add_missing_columns(conn)
+
+        # create_all skips tables that exist, so add indexes introduced since
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+        if conn.dialect.name == "sqlite":
+            conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+
+
+def _add_missing_columns(conn):
+    """Add nullable columns introduced since a table was created."""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable:
+                logger.warning(f"Cannot add NOT NULL column {table.name}.{column.name}; migrate it manually")
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            logger.info(f"Added column {table.name}.{column.name}")
+
+
 def get_db() -> Session:
     """
     Get database session.
@@ -45,6 +147,25 @@ def get_db() -> Session:
         db.close()
 
 
+async def dispose_engines():
+    """Close pooled connections on shutdown."""
+    engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+async def get_async_db() -> AsyncSession:
+    """
+    Get async database session.
+
+    Usage:
+        db: AsyncSession = Depends(get_async_db)
+    """
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
 @contextmanager
 def get_db_context():
     """
@@ -66,9 +187,25 @@ def get_db_context():
         db.close()
 
 
+def dialect_insert(table):
+    """
+    Build an INSERT for the configured backend that supports ON CONFLICT.
+
+    Usage:
+        stmt = dialect_insert(Contact).values(...).on_conflict_do_nothing(
+            index_elements=["email"]
+        )
+    """
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    if engine.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"ON CONFLICT inserts are not supported on {engine.dialect.name}")
+
+
 def reset_db():
     """Reset database (drop all tables and recreate). Use with caution!"""
     logger.warning("Resetting database - all data will be lost!")
     Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    _create_schema()
     logger.info("Database reset complete")
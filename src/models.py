@@ -2,11 +2,13 @@
 SQLAlchemy database models for the outreach engine.
 """
 
+import json
 from datetime import datetime
 from enum import Enum as PyEnum
+import numpy as np
 from sqlalchemy import (
-    Column, Integer, String, Float, Boolean, DateTime, Text,
-    ForeignKey, JSON, Enum, create_engine, Index
+    Column, Integer, String, Float, Boolean, Date, DateTime, Text,
+    ForeignKey, JSON, Enum, LargeBinary, TypeDecorator, create_engine, Index
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Session
@@ -21,6 +23,7 @@ class ContactStatus(PyEnum):
     ENRICHMENT_FAILED = "enrichment_failed"
     RATE_LIMITED = "rate_limited"
     EMAIL_SENT = "email_sent"
+    REPLIED_INTERESTED = "replied_interested"
 
 
 class DraftStatus(PyEnum):
@@ -39,6 +42,47 @@ class ReplyIntent(PyEnum):
     AUTO_REPLY = "auto_reply"
 
 
+# Column types
+def status_enum(enum_class, name: str) -> Enum:
+    """
+    Enum column stored as VARCHAR(32) with a CHECK constraint.
+
+    Unlike a native Postgres ENUM, adding a member needs no ALTER TYPE,
+    and the column indexes like any other string.
+    """
+    return Enum(enum_class, name=name, native_enum=False, length=32, create_constraint=True)
+
+
+class EmbeddingVector(TypeDecorator):
+    """
+    Embedding stored as packed float32 bytes.
+
+    A 3072-dim vector is 12 KB this way instead of ~70 KB of JSON, and
+    reads come back as a NumPy array without parsing floats. Rows written
+    before the switch still hold a JSON array and are decoded as such.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return np.asarray(value, dtype=np.float32).tobytes()
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # Legacy JSON rows come back as text (or its bytes). Packed floats can
+        # start with b"[" too, but are never bracketed ASCII throughout.
+        if isinstance(value, str) or value in (b"null", b"") or (
+            value[:1] == b"[" and value[-1:] == b"]" and value.isascii()
+        ):
+            data = json.loads(value or "null")
+            return None if data is None else np.asarray(data, dtype=np.float32)
+        return np.frombuffer(value, dtype=np.float32)
+
+
 # Models
 class Contact(Base):
     """Contact model representing a person to reach out to."""
@@ -57,7 +101,7 @@ class Contact(Base):
     relevance_score = Column(Float)
 
     # Status and metadata
-    status = Column(Enum(ContactStatus), default=ContactStatus.IMPORTED, index=True)
+    status = Column(status_enum(ContactStatus, "ck_contact_status"), default=ContactStatus.IMPORTED, index=True)
     error_message = Column(Text)
     retry_count = Column(Integer, default=0)
 
@@ -69,7 +113,7 @@ class Contact(Base):
     deleted = Column(Boolean, default=False, index=True)
 
     # Embeddings for clustering
-    embedding = Column(JSON)  # Stored as JSON array
+    embedding = Column(EmbeddingVector)
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -83,6 +127,7 @@ class Contact(Base):
     __table_args__ = (
         Index('idx_contact_email_status', 'email', 'status'),
         Index('idx_contact_user_deleted', 'user_id', 'deleted'),
+        Index('idx_contact_deleted_status', 'deleted', 'status'),
     )
 
 
@@ -114,13 +159,14 @@ class EmailDraft(Base):
     attachments = Column(JSON)  # List of attachment paths
 
     # Status and workflow
-    status = Column(Enum(DraftStatus), default=DraftStatus.PENDING_APPROVAL, index=True)
+    status = Column(status_enum(DraftStatus, "ck_draft_status"), default=DraftStatus.PENDING_APPROVAL, index=True)
     approved_at = Column(DateTime)
     approved_by = Column(Integer)
     approval_notes = Column(Text)
     rejection_reason = Column(Text)
     cancel_reason = Column(Text)
     edited = Column(Boolean, default=False)
+    quality_score = Column(Float)  # 0-10; drafts above the threshold can be auto-approved
 
     # Gmail tracking
     message_id = Column(String, index=True)
@@ -147,7 +193,21 @@ class EmailDraft(Base):
     # Indexes
     __table_args__ = (
         Index('idx_draft_status_user', 'status', 'user_id'),
-        Index('idx_draft_sent_followup', 'sent_at', 'followup_sequence_number'),
+        # Follow-up scan: equality on status first, then the sent_at range
+        Index('idx_draft_status_sent_followup', 'status', 'sent_at', 'followup_sequence_number'),
+        Index('idx_draft_status_id', 'status', 'id'),
+        # Approval queue: only pending drafts, already in newest-first order
+        Index(
+            'idx_draft_pending_created', created_at.desc(),
+            postgresql_where=(status == DraftStatus.PENDING_APPROVAL),
+            sqlite_where=(status == DraftStatus.PENDING_APPROVAL),
+        ),
+        # Auto-approval sweep: range scan over pending drafts by score
+        Index(
+            'idx_draft_pending_quality', quality_score,
+            postgresql_where=(status == DraftStatus.PENDING_APPROVAL),
+            sqlite_where=(status == DraftStatus.PENDING_APPROVAL),
+        ),
     )
 
 
@@ -160,15 +220,18 @@ class Reply(Base):
 
     # Reply content
     from_email = Column(String, nullable=False)
+    subject = Column(String)
     body = Column(Text)
     body_html = Column(Text)
     body_plain = Column(Text)  # Parsed plain text
 
     # Classification
-    intent = Column(Enum(ReplyIntent), index=True)
+    intent = Column(status_enum(ReplyIntent, "ck_reply_intent"), index=True)
     confidence = Column(Float)
+    availability_text = Column(Text)  # Meeting times offered in interested replies
 
     # Metadata
+    in_reply_to = Column(String)  # Message-ID of the email being answered
     cc_recipients = Column(JSON)  # List of CC'd emails
     attachments = Column(JSON)  # List of attachment names
     has_inline_images = Column(Boolean, default=False)
@@ -180,6 +243,10 @@ class Reply(Base):
     # Relationships
     draft = relationship("EmailDraft", back_populates="replies")
 
+    __table_args__ = (
+        Index('idx_reply_intent_id', 'intent', 'id'),
+    )
+
 
 class AuditLog(Base):
     """Audit log for tracking state changes."""
@@ -228,6 +295,22 @@ class CostLog(Base):
     )
 
 
+class CostDailyAggregate(Base):
+    """Running cost total per user, day and model, kept in step with CostLog."""
+    __tablename__ = "cost_daily_aggregates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, default=1)
+    day = Column(Date, nullable=False)
+    model = Column(String, nullable=False)
+    total_cost = Column(Float, nullable=False, default=0.0)
+
+    # Indexes (the unique key is the upsert conflict target)
+    __table_args__ = (
+        Index('idx_cost_agg_user_day_model', 'user_id', 'day', 'model', unique=True),
+    )
+
+
 class QuotaUsage(Base):
     """Track daily Gmail sending quota."""
     __tablename__ = "quota_usage"
@@ -242,9 +325,9 @@ class QuotaUsage(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Indexes
+    # Indexes (the unique key is the upsert conflict target)
     __table_args__ = (
-        Index('idx_quota_user_date', 'user_id', 'date'),
+        Index('idx_quota_user_date_unique', 'user_id', 'date', unique=True),
     )
 
 
@@ -3,14 +3,39 @@ Draft approval workflow service.
 """
 
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session, contains_eager, selectinload
 from src.models import EmailDraft, DraftStatus, AuditLog, Contact
+from src.utils.cache import invalidate_drafts
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _draft_audit_rows(
+    drafts: List[EmailDraft],
+    user_id: int,
+    new_status: DraftStatus = DraftStatus.APPROVED,
+    action: str = "approve_draft",
+    notes: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Audit log mappings for moving drafts to a new status, taken before it changes."""
+    now = datetime.utcnow()
+    return [
+        {
+            "contact_id": draft.contact_id,
+            "user_id": user_id,
+            "old_status": draft.status.value,
+            "new_status": new_status.value,
+            "action": action,
+            "details": {"draft_id": draft.id, "notes": notes},
+            "created_at": now,
+        }
+        for draft in drafts
+    ]
+
+
 class ApprovalWorkflow:
     """Manage draft approval workflow."""
 
@@ -32,9 +57,10 @@ class ApprovalWorkflow:
             notes: Optional approval notes
 
         Returns:
-            Approved EmailDraft
+            Approved EmailDraft; not refreshed, since every changed column
+            is set client-side
         """
-        draft = self.db.query(EmailDraft).filter(EmailDraft.id == draft_id).first()
+        draft = self.db.get(EmailDraft, draft_id)
         if not draft:
             raise ValueError(f"Draft {draft_id} not found")
 
@@ -45,27 +71,18 @@ class ApprovalWorkflow:
         if draft.status == DraftStatus.SENT:
             raise ValueError(f"Draft {draft_id} already sent")
 
+        # Log the approval
+        [audit_row] = _draft_audit_rows([draft], user_id, notes=notes)
+
         # Update status
-        old_status = draft.status
         draft.status = DraftStatus.APPROVED
         draft.approved_by = user_id
         draft.approved_at = datetime.utcnow()
+        draft.approval_notes = notes
 
-        # Log the approval
-        audit_log = AuditLog(
-            user_id=user_id,
-            action="approve_draft",
-            entity_type="EmailDraft",
-            entity_id=draft_id,
-            old_value=old_status.value,
-            new_value=DraftStatus.APPROVED.value,
-            notes=notes,
-            timestamp=datetime.utcnow()
-        )
-
-        self.db.add(audit_log)
+        self.db.add(AuditLog(**audit_row))
         self.db.commit()
-        self.db.refresh(draft)
+        invalidate_drafts(draft_id)
 
         logger.info(f"Draft {draft_id} approved by user {user_id}")
 
@@ -86,37 +103,28 @@ class ApprovalWorkflow:
             reason: Optional rejection reason
 
         Returns:
-            Rejected EmailDraft
+            Rejected EmailDraft; not refreshed, since every changed column
+            is set client-side
         """
-        draft = self.db.query(EmailDraft).filter(EmailDraft.id == draft_id).first()
+        draft = self.db.get(EmailDraft, draft_id)
         if not draft:
             raise ValueError(f"Draft {draft_id} not found")
 
         if draft.status == DraftStatus.SENT:
             raise ValueError(f"Draft {draft_id} already sent")
 
+        # Log the rejection; who rejected it and when live only in the audit row
+        [audit_row] = _draft_audit_rows(
+            [draft], user_id, new_status=DraftStatus.REJECTED, action="reject_draft", notes=reason
+        )
+
         # Update status
-        old_status = draft.status
         draft.status = DraftStatus.REJECTED
-        draft.rejected_by = user_id
-        draft.rejected_at = datetime.utcnow()
         draft.rejection_reason = reason
 
-        # Log the rejection
-        audit_log = AuditLog(
-            user_id=user_id,
-            action="reject_draft",
-            entity_type="EmailDraft",
-            entity_id=draft_id,
-            old_value=old_status.value,
-            new_value=DraftStatus.REJECTED.value,
-            notes=reason,
-            timestamp=datetime.utcnow()
-        )
-
-        self.db.add(audit_log)
+        self.db.add(AuditLog(**audit_row))
         self.db.commit()
-        self.db.refresh(draft)
+        invalidate_drafts(draft_id)
 
         logger.info(f"Draft {draft_id} rejected by user {user_id}: {reason}")
 
@@ -143,18 +151,42 @@ class ApprovalWorkflow:
             "already_approved": []
         }
 
-        for draft_id in draft_ids:
-            try:
-                draft = self.approve_draft(draft_id, user_id)
-
-                if draft.status == DraftStatus.APPROVED:
-                    result["approved"].append(draft_id)
-                else:
-                    result["already_approved"].append(draft_id)
+        # One read, one UPDATE batch, one INSERT batch and one commit for the whole set
+        drafts = {
+            draft.id: draft
+            for draft in self.db.scalars(select(EmailDraft).where(EmailDraft.id.in_(draft_ids)))
+        }
 
-            except Exception as e:
-                logger.error(f"Failed to approve draft {draft_id}: {e}")
-                result["failed"].append({"draft_id": draft_id, "error": str(e)})
+        to_approve = []
+        for draft_id in dict.fromkeys(draft_ids):
+            draft = drafts.get(draft_id)
+            if draft is None:
+                result["failed"].append({"draft_id": draft_id, "error": f"Draft {draft_id} not found"})
+            elif draft.status == DraftStatus.SENT:
+                result["failed"].append({"draft_id": draft_id, "error": f"Draft {draft_id} already sent"})
+            elif draft.status == DraftStatus.APPROVED:
+                result["already_approved"].append(draft_id)
+            else:
+                to_approve.append(draft)
+
+        if to_approve:
+            now = datetime.utcnow()
+            audit_rows = _draft_audit_rows(to_approve, user_id)
+
+            self.db.bulk_update_mappings(EmailDraft, [
+                {
+                    "id": draft.id,
+                    "status": DraftStatus.APPROVED,
+                    "approved_by": user_id,
+                    "approved_at": now,
+                }
+                for draft in to_approve
+            ])
+            self.db.bulk_insert_mappings(AuditLog, audit_rows)
+            self.db.commit()
+
+            result["approved"] = [draft.id for draft in to_approve]
+            invalidate_drafts(*result["approved"])
 
         logger.info(f"Bulk approved {len(result['approved'])} drafts by user {user_id}")
 
@@ -179,8 +211,15 @@ class ApprovalWorkflow:
             EmailDraft.status == DraftStatus.PENDING_APPROVAL
         )
 
+        # Callers read draft.contact; load it with the drafts instead of per row
         if user_id:
-            query = query.join(Contact).filter(Contact.user_id == user_id)
+            query = (
+                query.join(Contact)
+                .options(contains_eager(EmailDraft.contact))
+                .filter(Contact.user_id == user_id)
+            )
+        else:
+            query = query.options(selectinload(EmailDraft.contact))
 
         return query.order_by(EmailDraft.created_at.desc()).limit(limit).all()
 
@@ -205,24 +244,31 @@ class ApprovalWorkflow:
             EmailDraft.quality_score >= quality_threshold
         )
 
+        # Every approved draft is returned, so the candidates are loaded in full
         drafts = query.all()
-        approved = []
-
-        for draft in drafts:
-            try:
-                self.approve_draft(
-                    draft.id,
-                    user_id=user_id or 0,  # System user
-                    notes="Auto-approved (high quality score)"
-                )
-                approved.append(draft)
-
-            except Exception as e:
-                logger.error(f"Failed to auto-approve draft {draft.id}: {e}")
+        if not drafts:
+            return []
+
+        # One UPDATE, one audit INSERT batch and one commit for the whole sweep
+        approver = user_id or 0  # System user
+        draft_ids = [draft.id for draft in drafts]
+        audit_rows = _draft_audit_rows(drafts, approver, notes="Auto-approved (high quality score)")
+
+        self.db.query(EmailDraft).filter(EmailDraft.id.in_(draft_ids)).update(
+            {
+                EmailDraft.status: DraftStatus.APPROVED,
+                EmailDraft.approved_by: approver,
+                EmailDraft.approved_at: datetime.utcnow(),
+            },
+            synchronize_session=False
+        )
+        self.db.bulk_insert_mappings(AuditLog, audit_rows)
+        self.db.commit()
+        invalidate_drafts(*draft_ids)
 
-        logger.info(f"Auto-approved {len(approved)} high-quality drafts")
+        logger.info(f"Auto-approved {len(draft_ids)} high-quality drafts")
 
-        return approved
+        return drafts
 
 
 def approve_draft(draft_id: int, user_id: int, db: Session, notes: Optional[str] = None) -> EmailDraft:
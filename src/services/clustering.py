@@ -3,76 +3,154 @@ Semantic clustering service using OpenAI embeddings.
 """
 
 import numpy as np
-from typing import List
-from sklearn.cluster import KMeans
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import List, Optional, Tuple
+from sklearn.cluster import MiniBatchKMeans
 from sqlalchemy.orm import Session
 from src.models import Contact
 from src.config import config
+from src.services.cost_tracker import CostTracker
+from src.services.openai_client import get_openai_client
+from src.utils.cache import embedding_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
-_client = None
+# OpenAI accepts at most this many inputs per embeddings request
+MAX_EMBEDDING_BATCH = 2048
 
-def get_openai_client():
-    global _client
-    if _client is None:
-        if not config.OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY not configured")
-        _client = OpenAI(api_key=config.OPENAI_API_KEY)
-    return _client
+# Embedding requests in flight at once when a call spans several batches
+EMBEDDING_WORKERS = 4
+
+# Rows per k-means mini-batch; smaller sets are clustered in one batch
+KMEANS_BATCH_SIZE = 1024
+
+# Contact fields concatenated into the text that gets embedded
+EMBEDDING_TEXT_FIELDS = ("name", "industry", "company", "painpoint", "title")
+_embedding_text_values = attrgetter(*EMBEDDING_TEXT_FIELDS)
+
+
+def build_embedding_text(contact: Contact, **overrides) -> str:
+    """
+    Build the text embedded for a contact.
+
+    Keyword overrides take precedence over the contact's attributes, so
+    freshly enriched values can be embedded before they are persisted.
+    """
+    # One C-level getter call per contact instead of a getattr per field
+    values = _embedding_text_values(contact)
+    if overrides:
+        values = [overrides.get(field, value) for field, value in zip(EMBEDDING_TEXT_FIELDS, values)]
+    return " ".join(filter(None, values))
+
+
+def embed_texts(texts: List[str], model: str = None) -> Tuple[List[List[float]], int]:
+    """
+    Embed many texts using as few API requests as possible.
+
+    Args:
+        texts: Texts to embed
+        model: Embedding model (defaults to config)
+
+    Returns:
+        Tuple of (embeddings in input order, total tokens used)
+    """
+    model = model or config.OPENAI_MODEL_EMBEDDING
+    embeddings: List[List[float]] = [None] * len(texts)
+    tokens = 0
+
+    # Identical texts embed identically, so only send the ones not cached yet
+    keys = [embedding_cache.key(model, text) for text in texts]
+    missing = []
+    for i, key in enumerate(keys):
+        cached = embedding_cache.get(key)
+        if cached is None:
+            missing.append(i)
+        else:
+            embeddings[i] = np.frombuffer(cached, dtype=np.float32).tolist()
+
+    batches = [missing[start:start + MAX_EMBEDDING_BATCH] for start in range(0, len(missing), MAX_EMBEDDING_BATCH)]
+    if not batches:
+        return embeddings, tokens
+
+    client = get_openai_client()
+
+    def _request(batch: List[int]):
+        return client.embeddings.create(model=model, input=[texts[i] for i in batch])
+
+    # Requests are network-bound, so overlap them; map() keeps batch order
+    with ThreadPoolExecutor(max_workers=min(EMBEDDING_WORKERS, len(batches))) as pool:
+        for batch, response in zip(batches, pool.map(_request, batches)):
+            for i, item in zip(batch, sorted(response.data, key=lambda d: d.index)):
+                embeddings[i] = item.embedding
+                embedding_cache.set(keys[i], np.asarray(item.embedding, dtype=np.float32).tobytes())
+            tokens += response.usage.total_tokens if response.usage else 0
+
+    return embeddings, tokens
 
 
 def generate_embedding(text: str, model: str = None) -> List[float]:
     """Generate embedding for text."""
     model = model or config.OPENAI_MODEL_EMBEDDING
 
-    response = client.embeddings.create(
-        model=model,
-        input=text
-    )
+    embeddings, _ = embed_texts([text], model=model)
+    return embeddings[0]
 
-    return response.data[0].embedding
 
+def normalize_embeddings(embeddings) -> np.ndarray:
+    """
+    Stack embeddings into a float32 matrix of unit-length rows.
 
-def generate_embeddings(contacts: List[Contact], db: Session = None) -> np.ndarray:
+    Euclidean distance between unit vectors orders pairs the same way as
+    cosine similarity, so k-means on the result clusters by cosine.
+    """
+    matrix = np.array(embeddings, dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True).clip(min=1e-12)
+    return matrix
+
+
+def generate_embeddings(
+    contacts: List[Contact],
+    db: Session = None,
+    cost_tracker: Optional[CostTracker] = None
+) -> np.ndarray:
     """
     Generate embeddings for contacts.
 
     Args:
         contacts: List of contacts
         db: Optional database session
+        cost_tracker: Optional cost tracker for contacts embedded here
 
     Returns:
-        NumPy array of embeddings
+        float32 array of unit-length embeddings, one row per contact
     """
-    embeddings = []
-
-    for contact in contacts:
-        # Build text from contact data
-        parts = [
-            contact.name or "",
-            contact.industry or "",
-            contact.company or "",
-            contact.painpoint or "",
-            contact.title or ""
-        ]
-        text = " ".join([p for p in parts if p])
-
-        # Generate embedding
-        embedding = generate_embedding(text)
-        embeddings.append(embedding)
-
-        # Save to database if provided
-        if db:
-            contact.embedding = embedding
-            db.add(contact)
-
-    if db:
+    # Contacts that already carry an embedding are not sent to the API again
+    missing = [i for i, contact in enumerate(contacts) if contact.embedding is None or len(contact.embedding) == 0]
+    vectors = [contact.embedding for contact in contacts]
+
+    if missing:
+        # One embeddings request per MAX_EMBEDDING_BATCH contacts instead of one per contact
+        fetched, tokens = embed_texts([build_embedding_text(contacts[i]) for i in missing])
+        for i, vector in zip(missing, fetched):
+            vectors[i] = vector
+
+        # Cache hits cost nothing; only requests that reached the API report tokens
+        if cost_tracker and tokens:
+            cost_tracker.track_operation("embedding", config.OPENAI_MODEL_EMBEDDING, tokens)
+
+    embeddings = normalize_embeddings(vectors)
+
+    # Save new embeddings to database if provided
+    if db and missing:
+        db.bulk_update_mappings(Contact, [
+            {"id": contacts[i].id, "embedding": embeddings[i]}
+            for i in missing
+        ])
         db.commit()
 
-    return np.array(embeddings)
+    return embeddings
 
 
 def cluster_contacts(
@@ -80,7 +158,8 @@ def cluster_contacts(
     db: Session = None,
     n_clusters: int = None,
     auto_k: bool = False,
-    generate_labels: bool = False
+    generate_labels: bool = False,
+    cost_tracker: Optional[CostTracker] = None
 ) -> List:
     """
     Cluster contacts by semantic similarity.
@@ -91,6 +170,7 @@ def cluster_contacts(
         n_clusters: Number of clusters (if None, auto-detect)
         auto_k: Auto-detect optimal k
         generate_labels: Generate labels for clusters
+        cost_tracker: Optional cost tracker for any embeddings generated
 
     Returns:
         List of Cluster objects with contacts
@@ -108,16 +188,26 @@ def cluster_contacts(
     if len(contacts) == 1:
         return [Cluster(contacts=contacts, label=contacts[0].industry)]
 
-    # Generate embeddings
-    embeddings = generate_embeddings(contacts, db)
-
     # Determine number of clusters
     if auto_k or n_clusters is None:
         n_clusters = min(3, len(contacts))
 
-    # Perform clustering
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-    labels = kmeans.fit_predict(embeddings)
+    if len(contacts) <= n_clusters:
+        # Every contact is its own cluster; no embeddings needed
+        labels = range(len(contacts))
+    else:
+        # Generate embeddings
+        embeddings = generate_embeddings(contacts, db, cost_tracker=cost_tracker)
+
+        # Perform clustering; contiguous float32 lets sklearn use the data without copying it
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        kmeans = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            random_state=42,
+            batch_size=min(KMEANS_BATCH_SIZE, len(contacts)),
+            n_init=3
+        )
+        labels = kmeans.fit_predict(embeddings)
 
     # Group contacts by cluster
     clusters_dict = {}
@@ -2,20 +2,30 @@
 Cost tracking and budget enforcement service.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+from datetime import date as Date, datetime
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from src.models import CostLog
+from sqlalchemy import func, select
+from src.models import CostDailyAggregate, CostLog
+from src.database import dialect_insert
 from src.config import config
 from src.utils.helpers import calculate_cost
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Buffered cost rows written per bulk insert
+COST_FLUSH_THRESHOLD = 50
+
 
 class CostTracker:
-    """Track API costs and enforce budget limits."""
+    """
+    Track API costs and enforce budget limits.
+
+    Cost rows are buffered and written in bulk every
+    ``COST_FLUSH_THRESHOLD`` operations, on :meth:`flush`, or when the
+    tracker is used as a context manager and the block exits.
+    """
 
     def __init__(self, db: Session, user_id: int = 1, daily_limit: float = None):
         self.db = db
@@ -24,6 +34,41 @@ class CostTracker:
         self.enrichment_cost = 0.0
         self.embedding_cost = 0.0
         self.draft_generation_cost = 0.0
+        self._buffer: List[Dict[str, Any]] = []
+
+        # Today's spend, loaded once per day and then kept current locally
+        self._cached_day: Optional[Date] = None
+        self._cached_daily_cost = 0.0
+
+    def __enter__(self) -> "CostTracker":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
+
+    def flush(self) -> None:
+        """Write buffered cost rows and roll them into the daily totals, then commit."""
+        if not self._buffer:
+            return
+
+        totals: Dict[tuple, float] = {}
+        for row in self._buffer:
+            key = (row["user_id"], row["created_at"].date(), row["model"])
+            totals[key] = totals.get(key, 0.0) + row["cost"]
+
+        stmt = dialect_insert(CostDailyAggregate).values([
+            {"user_id": user_id, "day": day, "model": model, "total_cost": cost}
+            for (user_id, day, model), cost in totals.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "day", "model"],
+            set_={"total_cost": CostDailyAggregate.total_cost + stmt.excluded.total_cost}
+        )
+
+        self.db.bulk_insert_mappings(CostLog, self._buffer)
+        self.db.execute(stmt)
+        self._buffer.clear()
+        self.db.commit()
 
     def track_operation(
         self,
@@ -48,18 +93,22 @@ class CostTracker:
         """
         cost = calculate_cost(operation_type, model, tokens_used)
 
-        # Log to database
-        cost_log = CostLog(
-            user_id=self.user_id,
-            operation_type=operation_type,
-            model=model,
-            tokens_used=tokens_used or 0,
-            cost=cost,
-            contact_id=contact_id,
-            draft_id=draft_id
-        )
-        self.db.add(cost_log)
-        self.db.commit()
+        # Buffer the log row; stamped now so it counts toward today's budget
+        self._buffer.append({
+            "user_id": self.user_id,
+            "operation_type": operation_type,
+            "model": model,
+            "tokens_used": tokens_used or 0,
+            "cost": cost,
+            "contact_id": contact_id,
+            "draft_id": draft_id,
+            "created_at": datetime.utcnow()
+        })
+        if len(self._buffer) >= COST_FLUSH_THRESHOLD:
+            self.flush()
+
+        if self._cached_day == datetime.utcnow().date():
+            self._cached_daily_cost += cost
 
         # Update local counters
         if operation_type == "enrichment":
@@ -108,17 +157,30 @@ class CostTracker:
         if date is None:
             date = datetime.utcnow()
 
-        start_of_day = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_day = start_of_day + timedelta(days=1)
+        self.flush()
 
-        total = self.db.query(func.sum(CostLog.cost)).filter(
-            CostLog.user_id == self.user_id,
-            CostLog.created_at >= start_of_day,
-            CostLog.created_at < end_of_day
-        ).scalar()
+        # At most one row per model, instead of scanning the day's CostLog rows
+        total = self.db.scalar(
+            select(func.sum(CostDailyAggregate.total_cost)).where(
+                CostDailyAggregate.user_id == self.user_id,
+                CostDailyAggregate.day == date.date()
+            )
+        )
 
         return float(total or 0.0)
 
+    def _today_cost(self) -> float:
+        """Today's spend, querying the database only when the day changes."""
+        today = datetime.utcnow().date()
+        if self._cached_day != today:
+            self._cached_daily_cost = self.get_daily_cost()
+            self._cached_day = today
+        return self._cached_daily_cost
+
+    def invalidate_daily_cache(self) -> None:
+        """Forget the cached daily spend so the next check reloads it."""
+        self._cached_day = None
+
     def check_budget(self) -> bool:
         """
         Check if under budget limit.
@@ -126,7 +188,7 @@ class CostTracker:
         Returns:
             True if under budget, False if over
         """
-        daily_cost = self.get_daily_cost()
+        daily_cost = self._today_cost()
         remaining = self.daily_limit - daily_cost
 
         if remaining <= 0:
@@ -137,7 +199,7 @@ class CostTracker:
 
     def get_remaining_budget(self) -> float:
         """Get remaining budget for today."""
-        return max(0, self.daily_limit - self.get_daily_cost())
+        return max(0, self.daily_limit - self._today_cost())
 
     def get_breakdown(self) -> Dict[str, float]:
         """
@@ -146,15 +208,14 @@ class CostTracker:
         Returns:
             Dictionary of model names to costs
         """
-        start_of_day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-
-        results = self.db.query(
-            CostLog.model,
-            func.sum(CostLog.cost).label('total_cost')
-        ).filter(
-            CostLog.user_id == self.user_id,
-            CostLog.created_at >= start_of_day
-        ).group_by(CostLog.model).all()
+        self.flush()
+
+        results = self.db.execute(
+            select(CostDailyAggregate.model, CostDailyAggregate.total_cost).where(
+                CostDailyAggregate.user_id == self.user_id,
+                CostDailyAggregate.day == datetime.utcnow().date()
+            )
+        )
 
         return {model: float(cost) for model, cost in results}
 
@@ -2,26 +2,96 @@
 Email draft generation service using GPT-4.
 """
 
-from typing import List, Optional
-from openai import OpenAI
+import asyncio
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from openai import AsyncOpenAI
 from sqlalchemy.orm import Session
 from src.models import Contact, EmailTemplate, EmailDraft, DraftStatus
 from src.config import config
-from src.utils.helpers import replace_template_variables, generate_unsubscribe_token
+from src.utils.helpers import calculate_quality_score, chunked, replace_template_variables, generate_unsubscribe_token
 from src.services.cost_tracker import CostTracker
+from src.services.openai_client import get_async_openai_client, get_openai_client, run_with_openai
 import logging
 
 logger = logging.getLogger(__name__)
 
-_client = None
+# Maximum in-flight OpenAI requests during bulk draft generation
+DEFAULT_DRAFTING_CONCURRENCY = 8
 
-def get_openai_client():
-    global _client
-    if _client is None:
-        if not config.OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY not configured")
-        _client = OpenAI(api_key=config.OPENAI_API_KEY)
-    return _client
+# Contacts drafted and committed together in bulk generation
+DRAFTING_CHUNK_SIZE = 200
+
+DRAFTING_SYSTEM_PROMPT = "You are an expert email copywriter for B2B sales."
+
+SUBJECT_BODY_PATTERN = re.compile(r"SUBJECT:(.*?)BODY:(.*)", re.DOTALL)
+
+def _template_variables(contact: Contact) -> Dict[str, str]:
+    """Values substituted into template placeholders for a contact."""
+    return {
+        "name": contact.name or "there",
+        "email": contact.email,
+        "company": contact.company or "your organization",
+        "industry": contact.industry or "your industry",
+        "title": contact.title or "",
+        "painpoint": contact.painpoint or "industry challenges"
+    }
+
+
+def build_draft_prompt(contact: Contact, max_words: int = 150) -> str:
+    """Build the GPT prompt for a contact without a template."""
+    return f"""Write a professional, personalized cold email for B2B outreach.
+
+Contact Details:
+- Name: {contact.name or 'Unknown'}
+- Company: {contact.company or 'Unknown'}
+- Title: {contact.title or 'Unknown'}
+- Industry: {contact.industry or 'Unknown'}
+- Pain Point: {contact.painpoint or 'Unknown'}
+
+Requirements:
+- Keep it under {max_words} words
+- Professional but friendly tone
+- Personalized based on their role/industry
+- Clear value proposition
+- Include subject line
+
+Return in format:
+SUBJECT: [subject line]
+BODY: [email body]"""
+
+
+def parse_draft_content(content: str, contact: Contact) -> Tuple[str, str]:
+    """Split a GPT response into (subject, body), falling back to a stock subject."""
+    match = SUBJECT_BODY_PATTERN.search(content)
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+
+    return f"Quick question about {contact.company or 'your work'}", content
+
+
+def _build_draft(contact: Contact, subject: str, body: str) -> EmailDraft:
+    """Create a pending, quality-scored draft with an unsubscribe link appended to the body."""
+    # Scored before the footer so every draft shares the same baseline
+    quality_score = calculate_quality_score(subject, body)
+
+    # Generate unsubscribe token
+    unsubscribe_token = generate_unsubscribe_token(contact.id)
+
+    # Add unsubscribe link to body
+    unsubscribe_url = f"https://yourapp.com/unsubscribe/{unsubscribe_token}"
+    body += f"\n\n---\nTo unsubscribe, click: {unsubscribe_url}"
+
+    return EmailDraft(
+        contact_id=contact.id,
+        to_email=contact.email,
+        subject=subject,
+        body=body,
+        status=DraftStatus.PENDING_APPROVAL,
+        quality_score=quality_score,
+        unsubscribe_token=unsubscribe_token,
+        unsubscribe_url=unsubscribe_url
+    )
 
 
 def generate_email_draft(
@@ -31,6 +101,7 @@ def generate_email_draft(
     api_key: str = None,
     max_words: int = 150,
     cost_tracker: Optional[CostTracker] = None,
+    commit: bool = True,
     **kwargs
 ) -> EmailDraft:
     """
@@ -43,6 +114,8 @@ def generate_email_draft(
         api_key: Optional API key
         max_words: Maximum words in email body
         cost_tracker: Optional cost tracker
+        commit: Commit the new draft; when False it is only flushed so the
+            caller can commit a whole batch at once
         **kwargs: Additional parameters
 
     Returns:
@@ -53,126 +126,221 @@ def generate_email_draft(
         from src.utils.helpers import ContactUnsubscribedError
         raise ContactUnsubscribedError(f"Contact {contact.id} has unsubscribed")
 
-    # Prepare variables for template
-    variables = {
-        "name": contact.name or "there",
-        "email": contact.email,
-        "company": contact.company or "your organization",
-        "industry": contact.industry or "your industry",
-        "title": contact.title or "",
-        "painpoint": contact.painpoint or "industry challenges"
-    }
-
     if template:
         # Use provided template
+        variables = _template_variables(contact)
         subject = replace_template_variables(template.subject, variables)
         body = replace_template_variables(template.body, variables)
     else:
         # Generate with GPT-4
-        prompt = f"""Write a professional, personalized cold email for B2B outreach.
-
-Contact Details:
-- Name: {contact.name or 'Unknown'}
-- Company: {contact.company or 'Unknown'}
-- Title: {contact.title or 'Unknown'}
-- Industry: {contact.industry or 'Unknown'}
-- Pain Point: {contact.painpoint or 'Unknown'}
-
-Requirements:
-- Keep it under {max_words} words
-- Professional but friendly tone
-- Personalized based on their role/industry
-- Clear value proposition
-- Include subject line
-
-Return in format:
-SUBJECT: [subject line]
-BODY: [email body]"""
-
-        response = client.chat.completions.create(
+        response = get_openai_client().chat.completions.create(
             model=config.OPENAI_MODEL_GPT,
             messages=[
-                {"role": "system", "content": "You are an expert email copywriter for B2B sales."},
-                {"role": "user", "content": prompt}
+                {"role": "system", "content": DRAFTING_SYSTEM_PROMPT},
+                {"role": "user", "content": build_draft_prompt(contact, max_words)}
             ],
             temperature=0.7,
             max_tokens=400
         )
 
-        content = response.choices[0].message.content
-
-        # Parse response
-        if "SUBJECT:" in content and "BODY:" in content:
-            parts = content.split("BODY:")
-            subject = parts[0].replace("SUBJECT:", "").strip()
-            body = parts[1].strip()
-        else:
-            subject = f"Quick question about {contact.company or 'your work'}"
-            body = content
+        subject, body = parse_draft_content(response.choices[0].message.content, contact)
 
         # Track cost
         if cost_tracker:
             tokens = response.usage.total_tokens if hasattr(response, 'usage') else 300
             cost_tracker.track_operation("draft", config.OPENAI_MODEL_GPT, tokens)
 
-    # Generate unsubscribe token
-    unsubscribe_token = generate_unsubscribe_token(contact.id)
-
-    # Add unsubscribe link to body
-    unsubscribe_url = f"https://yourapp.com/unsubscribe/{unsubscribe_token}"
-    body += f"\n\n---\nTo unsubscribe, click: {unsubscribe_url}"
-
     # Create draft
-    draft = EmailDraft(
-        contact_id=contact.id,
-        to_email=contact.email,
-        subject=subject,
-        body=body,
-        status=DraftStatus.PENDING_APPROVAL,
-        unsubscribe_token=unsubscribe_token,
-        unsubscribe_url=unsubscribe_url
-    )
+    draft = _build_draft(contact, subject, body)
 
     db.add(draft)
-    db.commit()
+    if commit:
+        db.commit()
+    else:
+        db.flush()
 
     logger.info(f"Generated draft for contact {contact.id}")
 
     return draft
 
 
-def generate_email_drafts_bulk(
-    contacts: List[Contact],
-    template: EmailTemplate,
+async def generate_draft_content_async(
+    contact: Contact,
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    max_words: int = 150
+) -> Tuple[str, str, int]:
+    """
+    Ask GPT for a contact's subject and body without touching the database.
+
+    Args:
+        contact: Contact to email
+        client: Async OpenAI client
+        semaphore: Caps concurrent requests across the batch
+        max_words: Maximum words in email body
+
+    Returns:
+        Tuple of (subject, body, tokens used)
+    """
+    async with semaphore:
+        response = await client.chat.completions.create(
+            model=config.OPENAI_MODEL_GPT,
+            messages=[
+                {"role": "system", "content": DRAFTING_SYSTEM_PROMPT},
+                {"role": "user", "content": build_draft_prompt(contact, max_words)}
+            ],
+            temperature=0.7,
+            max_tokens=400
+        )
+
+    subject, body = parse_draft_content(response.choices[0].message.content, contact)
+    tokens = response.usage.total_tokens if response.usage else 300
+    return subject, body, tokens
+
+
+async def generate_email_drafts_bulk_async(
+    contacts: Iterable[Contact],
+    template: Optional[EmailTemplate],
     db: Session,
-    api_key: str = None,
     user_id: int = 1,
-    cost_tracker: Optional[CostTracker] = None
+    cost_tracker: Optional[CostTracker] = None,
+    concurrency: int = DEFAULT_DRAFTING_CONCURRENCY,
+    max_words: int = 150,
+    chunk_size: int = DRAFTING_CHUNK_SIZE
 ) -> List[EmailDraft]:
     """
-    Generate drafts for multiple contacts.
+    Generate drafts for multiple contacts concurrently.
+
+    Contacts are processed ``chunk_size`` at a time, each chunk written in
+    one commit, so any iterable (such as a ``yield_per`` result) can be
+    drafted without holding every pending draft in memory. Without a
+    template, up to ``concurrency`` GPT requests are in flight at once.
 
     Args:
-        contacts: List of contacts
-        template: Email template
+        contacts: Contacts to email
+        template: Email template (if None, GPT writes each draft)
         db: Database session
-        api_key: Optional API key
         user_id: User ID
         cost_tracker: Optional cost tracker
+        concurrency: Maximum concurrent OpenAI requests
+        max_words: Maximum words in email body
+        chunk_size: Contacts drafted and committed per chunk
 
     Returns:
         List of EmailDraft objects
     """
+    client = None if template else get_async_openai_client()
+    semaphore = asyncio.Semaphore(concurrency)
     drafts = []
 
+    for chunk in chunked(contacts, chunk_size):
+        chunk_drafts, tokens_used = await _draft_chunk(chunk, template, client, semaphore, user_id, max_words)
+        await asyncio.to_thread(_persist_drafts, db, chunk_drafts, tokens_used, cost_tracker)
+        drafts.extend(chunk_drafts)
+
+    return drafts
+
+
+async def _draft_chunk(
+    contacts: List[Contact],
+    template: Optional[EmailTemplate],
+    client: Optional[AsyncOpenAI],
+    semaphore: asyncio.Semaphore,
+    user_id: int,
+    max_words: int
+) -> Tuple[List[EmailDraft], List[int]]:
+    """Build unsaved drafts for one chunk, returning them with the tokens each used."""
+    eligible = []
     for contact in contacts:
-        try:
-            draft = generate_email_draft(contact, template, db, api_key, cost_tracker=cost_tracker)
-            draft.user_id = user_id
-            drafts.append(draft)
-        except Exception as e:
-            logger.error(f"Failed to generate draft for contact {contact.id}: {e}")
+        if contact.unsubscribed:
+            logger.error(f"Failed to generate draft for contact {contact.id}: Contact {contact.id} has unsubscribed")
+        else:
+            eligible.append(contact)
+
+    if template:
+        results = []
+        for contact in eligible:
+            variables = _template_variables(contact)
+            results.append((
+                replace_template_variables(template.subject, variables),
+                replace_template_variables(template.body, variables),
+                0
+            ))
+    else:
+        results = await asyncio.gather(
+            *[generate_draft_content_async(contact, client, semaphore, max_words) for contact in eligible],
+            return_exceptions=True
+        )
+
+    drafts = []
+    tokens_used = []
+    for contact, result in zip(eligible, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to generate draft for contact {contact.id}: {result}")
+            continue
+
+        subject, body, tokens = result
+        draft = _build_draft(contact, subject, body)
+        draft.user_id = user_id
+        drafts.append(draft)
+        tokens_used.append(tokens)
 
+    return drafts, tokens_used
+
+
+def _persist_drafts(
+    db: Session,
+    drafts: List[EmailDraft],
+    tokens_used: List[int],
+    cost_tracker: Optional[CostTracker]
+) -> None:
+    """Write one chunk of generated drafts and their costs in one transaction."""
+    db.add_all(drafts)
     db.commit()
 
-    return drafts
+    if cost_tracker:
+        for tokens in tokens_used:
+            if tokens:
+                cost_tracker.track_operation("draft", config.OPENAI_MODEL_GPT, tokens)
+
+    logger.info(f"Generated {len(drafts)} drafts in bulk")
+
+
+def generate_email_drafts_bulk(
+    contacts: Iterable[Contact],
+    template: Optional[EmailTemplate],
+    db: Session,
+    api_key: str = None,
+    user_id: int = 1,
+    cost_tracker: Optional[CostTracker] = None,
+    concurrency: int = DEFAULT_DRAFTING_CONCURRENCY,
+    chunk_size: int = DRAFTING_CHUNK_SIZE
+) -> List[EmailDraft]:
+    """
+    Generate drafts for multiple contacts (blocking wrapper).
+
+    Runs :func:`generate_email_drafts_bulk_async` on a fresh event loop;
+    async callers should await that coroutine directly instead.
+
+    Args:
+        contacts: Contacts to email
+        template: Email template (if None, GPT writes each draft)
+        db: Database session
+        api_key: Unused; the configured API key is always used
+        user_id: User ID
+        cost_tracker: Optional cost tracker
+        concurrency: Maximum concurrent OpenAI requests
+        chunk_size: Contacts drafted and committed per chunk
+
+    Returns:
+        List of EmailDraft objects
+    """
+    return run_with_openai(generate_email_drafts_bulk_async(
+        contacts,
+        template,
+        db,
+        user_id=user_id,
+        cost_tracker=cost_tracker,
+        concurrency=concurrency,
+        chunk_size=chunk_size
+    ))
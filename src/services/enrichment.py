@@ -2,57 +2,51 @@
 Contact enrichment service using OpenAI GPT-4.
 """
 
+import asyncio
 import json
+import random
+import threading
 import time
-from typing import List, Optional
-from openai import OpenAI
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import orjson
+from openai import AsyncOpenAI
 from sqlalchemy.orm import Session
 from src.models import Contact, ContactStatus, AuditLog
 from src.config import config
 from src.services.cost_tracker import CostTracker
+from src.services.openai_client import get_async_openai_client, get_openai_client, run_with_openai
+from src.utils.helpers import chunked
+from src.services.clustering import EMBEDDING_TEXT_FIELDS, build_embedding_text, embed_texts
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Lazy-load OpenAI client
-_client = None
+# Maximum in-flight OpenAI requests during batch enrichment
+DEFAULT_ENRICHMENT_CONCURRENCY = 8
 
-def get_openai_client():
-    """Get or create OpenAI client."""
-    global _client
-    if _client is None:
-        if not config.OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY not configured")
-        _client = OpenAI(api_key=config.OPENAI_API_KEY)
-    return _client
+# Contacts enriched and committed together in batch enrichment
+ENRICHMENT_CHUNK_SIZE = 200
 
+# Longest exponential backoff between enrichment retries, in seconds (before jitter)
+MAX_RETRY_BACKOFF = 30
 
-def enrich_contact(
-    contact: Contact,
-    db: Session,
-    api_key: str = None,
-    retry_count: int = 0,
-    cost_tracker: Optional[CostTracker] = None
-) -> Contact:
-    """
-    Enrich a single contact with GPT-4.
+ENRICHMENT_SYSTEM_PROMPT = "You are a B2B contact research assistant. Provide specific, actionable insights."
 
-    Args:
-        contact: Contact to enrich
-        db: Database session
-        api_key: Optional API key (uses config if not provided)
-        retry_count: Current retry attempt
-        cost_tracker: Optional cost tracker
+# Parsed enrichment results keyed by the contact fields the prompt is built from
+ENRICHMENT_CACHE_SIZE = 10_000
+_enrichment_cache: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+_enrichment_cache_lock = threading.Lock()
 
-    Returns:
-        Enriched contact
 
-    Raises:
-        Exception: If enrichment fails after retries
-    """
-    try:
-        # Build prompt
-        prompt = f"""Given the following contact information, provide enrichment data in JSON format.
+def _retry_delay(attempt: int) -> float:
+    """Capped exponential backoff with jitter, so concurrent failures don't retry in lockstep."""
+    return min(2 ** attempt, MAX_RETRY_BACKOFF) + random.random()
+
+
+def build_enrichment_prompt(contact: Contact) -> str:
+    """Build the GPT prompt used to enrich a contact."""
+    return f"""Given the following contact information, provide enrichment data in JSON format.
 
 Contact:
 - Name: {contact.name or 'Unknown'}
@@ -67,123 +61,403 @@ Please provide:
 
 Return ONLY a valid JSON object with these exact fields. Be specific and avoid generic responses."""
 
-        # Call GPT-4
-        response = get_openai_client().chat.completions.create(
-            model=config.OPENAI_MODEL_GPT,
-            messages=[
-                {"role": "system", "content": "You are a B2B contact research assistant. Provide specific, actionable insights."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500
-        )
 
-        # Parse response
-        content = response.choices[0].message.content
-        data = json.loads(content)
+def _enrichment_cache_key(contact: Contact) -> Tuple[str, str, str]:
+    """Cache key covering every contact field used in the enrichment prompt."""
+    return (contact.email or "", contact.name or "", contact.industry or "")
+
+
+def get_cached_enrichment(contact: Contact) -> Optional[Dict[str, Any]]:
+    """Return a copy of the cached enrichment for this contact, if any."""
+    if not config.CACHE_ENABLED:
+        return None
 
-        # Update contact
-        contact.title = data.get("title", "")
-        contact.company = data.get("company", "")
-        contact.painpoint = data.get("painpoint", "")
-        contact.relevance_score = float(data.get("relevance_score", 5.0))
+    key = _enrichment_cache_key(contact)
+    with _enrichment_cache_lock:
+        cached = _enrichment_cache.get(key)
+        if cached is None:
+            return None
+        _enrichment_cache.move_to_end(key)
+        return dict(cached)
 
-        # Clamp relevance score to 0-10
-        contact.relevance_score = max(0.0, min(10.0, contact.relevance_score))
 
-        contact.status = ContactStatus.ENRICHED
+def cache_enrichment(contact: Contact, enrichment: Dict[str, Any]) -> None:
+    """Store a successful enrichment, evicting the least recently used entry when full."""
+    if not config.CACHE_ENABLED:
+        return
+
+    key = _enrichment_cache_key(contact)
+    with _enrichment_cache_lock:
+        _enrichment_cache[key] = dict(enrichment)
+        _enrichment_cache.move_to_end(key)
+        while len(_enrichment_cache) > ENRICHMENT_CACHE_SIZE:
+            _enrichment_cache.popitem(last=False)
+
+
+def invalidate_enrichment_cache(contact: Optional[Contact] = None) -> None:
+    """Drop the cached enrichment for one contact, or everything when no contact is given."""
+    with _enrichment_cache_lock:
+        if contact is None:
+            _enrichment_cache.clear()
+        else:
+            _enrichment_cache.pop(_enrichment_cache_key(contact), None)
+
+
+def parse_enrichment(content: str) -> Dict[str, Any]:
+    """
+    Parse a GPT enrichment response into contact field values.
+
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON
+    """
+    data = orjson.loads(content)
+
+    # Clamp relevance score to 0-10
+    relevance_score = max(0.0, min(10.0, float(data.get("relevance_score", 5.0))))
+
+    return {
+        "title": data.get("title", ""),
+        "company": data.get("company", ""),
+        "painpoint": data.get("painpoint", ""),
+        "relevance_score": relevance_score,
+        "status": ContactStatus.ENRICHED
+    }
+
+
+def _enrichment_audit_row(contact_id: int) -> Dict[str, Any]:
+    """Audit log mapping for a successful enrichment."""
+    return {
+        "contact_id": contact_id,
+        "old_status": ContactStatus.IMPORTED.value,
+        "new_status": ContactStatus.ENRICHED.value,
+        "action": "enrichment",
+        "details": {"model": config.OPENAI_MODEL_GPT}
+    }
+
+
+def enrich_contact(
+    contact: Contact,
+    db: Session,
+    api_key: str = None,
+    max_retries: int = 3,
+    cost_tracker: Optional[CostTracker] = None,
+    use_cache: bool = True
+) -> Contact:
+    """
+    Enrich a single contact with GPT-4.
+
+    Args:
+        contact: Contact to enrich
+        db: Database session
+        api_key: Optional API key (uses config if not provided)
+        max_retries: Retries on API errors, with jittered exponential backoff
+        cost_tracker: Optional cost tracker
+        use_cache: Reuse a cached result for the same prompt inputs;
+            pass False to force a fresh call (the result is re-cached)
+
+    Returns:
+        Enriched contact; on failure its status is ENRICHMENT_FAILED
+    """
+    cached = get_cached_enrichment(contact) if use_cache else None
+
+    if cached is not None:
+        enrichment = cached
+    else:
+        # Build prompt once; only the API call and parse are retried
+        prompt = build_enrichment_prompt(contact)
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = get_openai_client().chat.completions.create(
+                    model=config.OPENAI_MODEL_GPT,
+                    messages=[
+                        {"role": "system", "content": ENRICHMENT_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=500
+                )
+
+                # Parse response
+                content = response.choices[0].message.content
+                enrichment = parse_enrichment(content)
+                break
+
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON response for contact {contact.id}: {e}")
+                contact.status = ContactStatus.ENRICHMENT_FAILED
+                contact.error_message = "Invalid response format"
+                db.commit()
+                return contact
+
+            except Exception as e:
+                logger.error(f"Error enriching contact {contact.id}: {e}")
+
+                if attempt < max_retries:
+                    logger.info(f"Retrying enrichment for contact {contact.id} (attempt {attempt + 1})")
+                    time.sleep(_retry_delay(attempt))
+                    continue
+
+                contact.status = ContactStatus.ENRICHMENT_FAILED
+                contact.error_message = f"API error after {attempt} retries: {str(e)}"
+                contact.retry_count = attempt
+                db.commit()
+                return contact
+
+        cache_enrichment(contact, enrichment)
 
         # Track cost
         if cost_tracker:
             tokens = response.usage.total_tokens if hasattr(response, 'usage') else 500
             cost_tracker.track_operation("enrichment", config.OPENAI_MODEL_GPT, tokens, contact.id)
 
-        # Save to database
-        db.add(contact)
+    # Update contact
+    for field, value in enrichment.items():
+        setattr(contact, field, value)
 
-        # Log audit trail
-        audit = AuditLog(
-            contact_id=contact.id,
-            old_status=ContactStatus.IMPORTED.value,
-            new_status=ContactStatus.ENRICHED.value,
-            action="enrichment",
-            details={"model": config.OPENAI_MODEL_GPT}
-        )
-        db.add(audit)
+    # Save to database
+    db.add(contact)
 
-        db.commit()
+    # Log audit trail
+    db.add(AuditLog(**_enrichment_audit_row(contact.id)))
 
-        logger.info(f"Enriched contact {contact.id}: {contact.name}")
+    db.commit()
 
-        return contact
+    logger.info(f"Enriched contact {contact.id}: {contact.name}")
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON response for contact {contact.id}: {e}")
-        contact.status = ContactStatus.ENRICHMENT_FAILED
-        contact.error_message = "Invalid response format"
-        db.commit()
-        return contact
+    return contact
 
-    except Exception as e:
-        logger.error(f"Error enriching contact {contact.id}: {e}")
 
-        if retry_count < 3:
-            logger.info(f"Retrying enrichment for contact {contact.id} (attempt {retry_count + 1})")
-            time.sleep(2 ** retry_count)  # Exponential backoff
-            return enrich_contact(contact, db, api_key, retry_count + 1, cost_tracker)
+async def enrich_contact_async(
+    contact: Contact,
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    max_retries: int = 3,
+    use_cache: bool = True
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Fetch enrichment for a contact without touching the database.
 
-        contact.status = ContactStatus.ENRICHMENT_FAILED
-        contact.error_message = f"API error after {retry_count} retries: {str(e)}"
-        contact.retry_count = retry_count
-        db.commit()
+    Args:
+        contact: Contact to enrich
+        client: Async OpenAI client
+        semaphore: Caps concurrent requests across the batch
+        max_retries: Retries on API errors, with exponential backoff
+        use_cache: Reuse a cached result for the same prompt inputs
 
-        return contact
+    Returns:
+        Tuple of (update mapping for the contact, tokens used)
+    """
+    cached = get_cached_enrichment(contact) if use_cache else None
+    if cached is not None:
+        cached["id"] = contact.id
+        return cached, 0
 
+    prompt = build_enrichment_prompt(contact)
 
-def enrich_contacts_batch(
-    contacts: List[Contact],
+    for attempt in range(max_retries + 1):
+        try:
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model=config.OPENAI_MODEL_GPT,
+                    messages=[
+                        {"role": "system", "content": ENRICHMENT_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=500
+                )
+
+            tokens = response.usage.total_tokens if response.usage else 500
+            content = response.choices[0].message.content
+
+            try:
+                update = parse_enrichment(content)
+                cache_enrichment(contact, update)
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON response for contact {contact.id}: {e}")
+                update = {
+                    "status": ContactStatus.ENRICHMENT_FAILED,
+                    "error_message": "Invalid response format"
+                }
+
+            update["id"] = contact.id
+            return update, tokens
+
+        except Exception as e:
+            logger.error(f"Error enriching contact {contact.id}: {e}")
+
+            if attempt < max_retries:
+                logger.info(f"Retrying enrichment for contact {contact.id} (attempt {attempt + 1})")
+                await asyncio.sleep(_retry_delay(attempt))
+                continue
+
+            return {
+                "id": contact.id,
+                "status": ContactStatus.ENRICHMENT_FAILED,
+                "error_message": f"API error after {attempt} retries: {str(e)}",
+                "retry_count": attempt
+            }, 0
+
+
+async def enrich_contacts_batch_async(
+    contacts: Iterable[Contact],
     db: Session,
-    api_key: str = None,
-    batch_size: int = 10,
+    concurrency: int = DEFAULT_ENRICHMENT_CONCURRENCY,
     progress_callback=None,
-    cost_tracker: Optional[CostTracker] = None
+    cost_tracker: Optional[CostTracker] = None,
+    use_cache: bool = True,
+    chunk_size: int = ENRICHMENT_CHUNK_SIZE
 ) -> List[Contact]:
     """
-    Enrich multiple contacts in batches.
+    Enrich multiple contacts with concurrent OpenAI calls.
+
+    Contacts are processed ``chunk_size`` at a time, so any iterable (such
+    as a ``yield_per`` result) can be enriched in bounded memory. Within a
+    chunk up to ``concurrency`` requests are in flight at once; successful
+    results are then embedded in batched requests and written back in a
+    single bulk update and commit.
 
     Args:
-        contacts: List of contacts to enrich
+        contacts: Contacts to enrich
         db: Database session
-        api_key: Optional API key
-        batch_size: Number of contacts per batch
-        progress_callback: Optional callback function(current, total)
+        concurrency: Maximum concurrent OpenAI requests
+        progress_callback: Optional callback function(current, total);
+            total is None when ``contacts`` has no length
         cost_tracker: Optional cost tracker
+        use_cache: Reuse cached results for contacts already enriched
+        chunk_size: Contacts enriched and committed per chunk
 
     Returns:
         List of enriched contacts
     """
-    enriched = []
-
-    for i, contact in enumerate(contacts):
-        # Check budget if cost tracker provided
-        if cost_tracker and not cost_tracker.check_budget():
-            logger.warning(f"Budget limit reached after {i} contacts")
+    total = len(contacts) if hasattr(contacts, "__len__") else None
+    client = None
+    semaphore = asyncio.Semaphore(concurrency)
+    completed = 0
+    enriched: List[Contact] = []
+
+    async def _enrich(contact: Contact) -> Tuple[Dict[str, Any], int]:
+        nonlocal completed
+        result = await enrich_contact_async(contact, client, semaphore, use_cache=use_cache)
+        completed += 1
+        if progress_callback:
+            progress_callback(completed, total)
+        return result
+
+    for chunk in chunked(contacts, chunk_size):
+        # Check budget if cost tracker provided; the first check per day reads the
+        # database (and flushes buffered costs), so keep it off the event loop
+        if cost_tracker and not await asyncio.to_thread(cost_tracker.check_budget):
+            logger.warning("Budget limit reached during batch enrichment")
             break
 
-        try:
-            result = enrich_contact(contact, db, api_key, cost_tracker=cost_tracker)
-            enriched.append(result)
+        client = client or get_async_openai_client()
+        results = await asyncio.gather(*[_enrich(contact) for contact in chunk])
 
-            if progress_callback:
-                progress_callback(i + 1, len(contacts))
+        await asyncio.to_thread(_embed_enriched, chunk, results, cost_tracker)
+        await asyncio.to_thread(_persist_enrichment, db, results, cost_tracker)
+        enriched.extend(chunk)
 
-        except Exception as e:
-            logger.error(f"Failed to enrich contact {contact.id}: {e}")
-            contact.status = ContactStatus.ENRICHMENT_FAILED
-            enriched.append(contact)
+    return enriched
 
-        # Small delay to avoid rate limiting
-        if (i + 1) % batch_size == 0:
-            time.sleep(1)
 
-    return enriched
+def _embed_enriched(
+    contacts: List[Contact],
+    results: List[Tuple[Dict[str, Any], int]],
+    cost_tracker: Optional[CostTracker]
+) -> None:
+    """Attach embeddings to successful enrichment updates using batched requests."""
+    enriched = [
+        (contact, update) for contact, (update, _) in zip(contacts, results)
+        if update["status"] == ContactStatus.ENRICHED
+    ]
+    if not enriched:
+        return
+
+    texts = [
+        build_embedding_text(
+            contact,
+            **{field: update[field] for field in EMBEDDING_TEXT_FIELDS if field in update}
+        )
+        for contact, update in enriched
+    ]
+
+    try:
+        embeddings, tokens = embed_texts(texts)
+    except Exception as e:
+        # Contacts stay enriched; clustering can embed them later
+        logger.error(f"Failed to embed {len(texts)} enriched contacts: {e}")
+        return
+
+    for (_, update), embedding in zip(enriched, embeddings):
+        update["embedding"] = embedding
+
+    if cost_tracker:
+        cost_tracker.track_operation("embedding", config.OPENAI_MODEL_EMBEDDING, tokens or None)
+
+
+def _persist_enrichment(
+    db: Session,
+    results: List[Tuple[Dict[str, Any], int]],
+    cost_tracker: Optional[CostTracker]
+) -> None:
+    """Write batch enrichment results, audit rows and costs in one transaction."""
+    updates = [update for update, _ in results]
+    db.bulk_update_mappings(Contact, updates)
+
+    # Plain mappings in one executemany; no ORM objects or identity-map bookkeeping
+    db.bulk_insert_mappings(AuditLog, [
+        _enrichment_audit_row(update["id"])
+        for update in updates
+        if update["status"] == ContactStatus.ENRICHED
+    ])
+
+    db.commit()
+
+    if cost_tracker:
+        for update, tokens in results:
+            if tokens:
+                cost_tracker.track_operation("enrichment", config.OPENAI_MODEL_GPT, tokens, update["id"])
+
+    logger.info(f"Enriched {len(updates)} contacts in batch")
+
+
+def enrich_contacts_batch(
+    contacts: Iterable[Contact],
+    db: Session,
+    api_key: str = None,
+    concurrency: int = DEFAULT_ENRICHMENT_CONCURRENCY,
+    progress_callback=None,
+    cost_tracker: Optional[CostTracker] = None,
+    use_cache: bool = True,
+    chunk_size: int = ENRICHMENT_CHUNK_SIZE
+) -> List[Contact]:
+    """
+    Enrich multiple contacts concurrently (blocking wrapper).
+
+    Runs :func:`enrich_contacts_batch_async` on a fresh event loop; async
+    callers should await that coroutine directly instead.
+
+    Args:
+        contacts: Contacts to enrich
+        db: Database session
+        api_key: Unused; the configured API key is always used
+        concurrency: Maximum concurrent OpenAI requests
+        progress_callback: Optional callback function(current, total)
+        cost_tracker: Optional cost tracker
+        use_cache: Reuse cached results for contacts already enriched
+        chunk_size: Contacts enriched and committed per chunk
+
+    Returns:
+        List of enriched contacts
+    """
+    return run_with_openai(enrich_contacts_batch_async(
+        contacts,
+        db,
+        concurrency=concurrency,
+        progress_callback=progress_callback,
+        cost_tracker=cost_tracker,
+        use_cache=use_cache,
+        chunk_size=chunk_size
+    ))
@@ -4,15 +4,46 @@ Follow-up email automation service.
 
 from datetime import datetime, timedelta
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager, raiseload
 from src.models import EmailDraft, DraftStatus, Contact, ContactStatus, Reply, EmailTemplate
 from src.config import config
 from src.services.drafting import generate_email_draft
 from src.services.cost_tracker import CostTracker
+from src.utils.cache import invalidate_drafts
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Default follow-up bodies, built once; {{placeholders}} are filled per contact by the
+# template engine (doubled in the first body, which is str.format-ed with the original)
+FIRST_FOLLOWUP_BODY = """Hi {{{{name}}}},
+
+I wanted to follow up on my previous email about {{{{topic}}}}.
+
+{{{{original_value_prop}}}}
+
+Would you have 15 minutes this week to discuss?
+
+Best regards,
+{{{{sender_name}}}}
+
+---
+Original message:
+{original_body}...
+"""
+
+LATER_FOLLOWUP_BODY = """Hi {{name}},
+
+I know you're busy, so I'll keep this brief.
+
+I'd love to share how {{topic}} could benefit {{company}}.
+
+If you're not interested, just let me know and I won't follow up again.
+
+Best,
+{{sender_name}}
+"""
+
 
 class FollowupGenerator:
     """Generate follow-up emails for non-responders."""
@@ -40,30 +71,26 @@ class FollowupGenerator:
         """
         cutoff_date = datetime.utcnow() - timedelta(days=days_since_send)
 
-        # Find sent drafts that need follow-up
-        sent_drafts = self.db.query(EmailDraft).filter(
-            EmailDraft.status == DraftStatus.SENT,
-            EmailDraft.sent_at <= cutoff_date,
-            EmailDraft.followup_count < max_followup_count
-        ).all()
+        # Sent drafts with no reply from a still-subscribed contact, in one query
+        sent_drafts = (
+            self.db.query(EmailDraft)
+            .join(EmailDraft.contact)
+            .options(contains_eager(EmailDraft.contact), raiseload("*"))
+            .filter(
+                EmailDraft.status == DraftStatus.SENT,
+                EmailDraft.sent_at <= cutoff_date,
+                EmailDraft.followup_count < max_followup_count,
+                ~EmailDraft.replies.any(),
+                Contact.unsubscribed.isnot(True)
+            )
+            .all()
+        )
 
         followup_drafts = []
+        counted_ids = []
 
         for draft in sent_drafts:
-            # Check if contact has replied
-            has_reply = self.db.query(Reply).filter(
-                Reply.draft_id == draft.id
-            ).first()
-
-            if has_reply:
-                logger.debug(f"Skipping follow-up for draft {draft.id} - contact replied")
-                continue
-
-            # Check if contact unsubscribed
-            contact = self.db.query(Contact).filter(Contact.id == draft.contact_id).first()
-            if not contact or contact.unsubscribed:
-                logger.debug(f"Skipping follow-up for draft {draft.id} - contact unsubscribed")
-                continue
+            contact = draft.contact
 
             # Generate follow-up draft
             try:
@@ -72,20 +99,25 @@ class FollowupGenerator:
 
                 # Increment followup count on original draft
                 draft.followup_count += 1
-                self.db.commit()
+                counted_ids.append(draft.id)
 
                 logger.info(f"Generated follow-up draft for contact {contact.email}")
 
             except Exception as e:
                 logger.error(f"Failed to generate follow-up for draft {draft.id}: {e}")
 
+        # One commit for every follow-up and count increment in the run
+        self.db.commit()
+        invalidate_drafts(*counted_ids)
+
         return followup_drafts
 
     def _generate_followup_draft(
         self,
         original_draft: EmailDraft,
         contact: Contact,
-        template: Optional[EmailTemplate] = None
+        template: Optional[EmailTemplate] = None,
+        commit: bool = False
     ) -> EmailDraft:
         """
         Generate a follow-up draft based on the original email.
@@ -94,6 +126,8 @@ class FollowupGenerator:
             original_draft: Original sent draft
             contact: Contact to follow up with
             template: Optional custom template
+            commit: Commit immediately; by default the draft is only flushed
+                and the caller commits
 
         Returns:
             New EmailDraft for follow-up
@@ -108,6 +142,7 @@ class FollowupGenerator:
             template=template,
             db=self.db,
             cost_tracker=self.cost_tracker,
+            commit=False,
             original_thread_id=original_draft.thread_id
         )
 
@@ -116,8 +151,10 @@ class FollowupGenerator:
         followup_draft.parent_draft_id = original_draft.id
         followup_draft.followup_sequence = original_draft.followup_count + 1
 
-        self.db.commit()
-        self.db.refresh(followup_draft)
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
 
         return followup_draft
 
@@ -134,36 +171,11 @@ class FollowupGenerator:
         # Simple follow-up templates based on sequence
         if original_draft.followup_count == 0:
             # First follow-up
-            subject = f"Re: {original_draft.subject}"
-            body = f"""Hi {{{{name}}}},
-
-I wanted to follow up on my previous email about {{{{topic}}}}.
-
-{{{{original_value_prop}}}}
-
-Would you have 15 minutes this week to discuss?
-
-Best regards,
-{{{{sender_name}}}}
-
----
-Original message:
-{original_draft.body[:200]}...
-"""
+            body = FIRST_FOLLOWUP_BODY.format(original_body=original_draft.body[:200])
         else:
             # Second+ follow-up
-            subject = f"Re: {original_draft.subject}"
-            body = f"""Hi {{{{name}}}},
-
-I know you're busy, so I'll keep this brief.
-
-I'd love to share how {{{{topic}}}} could benefit {{{{company}}}}.
-
-If you're not interested, just let me know and I won't follow up again.
-
-Best,
-{{{{sender_name}}}}
-"""
+            body = LATER_FOLLOWUP_BODY
+        subject = f"Re: {original_draft.subject}"
 
         return EmailTemplate(
             name=f"Auto Follow-up #{original_draft.followup_count + 1}",
@@ -188,7 +200,7 @@ Best,
         Returns:
             Generated follow-up draft
         """
-        draft = self.db.query(EmailDraft).filter(EmailDraft.id == draft_id).first()
+        draft = self.db.get(EmailDraft, draft_id)
         if not draft:
             raise ValueError(f"Draft {draft_id} not found")
 
@@ -212,7 +224,7 @@ Best,
         followup.status = DraftStatus.SCHEDULED
 
         self.db.commit()
-        self.db.refresh(followup)
+        invalidate_drafts(draft_id)
 
         return followup
 
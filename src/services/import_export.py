@@ -3,23 +3,68 @@ Data import and export services.
 """
 
 import csv
-import json
+import io
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, BinaryIO, Iterable, Iterator, Set, TextIO, Tuple, Union
 from io import StringIO
-from sqlalchemy.orm import Session
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only, raiseload, selectinload
 from src.models import Contact, ContactStatus, EmailDraft, Reply
-from src.utils.helpers import validate_email, parse_csv_content
+from src.utils.helpers import chunked, validate_email
 import logging
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pacsv = None
+
 logger = logging.getLogger(__name__)
 
+# Rows accumulated before each commit during CSV import
+DEFAULT_IMPORT_BATCH_SIZE = 1000
+
+# Emails per IN (...) lookup, kept under SQLite's bound-parameter limit
+EXISTING_EMAIL_LOOKUP_SIZE = 500
+
+# Optional CSV columns copied onto imported contacts when the model has them
+_OPTIONAL_CONTACT_FIELDS = tuple(
+    field for field in (
+        "company", "title", "industry", "location", "phone",
+        "linkedin_url", "website", "notes"
+    )
+    if field in Contact.__table__.columns
+)
+
+# pyarrow read block size; each block is tokenized in C++ on its own thread
+_ARROW_BLOCK_SIZE = 1 << 20
+
+# Columns every import file must provide (after alias normalization)
+_REQUIRED_FIELDS = frozenset(("name", "email"))
+
+# Common alternate spellings of CSV headers, keyed by lowercased header
+_HEADER_ALIASES = {
+    "full_name": "name",
+    "full name": "name",
+    "contact_name": "name",
+    "e-mail": "email",
+    "email_address": "email",
+    "email address": "email",
+    "company_name": "company",
+    "organization": "company",
+    "job_title": "title",
+    "job title": "title",
+    "phone_number": "phone",
+    "linkedin": "linkedin_url",
+}
+
 
 class ImportResult:
     """Result of import operation."""
 
     def __init__(self):
-        self.contacts: List[Contact] = []
         self.success_count: int = 0
         self.error_count: int = 0
         self.errors: List[str] = []
@@ -41,20 +86,146 @@ def import_contacts(
         user_id: Optional user ID
         skip_duplicates: If True, skip duplicate emails
 
+    Returns:
+        ImportResult object
+    """
+    return import_contacts_stream(StringIO(csv_content), db, user_id, skip_duplicates)
+
+
+def import_contacts_stream(
+    fileobj: Union[BinaryIO, TextIO],
+    db: Session,
+    user_id: Optional[int] = None,
+    skip_duplicates: bool = True,
+    batch_size: int = DEFAULT_IMPORT_BATCH_SIZE
+) -> ImportResult:
+    """
+    Import contacts from a CSV file object without buffering it whole.
+
+    Rows are decoded and parsed incrementally (binary input goes through
+    pyarrow when it is installed, text input through ``csv.DictReader``)
+    and bulk-inserted every ``batch_size`` rows, so memory stays bounded
+    by the batch rather than the upload size.
+
+    Args:
+        fileobj: Binary file-like object (e.g. ``UploadFile.file``) or an
+            already-decoded text stream (e.g. ``open(path, newline="")``)
+        db: Database session
+        user_id: Optional user ID
+        skip_duplicates: If True, skip duplicate emails
+        batch_size: Number of rows per insert/commit
+
     Returns:
         ImportResult object
     """
     result = ImportResult()
+    if isinstance(fileobj, io.TextIOBase):
+        rows = _iter_dict_rows(fileobj, result)
+    else:
+        rows = _iter_csv_rows(fileobj, result)
+    return _import_rows(rows, db, user_id, skip_duplicates, batch_size, result=result)
+
+
+def _normalize_header(header: str) -> str:
+    """Map a raw CSV header onto the contact field name it stands for."""
+    key = header.strip().lower()
+    return _HEADER_ALIASES.get(key, key)
+
+
+def _check_required_headers(headers: List[str], result: ImportResult) -> bool:
+    """Record an error and return False when required columns are absent."""
+    missing = _REQUIRED_FIELDS.difference(headers)
+    if missing:
+        result.errors.append(f"Missing required columns: {', '.join(sorted(missing))}")
+        result.error_count += 1
+        return False
+    return True
+
+
+def _iter_dict_rows(text: TextIO, result: ImportResult) -> Iterator[Dict[str, Optional[str]]]:
+    """Yield rows from a text CSV stream with normalized header keys."""
+    reader = csv.DictReader(text)
+    if reader.fieldnames is None:
+        return
+
+    reader.fieldnames = [_normalize_header(h) for h in reader.fieldnames]
+    if _check_required_headers(reader.fieldnames, result):
+        yield from reader
+
+
+def _iter_csv_rows(fileobj: BinaryIO, result: ImportResult) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Yield CSV rows as dicts, using pyarrow's streaming reader when installed.
 
+    Falls back to ``csv.DictReader`` over a UTF-8 text wrapper otherwise.
+    Header names are normalized once per file in both cases, and the
+    underlying file object is left open for its owner.
+    """
+    if pacsv is not None:
+        # Read the header ourselves so every column, whatever its spelling, can be
+        # typed as text; values like phone numbers then keep their leading zeros
+        header_line = fileobj.readline()
+        if not header_line.strip():
+            return
+        raw_headers = next(csv.reader([header_line.decode("utf-8-sig")]))
+
+        def skip_invalid_row(row) -> str:
+            # pyarrow rejects ragged rows that DictReader would pad; report and move on.
+            # Its row numbers start after the header line consumed above.
+            where = f"Row {row.number + 1}" if row.number is not None else "Row"
+            result.errors.append(
+                f"{where}: Expected {row.expected_columns} columns, got {row.actual_columns}"
+            )
+            result.error_count += 1
+            return "skip"
+
+        reader = pacsv.open_csv(
+            pa.PythonFile(fileobj, mode="r"),
+            read_options=pacsv.ReadOptions(block_size=_ARROW_BLOCK_SIZE, column_names=raw_headers),
+            parse_options=pacsv.ParseOptions(invalid_row_handler=skip_invalid_row),
+            convert_options=pacsv.ConvertOptions(
+                column_types={column: pa.string() for column in raw_headers}
+            )
+        )
+
+        headers = [_normalize_header(name) for name in raw_headers]
+        if not _check_required_headers(headers, result):
+            return
+
+        for record_batch in reader:
+            columns = [column.to_pylist() for column in record_batch.columns]
+            for values in zip(*columns):
+                yield dict(zip(headers, values))
+        return
+
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
     try:
-        # Parse CSV
-        reader = csv.DictReader(StringIO(csv_content))
+        yield from _iter_dict_rows(text, result)
+    finally:
+        # Hand the underlying file back to its owner instead of closing it
+        text.detach()
+
+
+def _import_rows(
+    reader: Iterable[Dict[str, str]],
+    db: Session,
+    user_id: Optional[int],
+    skip_duplicates: bool,
+    batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+    result: Optional[ImportResult] = None
+) -> ImportResult:
+    """Validate parsed CSV rows and bulk-insert them one batch at a time."""
+    if result is None:
+        result = ImportResult()
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+    seen: Set[str] = set()
 
+    try:
         for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is 1)
             try:
                 # Required fields
-                name = row.get("name", "").strip()
-                email = row.get("email", "").strip()
+                name = (row.get("name") or "").strip()
+                email = (row.get("email") or "").strip()
 
                 if not name or not email:
                     result.errors.append(f"Row {row_num}: Missing name or email")
@@ -67,45 +238,38 @@ def import_contacts(
                     result.error_count += 1
                     continue
 
-                # Check for duplicates
-                existing = db.query(Contact).filter(Contact.email == email).first()
-                if existing:
-                    if skip_duplicates:
-                        result.duplicates.append(email)
-                        continue
-                    else:
-                        result.errors.append(f"Row {row_num}: Duplicate email '{email}'")
-                        result.error_count += 1
-                        continue
-
-                # Create contact
-                contact = Contact(
-                    name=name,
-                    email=email,
-                    company=row.get("company", "").strip() or None,
-                    title=row.get("title", "").strip() or None,
-                    industry=row.get("industry", "").strip() or None,
-                    location=row.get("location", "").strip() or None,
-                    phone=row.get("phone", "").strip() or None,
-                    linkedin_url=row.get("linkedin_url", "").strip() or None,
-                    website=row.get("website", "").strip() or None,
-                    notes=row.get("notes", "").strip() or None,
-                    status=ContactStatus.IMPORTED,
-                    user_id=user_id,
-                    created_at=datetime.utcnow()
-                )
-
-                db.add(contact)
-                result.contacts.append(contact)
-                result.success_count += 1
+                # Repeats within the file never reach the database
+                if email in seen:
+                    _record_duplicate(result, row_num, email, skip_duplicates)
+                    continue
+                seen.add(email)
+
+                mapping = {
+                    "name": name,
+                    "email": email,
+                    "status": ContactStatus.IMPORTED,
+                    "created_at": datetime.utcnow()
+                }
+                # Leave user_id out when unset so the column default still applies
+                if user_id is not None:
+                    mapping["user_id"] = user_id
+                for field in _OPTIONAL_CONTACT_FIELDS:
+                    mapping[field] = (row.get(field) or "").strip() or None
+
+                batch.append((row_num, mapping))
+
+                if len(batch) >= batch_size:
+                    _flush_import_batch(db, batch, result, skip_duplicates)
+                    batch = []
 
             except Exception as e:
                 result.errors.append(f"Row {row_num}: {str(e)}")
                 result.error_count += 1
                 logger.error(f"Error importing row {row_num}: {e}")
 
-        # Commit all contacts
-        db.commit()
+        # Flush the final partial batch
+        if batch:
+            _flush_import_batch(db, batch, result, skip_duplicates)
 
         logger.info(f"Imported {result.success_count} contacts, {result.error_count} errors, "
                    f"{len(result.duplicates)} duplicates")
@@ -118,6 +282,51 @@ def import_contacts(
     return result
 
 
+def _flush_import_batch(
+    db: Session,
+    batch: List[Tuple[int, Dict[str, Any]]],
+    result: ImportResult,
+    skip_duplicates: bool
+) -> None:
+    """Drop emails that already exist, then insert the rest in one statement."""
+    emails = [mapping["email"] for _, mapping in batch]
+    existing: Set[str] = set()
+    for email_chunk in chunked(emails, EXISTING_EMAIL_LOOKUP_SIZE):
+        existing.update(db.scalars(select(Contact.email).where(Contact.email.in_(email_chunk))))
+
+    new_rows = []
+    for row_num, mapping in batch:
+        if mapping["email"] in existing:
+            _record_duplicate(result, row_num, mapping["email"], skip_duplicates)
+        else:
+            new_rows.append(mapping)
+
+    if not new_rows:
+        return
+
+    try:
+        # Render empty optional fields as NULL so every row shares one
+        # column set and the batch goes out as a single executemany
+        db.bulk_insert_mappings(Contact, new_rows, render_nulls=True)
+        db.commit()
+        result.success_count += len(new_rows)
+    except Exception as e:
+        db.rollback()
+        first_row, last_row = batch[0][0], batch[-1][0]
+        result.errors.append(f"Rows {first_row}-{last_row}: {str(e)}")
+        result.error_count += len(new_rows)
+        logger.error(f"Error importing rows {first_row}-{last_row}: {e}")
+
+
+def _record_duplicate(result: ImportResult, row_num: int, email: str, skip_duplicates: bool) -> None:
+    """Record a duplicate email as skipped or as an error."""
+    if skip_duplicates:
+        result.duplicates.append(email)
+    else:
+        result.errors.append(f"Row {row_num}: Duplicate email '{email}'")
+        result.error_count += 1
+
+
 def export_contacts(
     db: Session,
     user_id: Optional[int] = None,
@@ -136,8 +345,14 @@ def export_contacts(
     Returns:
         Exported data as string
     """
-    # Build query
-    query = db.query(Contact).filter(Contact.deleted == False)
+    if format == "csv":
+        # Streamed in chunks rather than loading every contact first
+        return "".join(iter_contacts_csv(db, user_id=user_id, status=status))
+    elif format != "json":
+        raise ValueError(f"Unsupported export format: {format}")
+
+    # Build query; exports only read columns, so any lazy load is a bug
+    query = db.query(Contact).options(raiseload("*")).filter(Contact.deleted == False)
 
     if user_id:
         query = query.filter(Contact.user_id == user_id)
@@ -145,48 +360,74 @@ def export_contacts(
     if status:
         query = query.filter(Contact.status == status)
 
-    contacts = query.all()
+    return _export_contacts_json(query.all())
 
-    if format == "csv":
-        return _export_contacts_csv(contacts)
-    elif format == "json":
-        return _export_contacts_json(contacts)
-    else:
-        raise ValueError(f"Unsupported export format: {format}")
 
+# Column order for contact CSV exports
+CONTACT_EXPORT_FIELDS = [
+    "id", "name", "email", "company", "title", "industry", "location",
+    "phone", "linkedin_url", "website", "status", "relevance_score",
+    "created_at", "updated_at"
+]
 
-def _export_contacts_csv(contacts: List[Contact]) -> str:
-    """Export contacts as CSV string."""
-    output = StringIO()
 
-    fieldnames = [
-        "id", "name", "email", "company", "title", "industry", "location",
-        "phone", "linkedin_url", "website", "status", "relevance_score",
-        "created_at", "updated_at"
-    ]
+def _contact_csv_row(contact: Contact) -> Dict[str, Any]:
+    """Flatten a contact into a CSV row keyed by CONTACT_EXPORT_FIELDS."""
+    row = {
+        field: getattr(contact, field, None) or ""
+        for field in CONTACT_EXPORT_FIELDS
+    }
+    row["id"] = contact.id
+    row["status"] = contact.status.value if contact.status else ""
+    row["created_at"] = contact.created_at.isoformat() if contact.created_at else ""
+    row["updated_at"] = contact.updated_at.isoformat() if contact.updated_at else ""
+    return row
+
+
+def iter_contacts_csv(
+    db: Session,
+    user_id: Optional[int] = None,
+    status: Optional[ContactStatus] = None,
+    chunk_size: int = 500
+) -> Iterator[str]:
+    """
+    Yield a contacts CSV export incrementally.
+
+    Rows are fetched ``chunk_size`` at a time and each chunk is yielded
+    as soon as it is formatted, so memory stays flat regardless of how
+    many contacts are exported.
+
+    Args:
+        db: Database session (must stay open while iterating)
+        user_id: Optional user ID filter
+        status: Optional status filter
+        chunk_size: Rows fetched and emitted per chunk
+
+    Yields:
+        CSV text chunks, header first
+    """
+    query = db.query(Contact).options(raiseload("*")).filter(Contact.deleted == False)
+
+    if user_id:
+        query = query.filter(Contact.user_id == user_id)
+
+    if status:
+        query = query.filter(Contact.status == status)
 
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
+    buffer = StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CONTACT_EXPORT_FIELDS)
     writer.writeheader()
 
-    for contact in contacts:
-        writer.writerow({
-            "id": contact.id,
-            "name": contact.name,
-            "email": contact.email,
-            "company": contact.company or "",
-            "title": contact.title or "",
-            "industry": contact.industry or "",
-            "location": contact.location or "",
-            "phone": contact.phone or "",
-            "linkedin_url": contact.linkedin_url or "",
-            "website": contact.website or "",
-            "status": contact.status.value if contact.status else "",
-            "relevance_score": contact.relevance_score or "",
-            "created_at": contact.created_at.isoformat() if contact.created_at else "",
-            "updated_at": contact.updated_at.isoformat() if contact.updated_at else ""
-        })
+    # The header rides along with the first chunk
+    for contacts in chunked(query.yield_per(chunk_size), chunk_size):
+        writer.writerows(map(_contact_csv_row, contacts))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
 
-    return output.getvalue()
+    # Header alone for an empty export
+    if buffer.tell():
+        yield buffer.getvalue()
 
 
 def _export_contacts_json(contacts: List[Contact]) -> str:
@@ -207,11 +448,12 @@ def _export_contacts_json(contacts: List[Contact]) -> str:
             "website": contact.website,
             "status": contact.status.value if contact.status else None,
             "relevance_score": contact.relevance_score,
-            "created_at": contact.created_at.isoformat() if contact.created_at else None,
-            "updated_at": contact.updated_at.isoformat() if contact.updated_at else None
+            "created_at": contact.created_at,
+            "updated_at": contact.updated_at
         })
 
-    return json.dumps(data, indent=2)
+    # orjson writes datetimes as ISO 8601 itself
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
 
 
 def export_campaign_data(
@@ -241,11 +483,36 @@ def export_campaign_data(
         "replies": []
     }
 
-    # Export contacts
-    query = db.query(Contact).filter(Contact.deleted == False)
+    # Export contacts; drafts and their replies come from batched selectin loads
+    # and anything else left to lazy loading raises instead of querying per row.
+    # Only the exported columns are fetched at each level.
+    query = db.query(Contact).options(
+        load_only(Contact.id, Contact.name, Contact.email, Contact.company, Contact.status),
+        raiseload("*")
+    ).filter(Contact.deleted == False)
     if user_id:
         query = query.filter(Contact.user_id == user_id)
 
+    if include_drafts:
+        draft_options = [
+            load_only(
+                EmailDraft.id, EmailDraft.contact_id, EmailDraft.subject,
+                EmailDraft.status, EmailDraft.sent_at
+            ),
+            raiseload("*")
+        ]
+        if include_replies:
+            draft_options.append(
+                selectinload(EmailDraft.replies).options(
+                    load_only(
+                        Reply.id, Reply.draft_id, Reply.from_email,
+                        Reply.intent, Reply.received_at
+                    ),
+                    raiseload("*")
+                )
+            )
+        query = query.options(selectinload(Contact.drafts).options(*draft_options))
+
     contacts = query.all()
     data["contacts"] = [
         {
@@ -260,10 +527,7 @@ def export_campaign_data(
 
     # Export drafts
     if include_drafts:
-        contact_ids = [c.id for c in contacts]
-        drafts = db.query(EmailDraft).filter(
-            EmailDraft.contact_id.in_(contact_ids)
-        ).all()
+        drafts = [d for c in contacts for d in c.drafts]
 
         data["drafts"] = [
             {
@@ -276,23 +540,19 @@ def export_campaign_data(
             for d in drafts
         ]
 
-    # Export replies
-    if include_replies:
-        draft_ids = [d["id"] for d in data["drafts"]]
-        replies = db.query(Reply).filter(
-            Reply.draft_id.in_(draft_ids)
-        ).all()
-
-        data["replies"] = [
-            {
-                "id": r.id,
-                "draft_id": r.draft_id,
-                "from_email": r.from_email,
-                "intent": r.intent.value if r.intent else None,
-                "received_at": r.received_at.isoformat() if r.received_at else None
-            }
-            for r in replies
-        ]
+        # Export replies
+        if include_replies:
+            data["replies"] = [
+                {
+                    "id": r.id,
+                    "draft_id": r.draft_id,
+                    "from_email": r.from_email,
+                    "intent": r.intent.value if r.intent else None,
+                    "received_at": r.received_at.isoformat() if r.received_at else None
+                }
+                for d in drafts
+                for r in d.replies
+            ]
 
     return data
 
@@ -309,7 +569,7 @@ def delete_contact_data(db: Session, contact_id: int) -> bool:
         True if successful
     """
     try:
-        contact = db.query(Contact).filter(Contact.id == contact_id).first()
+        contact = db.get(Contact, contact_id)
         if not contact:
             return False
 
@@ -321,10 +581,11 @@ def delete_contact_data(db: Session, contact_id: int) -> bool:
         contact.linkedin_url = None
         contact.notes = None
 
-        # Also mark associated drafts and replies
-        drafts = db.query(EmailDraft).filter(EmailDraft.contact_id == contact_id).all()
-        for draft in drafts:
-            draft.to_email = contact.email
+        # Also mark associated drafts, in one UPDATE
+        db.query(EmailDraft).filter(EmailDraft.contact_id == contact_id).update(
+            {EmailDraft.to_email: contact.email},
+            synchronize_session=False
+        )
 
         db.commit()
         logger.info(f"Deleted data for contact {contact_id}")
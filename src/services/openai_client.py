@@ -0,0 +1,88 @@
+"""
+Shared OpenAI clients for every service that calls the API.
+"""
+
+import asyncio
+import importlib.util
+import weakref
+from typing import Awaitable, TypeVar
+import httpx
+from openai import DEFAULT_TIMEOUT, AsyncOpenAI, OpenAI
+from src.config import config
+
+T = TypeVar("T")
+
+# Keep-alive pool shared by enrichment, drafting, embedding and classification calls
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# httpx speaks HTTP/2 only with the optional h2 package; without it, stay on keep-alive HTTP/1.1
+OPENAI_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_client = None
+# Pooled async connections belong to the loop that opened them, so keep one client per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+
+def get_openai_client() -> OpenAI:
+    """Get or create the shared OpenAI client."""
+    global _client
+    if _client is None:
+        if not config.OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY not configured")
+        _client = OpenAI(
+            api_key=config.OPENAI_API_KEY,
+            max_retries=config.OPENAI_MAX_RETRIES,
+            http_client=httpx.Client(
+                timeout=DEFAULT_TIMEOUT, limits=OPENAI_HTTP_LIMITS, http2=OPENAI_HTTP2
+            )
+        )
+    return _client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Get or create the async OpenAI client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        if not config.OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY not configured")
+        client = AsyncOpenAI(
+            api_key=config.OPENAI_API_KEY,
+            max_retries=config.OPENAI_MAX_RETRIES,
+            http_client=httpx.AsyncClient(
+                timeout=DEFAULT_TIMEOUT, limits=OPENAI_HTTP_LIMITS, http2=OPENAI_HTTP2
+            )
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def close_openai_client() -> None:
+    """Close the shared sync client's pooled connections (called on shutdown)."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+async def close_async_openai_client() -> None:
+    """Close the running loop's async client, if one was created."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def run_with_openai(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine on a fresh event loop, as the blocking bulk wrappers do.
+
+    The loop's async client is closed before the loop ends, so repeated
+    calls don't leave a connection pool open per loop.
+    """
+    async def _run() -> T:
+        try:
+            return await coro
+        finally:
+            await close_async_openai_client()
+
+    return asyncio.run(_run())
@@ -3,7 +3,9 @@ Gmail quota management service.
 """
 
 from datetime import datetime, timedelta
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from src.database import dialect_insert
 from src.models import QuotaUsage
 from src.config import config
 import logging
@@ -18,59 +20,61 @@ class GmailQuotaManager:
         self.db = db
         self.user_id = user_id
         self.daily_limit = daily_limit or config.GMAIL_DAILY_SEND_LIMIT
-        self._ensure_quota_record()
-
-    def _ensure_quota_record(self):
-        """Ensure quota record exists for today."""
-        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-
-        quota = self.db.query(QuotaUsage).filter(
-            QuotaUsage.user_id == self.user_id,
-            QuotaUsage.date == today
-        ).first()
-
-        if not quota:
-            quota = QuotaUsage(
-                user_id=self.user_id,
-                date=today,
-                emails_sent=0,
-                quota_limit=self.daily_limit
-            )
-            self.db.add(quota)
-            self.db.commit()
-            logger.info(f"Created quota record for {today.date()}")
+        # Today's sent count as last read or written by this manager
+        self._quota_day = None
+        self._emails_sent = 0
 
     def increment(self, count: int = 1):
         """
         Increment sent email count.
 
+        Creates today's quota record on first use. The insert-or-increment
+        is a single statement, so concurrent senders cannot lose each
+        other's updates.
+
         Args:
             count: Number of emails sent (default 1)
         """
         today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
 
-        quota = self.db.query(QuotaUsage).filter(
-            QuotaUsage.user_id == self.user_id,
-            QuotaUsage.date == today
-        ).first()
-
-        if quota:
-            quota.emails_sent += count
-            self.db.commit()
-            logger.info(f"Incremented quota: {quota.emails_sent}/{self.daily_limit}")
-        else:
-            logger.error("Quota record not found")
+        stmt = dialect_insert(QuotaUsage).values(
+            user_id=self.user_id,
+            date=today,
+            emails_sent=count,
+            quota_limit=self.daily_limit
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={
+                "emails_sent": QuotaUsage.emails_sent + stmt.excluded.emails_sent,
+                "updated_at": datetime.utcnow()
+            }
+        )
+        emails_sent = self.db.scalar(stmt.returning(QuotaUsage.emails_sent))
+        self.db.commit()
+        self._quota_day, self._emails_sent = today, emails_sent
+
+        logger.info(f"Incremented quota: {emails_sent}/{self.daily_limit}")
 
     def get_used_quota(self) -> int:
-        """Get number of emails sent today."""
+        """
+        Get number of emails sent today.
+
+        The count is read once per day and then kept current from the
+        value each increment returns, so a send loop costs no extra reads.
+        """
         today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
 
-        quota = self.db.query(QuotaUsage).filter(
-            QuotaUsage.user_id == self.user_id,
-            QuotaUsage.date == today
-        ).first()
+        if self._quota_day != today:
+            emails_sent = self.db.scalar(
+                select(QuotaUsage.emails_sent).where(
+                    QuotaUsage.user_id == self.user_id,
+                    QuotaUsage.date == today
+                )
+            )
+            self._quota_day, self._emails_sent = today, emails_sent or 0
 
-        return quota.emails_sent if quota else 0
+        return self._emails_sent
 
     def get_remaining_quota(self) -> int:
         """Get remaining quota for today."""
@@ -111,9 +115,9 @@ class GmailQuotaManager:
             QuotaUsage.user_id == self.user_id
         ).order_by(QuotaUsage.date.desc()).first()
 
+        # Today's record is created by the first increment, which starts from zero
         if latest and latest.date < today:
             logger.info(f"New day detected, resetting quota")
-            self._ensure_quota_record()
 
     def reset(self):
         """Manually reset quota (for testing)."""
@@ -128,3 +132,5 @@ class GmailQuotaManager:
             quota.emails_sent = 0
             self.db.commit()
             logger.info("Quota reset to 0")
+
+        self._quota_day, self._emails_sent = today, 0
@@ -2,20 +2,324 @@
 Reply parsing and classification service.
 """
 
+import asyncio
+import hashlib
+import re
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any
-from sqlalchemy.orm import Session
-from src.models import Reply, EmailDraft, Contact, ReplyIntent
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+from openai import AsyncOpenAI
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session, load_only
+from src.models import Reply, EmailDraft, Contact, ContactStatus, ReplyIntent
 from src.config import config
 from src.services.cost_tracker import CostTracker
-from src.utils.helpers import strip_html, calculate_cost
-import openai
+from src.services.openai_client import get_async_openai_client, get_openai_client, run_with_openai
+from src.utils.cache import TTLCache, llm_cache
+from src.utils.helpers import chunked, strip_html
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
-openai.api_key = config.OPENAI_API_KEY
+# Maximum in-flight OpenAI requests while classifying a batch of replies
+DEFAULT_CLASSIFY_CONCURRENCY = 50
+
+# Replies labelled per GPT request in a batch, and completion tokens allowed per label
+CLASSIFY_GROUP_SIZE = 20
+GROUP_LABEL_TOKENS = 10
+
+CLASSIFIER_SYSTEM_PROMPT = "You are an email intent classifier."
+
+# Batch API polling: first wait and cap for the doubling interval, in seconds
+BATCH_POLL_INITIAL = 30.0
+BATCH_POLL_MAX = 600.0
+
+# Batch states after which polling stops
+BATCH_TERMINAL_STATUSES = frozenset(("completed", "failed", "expired", "cancelled"))
+
+# Unambiguous replies are labelled without a GPT call; group names are classifier labels.
+# A bare "unsubscribe" is not enough, since quoted outreach carries our own unsubscribe footer,
+# and "not interested" after "if you're" is our own follow-up wording, not the sender's.
+FAST_PATH_PATTERN = re.compile(
+    r"\b(?:"
+    r"(?P<OUT_OF_OFFICE>out of (?:the )?office|automatic reply|on vacation|away from (?:the|my) office)"
+    r"|(?P<UNSUBSCRIBE>unsubscribe me|please unsubscribe|remove me|opt[- ]out|stop emailing)"
+    r"|(?P<DECLINE>(?<!if you're )(?<!if you are )not interested|no thanks|please remove)"
+    r")\b",
+    re.IGNORECASE
+)
+
+# Start of quoted history in a stripped reply: "On <date> <name> wrote:", an
+# Outlook "Original Message" divider, or a ">" quote marker
+QUOTED_HISTORY_PATTERN = re.compile(
+    r"\bOn\b.{0,200}?\bwrote:|-{2,} ?Original Message ?-{2,}|(?:^|\s)>",
+    re.IGNORECASE
+)
+
+# Substrings marking a sentence as meeting availability, matched as one alternation
+AVAILABILITY_KEYWORDS = (
+    "available", "free", "time", "tuesday", "wednesday", "thursday",
+    "friday", "monday", "morning", "afternoon", "evening", "schedule"
+)
+AVAILABILITY_PATTERN = re.compile("|".join(AVAILABILITY_KEYWORDS), re.IGNORECASE)
+
+# Distinct reply bodies whose stripped text is kept in memory
+STRIP_HTML_CACHE_SIZE = 256
+
+# Leading characters of a reply scanned by the fast path
+FAST_PATH_SCAN_CHARS = 2000
+
+# Recently seen reply prefixes kept in memory in front of the disk cache
+LABEL_MEMO_SIZE = 4096
+LABEL_MEMO_TTL = 3600
+
+# Classifier labels mapped onto ReplyIntent; OTHER and unknown labels fall back to MAYBE
+INTENT_LABELS = {
+    "INTERESTED": ReplyIntent.INTERESTED,
+    "QUESTION": ReplyIntent.MAYBE,
+    "DECLINE": ReplyIntent.DECLINE,
+    "UNSUBSCRIBE": ReplyIntent.DECLINE,
+    "OUT_OF_OFFICE": ReplyIntent.AUTO_REPLY,
+}
+
+
+INTENT_CATEGORIES = """- INTERESTED: Positive response, wants to continue conversation
+- DECLINE: Not interested, polite rejection
+- OUT_OF_OFFICE: Automated out-of-office reply
+- UNSUBSCRIBE: Wants to be removed from communications
+- QUESTION: Asking for more information
+- OTHER: Unclear or other intent"""
+
+
+def build_classification_prompt(body: str) -> str:
+    """Build the GPT prompt that asks for a single intent label."""
+    return f"""Classify the intent of this email reply into one of these categories:
+{INTENT_CATEGORIES}
+
+Reply text:
+{body[:500]}
+
+Respond with ONLY the category name (e.g., "INTERESTED").
+"""
+
+
+def build_group_classification_prompt(bodies: List[str]) -> str:
+    """Build the GPT prompt that asks for one intent label per numbered reply."""
+    numbered = "\n\n".join(f"{i}. {body[:500]}" for i, body in enumerate(bodies, 1))
+    return f"""Classify the intent of each email reply below into one of these categories:
+{INTENT_CATEGORIES}
+
+Replies:
+{numbered}
+
+Respond as JSON: {{"labels": [...]}} with exactly {len(bodies)} category names, in reply order.
+"""
+
+
+def _classification_messages(prompt: str) -> list:
+    """Chat messages for one classification request."""
+    return [
+        {"role": "system", "content": CLASSIFIER_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def match_intent_label(body: str) -> Optional[str]:
+    """
+    Return the label of the first fast-path pattern in the reply, or None.
+
+    Only the sender's own text is scanned; quoted history (our outreach
+    and follow-ups) is cut off first.
+    """
+    end = min(len(body), FAST_PATH_SCAN_CHARS)
+    quoted = QUOTED_HISTORY_PATTERN.search(body, 0, end)
+    if quoted:
+        end = quoted.start()
+    match = FAST_PATH_PATTERN.search(body, 0, end)
+    return match.lastgroup if match else None
+
+
+# Labels by digest of the reply prefix the prompt uses; repeated auto-replies hit here
+_label_memo = TTLCache(maxsize=LABEL_MEMO_SIZE)
+
+
+def _label_cache_keys(body: str) -> Tuple[bytes, str]:
+    """In-memory and on-disk cache keys for a reply's label."""
+    memo_key = hashlib.blake2b(body[:500].encode("utf-8"), digest_size=16).digest()
+    disk_key = llm_cache.key(config.OPENAI_MODEL_GPT, CLASSIFIER_SYSTEM_PROMPT, build_classification_prompt(body))
+    return memo_key, disk_key
+
+
+def cached_intent_label(body: str) -> Optional[str]:
+    """
+    Label a reply without an API call when possible.
+
+    Tries the fast-path patterns, then labels remembered in memory, then
+    the disk cache. Returns None when GPT has to be asked.
+    """
+    label = match_intent_label(body)
+    if label:
+        return label
+
+    memo_key, disk_key = _label_cache_keys(body)
+    label = _label_memo.get(memo_key)
+    if label is None:
+        cached = llm_cache.get(disk_key)
+        if cached is not None:
+            label = cached.decode("utf-8")
+            _label_memo.set(memo_key, label, ttl=LABEL_MEMO_TTL)
+    return label
+
+
+def store_intent_label(body: str, label: str) -> None:
+    """Remember a GPT label for the reply in memory and on disk."""
+    memo_key, disk_key = _label_cache_keys(body)
+    _label_memo.set(memo_key, label, ttl=LABEL_MEMO_TTL)
+    llm_cache.set(disk_key, label.encode("utf-8"))
+
+
+@lru_cache(maxsize=STRIP_HTML_CACHE_SIZE)
+def _strip_reply_html(body: str) -> str:
+    """strip_html, memoized since vendor auto-replies repeat the same large HTML."""
+    return strip_html(body)
+
+
+def intent_from_label(label: str) -> ReplyIntent:
+    """Map a classifier label onto a ReplyIntent."""
+    return INTENT_LABELS.get(label, ReplyIntent.MAYBE)
+
+
+async def classify_intent_async(
+    body: str,
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore
+) -> Tuple[str, int]:
+    """
+    Ask GPT for a reply's intent label without touching the database.
+
+    Args:
+        body: Plain-text reply body
+        client: Async OpenAI client
+        semaphore: Caps concurrent requests across the batch
+
+    Returns:
+        Tuple of (label, tokens used); fast-path and cache hits use no tokens
+    """
+    label = cached_intent_label(body)
+    if label:
+        return label, 0
+
+    async with semaphore:
+        response = await client.chat.completions.create(
+            model=config.OPENAI_MODEL_GPT,
+            messages=_classification_messages(build_classification_prompt(body)),
+            temperature=0.0,
+            max_tokens=20
+        )
+
+    label = response.choices[0].message.content.strip().upper()
+    store_intent_label(body, label)
+    return label, response.usage.total_tokens
+
+
+async def classify_group_async(
+    bodies: List[str],
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore
+) -> Tuple[List[str], int]:
+    """
+    Ask GPT for the intent labels of several replies in one request.
+
+    Args:
+        bodies: Plain-text reply bodies
+        client: Async OpenAI client
+        semaphore: Caps concurrent requests across the batch
+
+    Returns:
+        Tuple of (labels in body order, tokens used by the whole request)
+
+    Raises:
+        ValueError: If the response doesn't hold exactly one label per body
+    """
+    async with semaphore:
+        response = await client.chat.completions.create(
+            model=config.OPENAI_MODEL_GPT,
+            messages=_classification_messages(build_group_classification_prompt(bodies)),
+            temperature=0.0,
+            max_tokens=20 + GROUP_LABEL_TOKENS * len(bodies),
+            response_format={"type": "json_object"}
+        )
+
+    labels = json.loads(response.choices[0].message.content).get("labels")
+    if not isinstance(labels, list) or len(labels) != len(bodies):
+        raise ValueError(f"Expected {len(bodies)} labels, got {labels!r}")
+
+    labels = [str(label).strip().upper() for label in labels]
+    for body, label in zip(bodies, labels):
+        store_intent_label(body, label)
+    return labels, response.usage.total_tokens
+
+
+async def classify_intents_async(
+    bodies: List[str],
+    concurrency: int = DEFAULT_CLASSIFY_CONCURRENCY,
+    group_size: int = CLASSIFY_GROUP_SIZE
+) -> List[Tuple[Optional[str], int]]:
+    """
+    Label many replies, sending uncached bodies to GPT ``group_size`` at a time.
+
+    Groups whose response can't be mapped back to their replies are retried
+    one reply per request. A request's tokens are split evenly across the
+    replies it labelled.
+
+    Returns:
+        One (label, tokens used) pair per body; label is None if classification failed
+    """
+    results: List[Tuple[Optional[str], int]] = []
+    misses = []
+    for i, body in enumerate(bodies):
+        label = cached_intent_label(body)
+        results.append((label, 0))
+        if label is None:
+            misses.append(i)
+
+    if not misses:
+        return results
+
+    client = get_async_openai_client()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    groups = list(chunked(misses, group_size))
+    group_results = await asyncio.gather(
+        *[classify_group_async([bodies[i] for i in group], client, semaphore) for group in groups],
+        return_exceptions=True
+    )
+
+    stragglers = []
+    for group, result in zip(groups, group_results):
+        if isinstance(result, Exception):
+            logger.warning(f"Grouped classification failed, retrying {len(group)} replies singly: {result}")
+            stragglers.extend(group)
+            continue
+
+        labels, tokens_used = result
+        share, extra = divmod(tokens_used, len(group))
+        for n, (i, label) in enumerate(zip(group, labels)):
+            results[i] = (label, share + (1 if n < extra else 0))
+
+    single_results = await asyncio.gather(
+        *[classify_intent_async(bodies[i], client, semaphore) for i in stragglers],
+        return_exceptions=True
+    )
+    for i, result in zip(stragglers, single_results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to classify intent: {result}")
+        else:
+            results[i] = result
+
+    return results
 
 
 class ReplyParser:
@@ -32,7 +336,8 @@ class ReplyParser:
         subject: str,
         body: str,
         received_at: datetime = None,
-        in_reply_to: str = None
+        in_reply_to: str = None,
+        draft: Optional[EmailDraft] = None
     ) -> Reply:
         """
         Parse and save an email reply.
@@ -44,56 +349,95 @@ class ReplyParser:
             body: Reply body (may contain HTML)
             received_at: When reply was received
             in_reply_to: Message-ID being replied to
+            draft: Already loaded draft, skips looking it up
 
         Returns:
             Reply object
         """
-        # Get the draft
-        draft = self.db.query(EmailDraft).filter(EmailDraft.id == draft_id).first()
-        if not draft:
-            raise ValueError(f"Draft {draft_id} not found")
+        reply = self._build_reply(draft_id, from_email, subject, body, received_at, in_reply_to, draft=draft)
 
-        # Strip HTML from body
-        plain_body = strip_html(body)
+        intent = reply.intent
+
+        self.db.add(reply)
+        if intent == ReplyIntent.INTERESTED:
+            self._mark_contacts_interested([draft_id])
+        self.db.commit()
+
+        logger.info(f"Parsed reply from {from_email} with intent: {intent.value}")
+
+        return reply
+
+    def _build_reply(
+        self,
+        draft_id: int,
+        from_email: str,
+        subject: str,
+        body: str,
+        received_at: datetime = None,
+        in_reply_to: str = None,
+        draft: Optional[EmailDraft] = None
+    ) -> Reply:
+        """Classify an incoming reply and return an unsaved Reply for it."""
+        plain_body = self._plain_body(draft_id, body, draft=draft)
 
         # Classify intent
         intent = self._classify_intent(plain_body)
 
+        return Reply(**self._reply_values(draft_id, from_email, subject, plain_body, intent, received_at, in_reply_to))
+
+    def _plain_body(self, draft_id: int, body: str, draft: Optional[EmailDraft] = None) -> str:
+        """Check the reply's draft exists and return the body without HTML."""
+        # Get the draft unless the caller already loaded it
+        if draft is None:
+            draft = self.db.get(EmailDraft, draft_id)
+        if not draft:
+            raise ValueError(f"Draft {draft_id} not found")
+
+        # Strip HTML from body
+        return _strip_reply_html(body)
+
+    def _reply_values(
+        self,
+        draft_id: int,
+        from_email: str,
+        subject: str,
+        plain_body: str,
+        intent: ReplyIntent,
+        received_at: datetime = None,
+        in_reply_to: str = None
+    ) -> Dict[str, Any]:
+        """Column values of a Reply row for an already classified body."""
         # Extract meeting availability if interested
         availability = None
         if intent == ReplyIntent.INTERESTED:
             availability = self._extract_availability(plain_body)
 
-        # Create reply record
-        reply = Reply(
-            draft_id=draft_id,
-            from_email=from_email,
-            subject=subject,
-            body=plain_body,
-            intent=intent,
-            received_at=received_at or datetime.utcnow(),
-            in_reply_to=in_reply_to,
-            availability_text=availability
+        return {
+            "draft_id": draft_id,
+            "from_email": from_email,
+            "subject": subject,
+            "body": plain_body,
+            "intent": intent,
+            "received_at": received_at or datetime.utcnow(),
+            "in_reply_to": in_reply_to,
+            "availability_text": availability,
+        }
+
+    def _mark_contacts_interested(self, draft_ids: List[int]) -> None:
+        """Move the contacts behind the given drafts to REPLIED_INTERESTED."""
+        if not draft_ids:
+            return
+
+        contact_ids = select(EmailDraft.contact_id).where(EmailDraft.id.in_(draft_ids))
+        self.db.execute(
+            update(Contact)
+            .where(Contact.id.in_(contact_ids))
+            .values(status=ContactStatus.REPLIED_INTERESTED)
         )
 
-        self.db.add(reply)
-        self.db.commit()
-        self.db.refresh(reply)
-
-        # Update contact status
-        contact = self.db.query(Contact).filter(Contact.id == draft.contact_id).first()
-        if contact and intent == ReplyIntent.INTERESTED:
-            from src.models import ContactStatus
-            contact.status = ContactStatus.REPLIED_INTERESTED
-            self.db.commit()
-
-        logger.info(f"Parsed reply from {from_email} with intent: {intent.value}")
-
-        return reply
-
     def _classify_intent(self, body: str) -> ReplyIntent:
         """
-        Classify reply intent using GPT-4.
+        Classify reply intent, asking GPT-4 only when no fast-path pattern matches.
 
         Args:
             body: Reply body text
@@ -101,59 +445,37 @@ class ReplyParser:
         Returns:
             ReplyIntent enum
         """
-        prompt = f"""Classify the intent of this email reply into one of these categories:
-- INTERESTED: Positive response, wants to continue conversation
-- DECLINE: Not interested, polite rejection
-- OUT_OF_OFFICE: Automated out-of-office reply
-- UNSUBSCRIBE: Wants to be removed from communications
-- QUESTION: Asking for more information
-- OTHER: Unclear or other intent
-
-Reply text:
-{body[:500]}
-
-Respond with ONLY the category name (e.g., "INTERESTED").
-"""
-
         try:
-            response = openai.chat.completions.create(
-                model=config.OPENAI_MODEL_GPT,
-                messages=[
-                    {"role": "system", "content": "You are an email intent classifier."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.0,
-                max_tokens=20
-            )
-
-            intent_str = response.choices[0].message.content.strip().upper()
-
-            # Track cost
-            if self.cost_tracker:
-                tokens_used = response.usage.total_tokens
-                cost = calculate_cost("classification", config.OPENAI_MODEL_GPT, tokens_used)
-                self.cost_tracker.track_operation(
-                    operation_type="reply_classification",
+            # Classification is deterministic, so identical replies reuse the stored label
+            intent_str = cached_intent_label(body)
+            if intent_str is None:
+                response = get_openai_client().chat.completions.create(
                     model=config.OPENAI_MODEL_GPT,
-                    tokens_used=tokens_used,
-                    cost=cost
+                    messages=_classification_messages(build_classification_prompt(body)),
+                    temperature=0.0,
+                    max_tokens=20
                 )
 
-            # Map to enum
-            intent_map = {
-                "INTERESTED": ReplyIntent.INTERESTED,
-                "DECLINE": ReplyIntent.DECLINE,
-                "OUT_OF_OFFICE": ReplyIntent.OUT_OF_OFFICE,
-                "UNSUBSCRIBE": ReplyIntent.UNSUBSCRIBE,
-                "QUESTION": ReplyIntent.QUESTION,
-                "OTHER": ReplyIntent.OTHER
-            }
+                intent_str = response.choices[0].message.content.strip().upper()
+                store_intent_label(body, intent_str)
 
-            return intent_map.get(intent_str, ReplyIntent.OTHER)
+                # Track cost (cache hits are free)
+                self._track_classification(response.usage.total_tokens)
+
+            return intent_from_label(intent_str)
 
         except Exception as e:
             logger.error(f"Failed to classify intent: {e}")
-            return ReplyIntent.OTHER
+            return ReplyIntent.MAYBE
+
+    def _track_classification(self, tokens_used: int) -> None:
+        """Record the cost of one classification call."""
+        if self.cost_tracker and tokens_used:
+            self.cost_tracker.track_operation(
+                operation_type="reply_classification",
+                model=config.OPENAI_MODEL_GPT,
+                tokens_used=tokens_used
+            )
 
     def _extract_availability(self, body: str) -> Optional[str]:
         """
@@ -165,25 +487,19 @@ Respond with ONLY the category name (e.g., "INTERESTED").
         Returns:
             Availability text or None
         """
-        # Simple keyword matching for availability
-        keywords = ["available", "free", "time", "tuesday", "wednesday", "thursday",
-                   "friday", "monday", "morning", "afternoon", "evening", "schedule"]
+        # One scan of the body rejects replies without any availability keyword
+        if not AVAILABILITY_PATTERN.search(body):
+            return None
 
-        body_lower = body.lower()
+        # Extract sentences with availability info, stopping at the first 2
+        availability_sentences = []
+        for sentence in body.split('.'):
+            if AVAILABILITY_PATTERN.search(sentence):
+                availability_sentences.append(sentence.strip())
+                if len(availability_sentences) == 2:
+                    break
 
-        # Check if any availability keywords present
-        if any(kw in body_lower for kw in keywords):
-            # Extract sentences with availability info
-            sentences = body.split('.')
-            availability_sentences = [
-                s.strip() for s in sentences
-                if any(kw in s.lower() for kw in keywords)
-            ]
-
-            if availability_sentences:
-                return ". ".join(availability_sentences[:2])  # Return first 2 relevant sentences
-
-        return None
+        return ". ".join(availability_sentences)
 
     def classify_reply_intent(self, reply_id: int) -> ReplyIntent:
         """
@@ -195,7 +511,7 @@ Respond with ONLY the category name (e.g., "INTERESTED").
         Returns:
             ReplyIntent enum
         """
-        reply = self.db.query(Reply).filter(Reply.id == reply_id).first()
+        reply = self.db.get(Reply, reply_id)
         if not reply:
             raise ValueError(f"Reply {reply_id} not found")
 
@@ -207,42 +523,132 @@ Respond with ONLY the category name (e.g., "INTERESTED").
         return intent
 
 
-def parse_reply_batch(
+async def parse_reply_batch_async(
     replies: list,
     db: Session,
-    cost_tracker: Optional[CostTracker] = None
+    cost_tracker: Optional[CostTracker] = None,
+    concurrency: int = DEFAULT_CLASSIFY_CONCURRENCY,
+    group_size: int = CLASSIFY_GROUP_SIZE
 ) -> list:
     """
-    Parse multiple replies in batch.
+    Parse multiple replies, classifying them concurrently.
+
+    Uncached replies are sent to GPT ``group_size`` per request, with up to
+    ``concurrency`` requests in flight; the parsed replies are then written
+    in one transaction.
 
     Args:
         replies: List of reply dicts with keys: draft_id, from_email, subject, body
         db: Database session
         cost_tracker: Optional cost tracker
+        concurrency: Maximum concurrent OpenAI requests
+        group_size: Replies labelled per OpenAI request
 
     Returns:
         List of Reply objects
     """
     parser = ReplyParser(db, cost_tracker=cost_tracker)
 
-    parsed_replies = []
+    # One SELECT for every draft in the batch instead of a lookup per reply
+    draft_ids = {reply_data["draft_id"] for reply_data in replies}
+    drafts = {
+        draft.id: draft
+        for draft in db.scalars(
+            select(EmailDraft).options(load_only(EmailDraft.id)).where(EmailDraft.id.in_(draft_ids))
+        )
+    }
+
+    pending: List[Tuple[Dict[str, Any], str]] = []
     for reply_data in replies:
+        draft_id = reply_data["draft_id"]
+        if draft_id not in drafts:
+            logger.error(f"Failed to parse reply from {reply_data.get('from_email')}: Draft {draft_id} not found")
+            continue
         try:
-            reply = parser.parse_reply(
-                draft_id=reply_data["draft_id"],
-                from_email=reply_data["from_email"],
-                subject=reply_data.get("subject", ""),
-                body=reply_data["body"],
-                received_at=reply_data.get("received_at"),
-                in_reply_to=reply_data.get("in_reply_to")
-            )
-            parsed_replies.append(reply)
+            pending.append((reply_data, parser._plain_body(draft_id, reply_data["body"], draft=drafts[draft_id])))
         except Exception as e:
             logger.error(f"Failed to parse reply from {reply_data.get('from_email')}: {e}")
 
+    if not pending:
+        return []
+
+    results = await classify_intents_async(
+        [plain_body for _, plain_body in pending],
+        concurrency=concurrency,
+        group_size=group_size
+    )
+
+    reply_rows = []
+    for (reply_data, plain_body), (label, tokens_used) in zip(pending, results):
+        if label is None:
+            intent = ReplyIntent.MAYBE
+        else:
+            parser._track_classification(tokens_used)
+            intent = intent_from_label(label)
+
+        reply_rows.append(parser._reply_values(
+            draft_id=reply_data["draft_id"],
+            from_email=reply_data["from_email"],
+            subject=reply_data.get("subject", ""),
+            plain_body=plain_body,
+            intent=intent,
+            received_at=reply_data.get("received_at"),
+            in_reply_to=reply_data.get("in_reply_to")
+        ))
+
+    # One multi-row INSERT for the whole batch instead of an add/flush per reply;
+    # ids come back in row order on every backend
+    reply_ids = db.scalars(
+        insert(Reply).returning(Reply.id, sort_by_parameter_order=True),
+        reply_rows
+    ).all()
+
+    parser._mark_contacts_interested(
+        list({row["draft_id"] for row in reply_rows if row["intent"] == ReplyIntent.INTERESTED})
+    )
+    db.commit()
+
+    # Load the committed rows with a single SELECT, in input order
+    loaded = {reply.id: reply for reply in db.scalars(select(Reply).where(Reply.id.in_(reply_ids)))}
+    parsed_replies = [loaded[reply_id] for reply_id in reply_ids]
+
+    logger.info(f"Parsed {len(parsed_replies)} replies in batch")
+
     return parsed_replies
 
 
+def parse_reply_batch(
+    replies: list,
+    db: Session,
+    cost_tracker: Optional[CostTracker] = None,
+    concurrency: int = DEFAULT_CLASSIFY_CONCURRENCY,
+    group_size: int = CLASSIFY_GROUP_SIZE
+) -> list:
+    """
+    Parse multiple replies in batch (blocking wrapper).
+
+    Runs :func:`parse_reply_batch_async` on a fresh event loop; async
+    callers should await that coroutine directly instead.
+
+    Args:
+        replies: List of reply dicts with keys: draft_id, from_email, subject, body
+        db: Database session
+        cost_tracker: Optional cost tracker
+        concurrency: Maximum concurrent OpenAI requests
+        group_size: Replies labelled per OpenAI request
+
+    Returns:
+        List of Reply objects
+    """
+    return run_with_openai(parse_reply_batch_async(
+        replies,
+        db,
+        cost_tracker=cost_tracker,
+        concurrency=concurrency,
+        group_size=group_size
+    ))
+
+
 def get_unprocessed_replies(db: Session, limit: int = 100) -> list:
     """
     Get replies that haven't been processed yet.
@@ -257,3 +663,138 @@ def get_unprocessed_replies(db: Session, limit: int = 100) -> list:
     return db.query(Reply).filter(
         Reply.intent == None
     ).limit(limit).all()
+
+
+def classify_replies_batch_api(
+    reply_bodies: List[Tuple[int, str]],
+    db: Session,
+    cost_tracker: Optional[CostTracker] = None,
+    poll_interval: float = BATCH_POLL_INITIAL
+) -> Dict[int, ReplyIntent]:
+    """
+    Classify stored replies through the OpenAI Batch API and save their intents.
+
+    Bodies matched by the fast path or with a cached label skip the batch.
+    The rest are uploaded as one JSONL file and the call blocks, polling
+    with a doubling interval, until the batch finishes (OpenAI allows up
+    to 24 hours). Replies the batch could not classify are left untouched
+    for the next run.
+
+    Args:
+        reply_bodies: (reply_id, plain-text body) pairs
+        db: Database session
+        cost_tracker: Optional cost tracker
+        poll_interval: Seconds before the first status check
+
+    Returns:
+        Dict mapping reply ID to the intent that was saved
+    """
+    labels: Dict[int, str] = {}
+    pending_bodies: Dict[int, str] = {}
+    lines = []
+
+    for reply_id, body in reply_bodies:
+        label = cached_intent_label(body)
+        if label:
+            labels[reply_id] = label
+            continue
+
+        pending_bodies[reply_id] = body
+        lines.append(json.dumps({
+            "custom_id": str(reply_id),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": config.OPENAI_MODEL_GPT,
+                "messages": _classification_messages(build_classification_prompt(body)),
+                "temperature": 0.0,
+                "max_tokens": 20
+            }
+        }))
+
+    if lines:
+        client = get_openai_client()
+        batch_file = client.files.create(
+            file=("reply_classification.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted {len(lines)} replies for batch classification ({batch.id})")
+
+        delay = poll_interval
+        while batch.status not in BATCH_TERMINAL_STATUSES:
+            time.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX)
+            batch = client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            logger.error(f"Batch {batch.id} ended with status {batch.status}")
+
+        # Expired and cancelled batches still return whatever finished
+        if batch.output_file_id:
+            parser = ReplyParser(db, cost_tracker=cost_tracker)
+            for line in client.files.content(batch.output_file_id).text.splitlines():
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+
+                reply_id = int(result["custom_id"])
+                label = response["body"]["choices"][0]["message"]["content"].strip().upper()
+                store_intent_label(pending_bodies[reply_id], label)
+                parser._track_classification(response["body"]["usage"]["total_tokens"])
+                labels[reply_id] = label
+
+    intents = {reply_id: intent_from_label(label) for reply_id, label in labels.items()}
+    if intents:
+        db.bulk_update_mappings(Reply, [
+            {"id": reply_id, "intent": intent} for reply_id, intent in intents.items()
+        ])
+        db.commit()
+
+    logger.info(f"Classified {len(intents)} of {len(reply_bodies)} replies via batch")
+
+    return intents
+
+
+def classify_unprocessed_replies(
+    db: Session,
+    limit: int = 100,
+    cost_tracker: Optional[CostTracker] = None
+) -> Dict[int, ReplyIntent]:
+    """
+    Classify replies that have no intent yet.
+
+    Uses the Batch API when ``USE_BATCH_API`` is enabled, otherwise
+    classifies each reply in real time.
+
+    Args:
+        db: Database session
+        limit: Maximum number of replies to classify
+        cost_tracker: Optional cost tracker
+
+    Returns:
+        Dict mapping reply ID to its new intent
+    """
+    replies = get_unprocessed_replies(db, limit=limit)
+    if not replies:
+        return {}
+
+    if config.USE_BATCH_API:
+        return classify_replies_batch_api(
+            [(reply.id, reply.body or "") for reply in replies],
+            db,
+            cost_tracker=cost_tracker
+        )
+
+    parser = ReplyParser(db, cost_tracker=cost_tracker)
+    intents = {}
+    for reply in replies:
+        reply.intent = intents[reply.id] = parser._classify_intent(reply.body or "")
+    db.commit()
+
+    return intents
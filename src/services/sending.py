@@ -4,19 +4,48 @@ Email sending service via SMTP or Gmail API.
 
 from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from src.models import EmailDraft, DraftStatus
 from src.config import config
 from src.services.quota_manager import GmailQuotaManager
 from src.services.spam_checker import check_spam_score
+from src.utils.cache import invalidate_drafts
 from src.utils.helpers import is_business_hours, schedule_for_next_business_time
+import httpx
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Caps concurrent provider connections across request threads and background sends
+_send_slots = threading.BoundedSemaphore(config.MAX_CONCURRENT_SENDS)
+
+# Lazy-load the webhook HTTP client so connections are reused across sends
+_http_client = None
+
+
+def get_http_client() -> httpx.Client:
+    """Get or create the shared HTTP client for webhook providers."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            timeout=30,
+            limits=httpx.Limits(max_connections=config.MAX_CONCURRENT_SENDS)
+        )
+    return _http_client
+
+
+def close_http_client() -> None:
+    """Close the shared HTTP client, if one was created."""
+    global _http_client
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
 
 class DraftNotApprovedError(Exception):
     """Raised when trying to send unapproved draft."""
@@ -57,7 +86,7 @@ def send_email_smtp(draft: EmailDraft, from_email: str = None) -> tuple:
 
     # Send via SMTP
     try:
-        with smtplib.SMTP(config.SMTP_HOST, config.SMTP_PORT, timeout=30) as server:
+        with _send_slots, smtplib.SMTP(config.SMTP_HOST, config.SMTP_PORT, timeout=30) as server:
             if config.SMTP_USE_TLS:
                 server.starttls()
 
@@ -98,8 +127,6 @@ def send_email_powerautomate(draft: EmailDraft) -> tuple:
     Returns:
         Tuple of (message_id, thread_id)
     """
-    import requests
-
     webhook_url = config.POWER_AUTOMATE_WEBHOOK_URL
 
     if not webhook_url:
@@ -115,7 +142,8 @@ def send_email_powerautomate(draft: EmailDraft) -> tuple:
 
     try:
         # Send to Power Automate webhook
-        response = requests.post(webhook_url, json=payload, timeout=30)
+        with _send_slots:
+            response = get_http_client().post(webhook_url, json=payload)
 
         if response.status_code in [200, 202]:
             # Success
@@ -129,7 +157,7 @@ def send_email_powerautomate(draft: EmailDraft) -> tuple:
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Power Automate request failed: {e}")
         raise ValueError(f"Failed to call Power Automate webhook: {e}")
 
@@ -142,7 +170,8 @@ def send_email(
     current_time: datetime = None,
     respect_business_hours: bool = None,
     config_obj = None,
-    quota_tracker: Optional[GmailQuotaManager] = None
+    quota_tracker: Optional[GmailQuotaManager] = None,
+    draft: Optional[EmailDraft] = None
 ) -> dict:
     """
     Send an email draft.
@@ -156,11 +185,13 @@ def send_email(
         respect_business_hours: Respect business hours
         config_obj: Optional config object
         quota_tracker: Optional quota tracker
+        draft: Already loaded draft, skips the lookup
 
     Returns:
         Dictionary with status and metadata
     """
-    draft = db.query(EmailDraft).filter(EmailDraft.id == draft_id).first()
+    if draft is None:
+        draft = db.get(EmailDraft, draft_id)
 
     if not draft:
         raise ValueError(f"Draft {draft_id} not found")
@@ -196,6 +227,7 @@ def send_email(
             scheduled_time = schedule_for_next_business_time(check_time)
             draft.status = DraftStatus.SCHEDULED
             db.commit()
+            invalidate_drafts(draft_id)
             return {
                 "status": "SCHEDULED",
                 "scheduled_time": scheduled_time
@@ -219,6 +251,7 @@ def send_email(
                 logger.error(f"SMTP send failed: {e}")
                 draft.status = DraftStatus.SEND_FAILED
                 db.commit()
+                invalidate_drafts(draft_id)
                 raise
 
         elif provider == "powerautomate":
@@ -229,6 +262,7 @@ def send_email(
                 logger.error(f"Power Automate send failed: {e}")
                 draft.status = DraftStatus.SEND_FAILED
                 db.commit()
+                invalidate_drafts(draft_id)
                 raise
 
         elif provider == "gmail":
@@ -246,6 +280,7 @@ def send_email(
     draft.thread_id = thread_id
     draft.sent_at = datetime.utcnow()
     db.commit()
+    invalidate_drafts(draft_id)
 
     # Increment quota
     if quota_tracker:
@@ -265,7 +300,8 @@ def send_emails_bulk(
     db: Session,
     gmail_credentials: dict = None,
     rate_limit: int = None,
-    quota_tracker: Optional[GmailQuotaManager] = None
+    quota_tracker: Optional[GmailQuotaManager] = None,
+    mock_mode: bool = False
 ) -> List[dict]:
     """
     Send multiple emails in bulk.
@@ -276,10 +312,37 @@ def send_emails_bulk(
         gmail_credentials: Gmail credentials
         rate_limit: Maximum emails to send
         quota_tracker: Optional quota tracker
+        mock_mode: If True, don't actually send
 
     Returns:
         List of result dictionaries
     """
+    # One IN query for the whole batch instead of a lookup per draft
+    drafts = {
+        draft.id: draft
+        for draft in db.scalars(select(EmailDraft).where(EmailDraft.id.in_(draft_ids)))
+    }
+
+    # Each send commits; keep the prefetched drafts loaded across those commits
+    expire_on_commit, db.expire_on_commit = db.expire_on_commit, False
+    try:
+        return _send_prefetched(
+            draft_ids, drafts, db, gmail_credentials, rate_limit, quota_tracker, mock_mode
+        )
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
+def _send_prefetched(
+    draft_ids: List[int],
+    drafts: dict,
+    db: Session,
+    gmail_credentials: dict,
+    rate_limit: Optional[int],
+    quota_tracker: Optional[GmailQuotaManager],
+    mock_mode: bool
+) -> List[dict]:
+    """Send already loaded drafts in ``draft_ids`` order."""
     results = []
     sent_count = 0
 
@@ -301,7 +364,14 @@ def send_emails_bulk(
             continue
 
         try:
-            result = send_email(draft_id, db, gmail_credentials, quota_tracker=quota_tracker)
+            result = send_email(
+                draft_id,
+                db,
+                gmail_credentials,
+                mock_mode=mock_mode,
+                quota_tracker=quota_tracker,
+                draft=drafts.get(draft_id)
+            )
             result["draft_id"] = draft_id
             results.append(result)
 
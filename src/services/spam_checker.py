@@ -4,7 +4,7 @@ Spam score checking service.
 
 from typing import List, Tuple
 from src.models import EmailDraft
-from src.utils.helpers import calculate_spam_score
+from src.utils.helpers import calculate_spam_score, caps_ratio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,8 +30,7 @@ def check_spam_score(draft: EmailDraft) -> dict:
     body = draft.body or ""
     subject = draft.subject or ""
 
-    caps_ratio = sum(1 for c in body if c.isupper()) / max(len(body), 1)
-    if caps_ratio > 0.3:
+    if caps_ratio(body) > 0.3:
         warnings.append("Excessive caps")
 
     if "!!!" in body or "???" in body:
@@ -71,8 +70,7 @@ def analyze_spam_factors(draft: EmailDraft) -> dict:
         suggestions.append("Reduce excessive punctuation")
 
     # Check for excessive caps
-    caps_ratio = sum(1 for c in body if c.isupper()) / max(len(body), 1)
-    if caps_ratio > 0.3:
+    if caps_ratio(body) > 0.3:
         suggestions.append("Reduce caps - use sentence case")
 
     # Check subject line
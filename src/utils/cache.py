@@ -0,0 +1,133 @@
+"""
+Caches: an in-process TTL cache for hot read endpoints and an on-disk,
+content-addressed cache for deterministic OpenAI results.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional, Tuple
+
+from src.config import config
+
+# Upper bound on cached responses before least recently used entries are evicted
+RESPONSE_CACHE_SIZE = 10_000
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a per-key TTL."""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None when missing, expired or caching is disabled."""
+        if not config.CACHE_ENABLED:
+            return None
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds."""
+        if not config.CACHE_ENABLED:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: Hashable) -> None:
+        """Drop the given keys if present."""
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+
+
+# Shared cache for API read endpoints
+response_cache = TTLCache()
+
+
+def invalidate_drafts(*draft_ids: int) -> None:
+    """Drop cached draft responses; call after committing a change to those drafts."""
+    response_cache.delete(*(f"draft:{draft_id}" for draft_id in draft_ids))
+
+
+class DiskCache:
+    """
+    Content-addressed byte cache under a directory, shared by every worker.
+
+    Keys are SHA-256 digests of the inputs that determine a result, so the
+    same prompt or text always maps to the same file. Entries older than
+    ``ttl`` seconds are treated as missing.
+    """
+
+    def __init__(self, directory: Path, ttl: float):
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Digest the given parts into a cache key."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached bytes, or None when missing, expired or caching is disabled."""
+        if not config.CACHE_ENABLED:
+            return None
+
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store bytes for ``key``; failures only cost a future cache miss."""
+        if not config.CACHE_ENABLED:
+            return
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+
+# OpenAI results that are deterministic for their inputs
+llm_cache = DiskCache(config.CACHE_DIR / "llm", ttl=7 * 86400)
+embedding_cache = DiskCache(config.CACHE_DIR / "embeddings", ttl=30 * 86400)
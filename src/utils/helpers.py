@@ -8,17 +8,28 @@ import json
 import hashlib
 import secrets
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, TypeVar
 from io import StringIO
 import logging
 
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    HTMLParser = None
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 
 def validate_email(email: str) -> bool:
     """Validate email format."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return EMAIL_PATTERN.match(email) is not None
 
 
 def parse_csv_content(csv_content: str) -> List[Dict[str, str]]:
@@ -68,27 +79,57 @@ def parse_contact_id_from_token(token: str) -> Optional[int]:
     return int(match.group(1)) if match else None
 
 
+SCRIPT_STYLE_PATTERN = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
 def strip_html(html: str) -> str:
     """
     Strip HTML tags from text.
 
+    Uses selectolax's C parser when it is installed, regexes otherwise.
+    Text without any tags skips parsing entirely.
+
     Args:
         html: HTML content
 
     Returns:
         Plain text with HTML tags removed
     """
-    # Remove script and style elements
-    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
-
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', ' ', html)
+    if "<" not in html:
+        text = html
+    elif HTMLParser is not None:
+        tree = HTMLParser(html)
+        tree.strip_tags(["script", "style"])
+        text = tree.text(separator=" ")
+    else:
+        # Remove script and style elements, then the remaining tags
+        html = SCRIPT_STYLE_PATTERN.sub('', html)
+        text = HTML_TAG_PATTERN.sub(' ', html)
 
     # Clean up whitespace
-    text = re.sub(r'\s+', ' ', text)
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
 
-    return text.strip()
+TEMPLATE_PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+# Substituted when a template variable is None or empty
+TEMPLATE_FALLBACKS = {
+    "company": "your organization",
+    "industry": "your industry",
+}
+
+
+@lru_cache(maxsize=256)
+def compile_template(template: str) -> Tuple[str, ...]:
+    """
+    Split a template into alternating literal text and placeholder names.
+
+    Bulk drafting renders the same subject and body for every contact, so
+    each distinct template is only scanned once.
+    """
+    return tuple(TEMPLATE_PLACEHOLDER_PATTERN.split(template))
 
 
 def replace_template_variables(template: str, variables: Dict[str, Any]) -> str:
@@ -102,25 +143,23 @@ def replace_template_variables(template: str, variables: Dict[str, Any]) -> str:
     Returns:
         String with variables replaced
     """
-    result = template
+    parts = list(compile_template(template))
 
-    for key, value in variables.items():
-        placeholder = f"{{{{{key}}}}}"
+    # Odd positions hold placeholder names; unknown ones are left as written
+    for i in range(1, len(parts), 2):
+        key = parts[i]
+        if key not in variables:
+            parts[i] = f"{{{{{key}}}}}"
+            continue
 
         # Handle None/empty values with fallbacks
+        value = variables[key]
         if value is None or value == "":
-            if key == "company":
-                value = "your organization"
-            elif key == "industry":
-                value = "your industry"
-            elif key == "title":
-                value = ""
-            else:
-                value = ""
+            value = TEMPLATE_FALLBACKS.get(key, "")
 
-        result = result.replace(placeholder, str(value))
+        parts[i] = str(value)
 
-    return result
+    return "".join(parts)
 
 
 def is_business_hours(dt: datetime, timezone: str = "UTC") -> bool:
@@ -239,6 +278,25 @@ def contains_spam_triggers(text: str) -> bool:
     return any(word in text_lower for word in spam_words)
 
 
+ASCII_UPPERCASE_BYTES = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def caps_ratio(text: str) -> float:
+    """
+    Share of characters in text that are capital letters.
+
+    ASCII text is counted by deleting capitals from its bytes in one C
+    pass; other text falls back to isupper() so non-Latin capitals count.
+    """
+    if not text:
+        return 0.0
+    if not text.isascii():
+        return sum(1 for c in text if c.isupper()) / len(text)
+    encoded = text.encode("ascii")
+    caps = len(encoded) - len(encoded.translate(None, ASCII_UPPERCASE_BYTES))
+    return caps / len(text)
+
+
 def calculate_spam_score(subject: str, body: str) -> float:
     """
     Calculate spam score for email.
@@ -253,10 +311,8 @@ def calculate_spam_score(subject: str, body: str) -> float:
     score = 0.0
 
     # Check for excessive caps
-    if body:
-        caps_ratio = sum(1 for c in body if c.isupper()) / max(len(body), 1)
-        if caps_ratio > 0.3:
-            score += 3.0
+    if caps_ratio(body) > 0.3:
+        score += 3.0
 
     # Check for excessive punctuation
     if "!!!" in body or "???" in body:
@@ -276,6 +332,37 @@ def calculate_spam_score(subject: str, body: str) -> float:
     return min(score, 10.0)
 
 
+def calculate_quality_score(subject: str, body: str) -> float:
+    """
+    Score a generated draft for auto-approval.
+
+    Args:
+        subject: Email subject
+        body: Email body, before the unsubscribe footer is added
+
+    Returns:
+        Quality score (0-10, higher is better): 10 minus the spam score,
+        less penalties for a missing subject or unfilled placeholders
+    """
+    score = 10.0 - calculate_spam_score(subject, body)
+
+    if not (subject or "").strip():
+        score -= 3.0
+
+    # Template variables that were never substituted
+    if TEMPLATE_PLACEHOLDER_PATTERN.search(subject or "") or TEMPLATE_PLACEHOLDER_PATTERN.search(body or ""):
+        score -= 5.0
+
+    return max(score, 0.0)
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Yield successive lists of at most ``size`` items."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
 def truncate_text(text: str, max_length: int = 150) -> str:
     """Truncate text to maximum word count."""
     words = text.split()
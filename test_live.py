@@ -4,16 +4,24 @@ Simple live test showing the API works.
 Run with: python3 test_live.py (while server is running)
 """
 
+import atexit
 import requests
 import json
+from requests.adapters import HTTPAdapter
 
 BASE = "http://localhost:8000"
 
+# Reuse one keep-alive connection pool for every step instead of reconnecting per call
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+SESSION.headers.update({"Connection": "keep-alive"})
+atexit.register(SESSION.close)
+
 print("\n🚀 AI-DRIVEN OUTREACH ENGINE - LIVE TEST\n")
 
 # 1. Health check
 print("1️⃣  Health Check")
-r = requests.get(f"{BASE}/health")
+r = SESSION.get(f"{BASE}/health")
 print(f"   Status: {r.json()}")
 print()
 
@@ -27,18 +35,18 @@ contacts = [
 
 contact_ids = []
 for contact in contacts:
-    r = requests.post(f"{BASE}/api/contacts/", json=contact)
-    if r.status_code == 200:
-        data = r.json()
-        contact_ids.append(data['id'])
-        print(f"   ✅ Created: {data['name']} (ID: {data['id']})")
+    r = SESSION.post(f"{BASE}/api/contacts/", json=contact)
+    if r.status_code == 201:
+        contact_id = int(r.headers['Location'].rsplit('/', 1)[-1])
+        contact_ids.append(contact_id)
+        print(f"   ✅ Created: {contact['name']} (ID: {contact_id})")
     else:
         print(f"   ⚠️  Skipped: {contact['name']} - {r.status_code}")
 print()
 
 # 3. List all contacts
 print("3️⃣  Listing All Contacts")
-r = requests.get(f"{BASE}/api/contacts/")
+r = SESSION.get(f"{BASE}/api/contacts/")
 contacts_list = r.json()
 print(f"   Total contacts: {len(contacts_list)}")
 for c in contacts_list[:5]:
@@ -48,7 +56,7 @@ print()
 # 4. Create a draft
 if contact_ids:
     print("4️⃣  Creating Email Draft")
-    r = requests.post(f"{BASE}/api/drafts/", json={
+    r = SESSION.post(f"{BASE}/api/drafts/", json={
         "contact_id": contact_ids[0],
         "subject": "Quick question about {{company}}",
         "body": "Hi {{name}},\n\nI noticed your work at {{company}} and thought you'd be interested in...\n\nBest regards"
@@ -64,7 +72,7 @@ if contact_ids:
 
         # 5. Check spam score
         print("5️⃣  Checking Spam Score")
-        r = requests.get(f"{BASE}/api/drafts/{draft_id}/spam-score")
+        r = SESSION.get(f"{BASE}/api/drafts/{draft_id}/spam-score")
         spam = r.json()
         print(f"   Score: {spam['score']}/10")
         print(f"   Recommendation: {spam['recommendation']}")
@@ -72,31 +80,31 @@ if contact_ids:
 
         # 6. Approve draft
         print("6️⃣  Approving Draft")
-        r = requests.post(f"{BASE}/api/drafts/{draft_id}/approve", json={"notes": "Looks good!"})
+        r = SESSION.post(f"{BASE}/api/drafts/{draft_id}/approve", json={"notes": "Looks good!"})
         result = r.json()
         print(f"   {result['message']}")
         print()
 
         # 7. Send (mock mode)
         print("7️⃣  Sending Email (Mock Mode)")
-        r = requests.post(f"{BASE}/api/drafts/{draft_id}/send", json={"mock_mode": True})
+        r = SESSION.post(f"{BASE}/api/drafts/{draft_id}/send", json={"mock_mode": True})
         result = r.json()
         print(f"   Status: {result['status']}")
         print()
 
 # 8. Campaign stats
 print("8️⃣  Campaign Statistics")
-r = requests.get(f"{BASE}/api/campaigns/stats")
+r = SESSION.get(f"{BASE}/api/campaigns/stats")
 stats = r.json()
 print(json.dumps(stats, indent=2))
 print()
 
 # 9. Export
 print("9️⃣  Exporting Contacts")
-r = requests.get(f"{BASE}/api/contacts/export/csv")
-result = r.json()
-csv_lines = result['content'].split('\n')
-print(f"   Filename: {result['filename']}")
+r = SESSION.get(f"{BASE}/api/contacts/export/csv")
+csv_lines = r.text.split('\n')
+filename = r.headers['Content-Disposition'].split('filename=')[-1].strip('"')
+print(f"   Filename: {filename}")
 print(f"   Total lines: {len(csv_lines)}")
 print(f"   Headers: {csv_lines[0]}")
 print()
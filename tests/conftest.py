@@ -2,11 +2,17 @@
 Pytest configuration and shared fixtures for the AI outreach engine tests.
 """
 
+import sys
 import pytest
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from pathlib import Path
 from unittest.mock import Mock, MagicMock
 from typing import List, Dict, Any
 
+# Let query-count tests import the real services from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 
 # ============================================================================
 # Database Fixtures
@@ -22,6 +28,51 @@ def db():
     database.close()
 
 
+@pytest.fixture
+def sql_db():
+    """Real SQLAlchemy session on a fresh in-memory SQLite database."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from src.models import Base
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@contextmanager
+def count_queries(session):
+    """
+    Collect every SQL statement the session's engine executes in the block.
+
+    Usage:
+        with count_queries(sql_db) as statements:
+            ...
+        assert len(statements) <= 3
+    """
+    from sqlalchemy import event
+
+    engine = session.get_bind()
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
 # ============================================================================
 # API Mock Fixtures
 # ============================================================================
@@ -0,0 +1,186 @@
+"""
+HTTP checks for the real FastAPI app against a temporary SQLite file.
+Category: API responses (7 tests)
+"""
+
+import pytest
+
+
+@pytest.fixture
+def api(tmp_path):
+    """TestClient whose async sessions use a fresh database, plus a sync session on it."""
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import NullPool
+    from main import app
+    from src.database import get_async_db, get_db
+    from src.models import Base
+    from src.utils.cache import response_cache
+
+    url = f"sqlite:///{tmp_path / 'api.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    # A file database and no pooling, so the app's event loop opens its own connections
+    async_engine = create_async_engine(url.replace("sqlite", "sqlite+aiosqlite", 1), poolclass=NullPool)
+    async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    sync_session = sessionmaker(bind=engine, autoflush=False)
+
+    async def override_get_async_db():
+        async with async_session() as db:
+            yield db
+
+    def override_get_db():
+        db = sync_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = override_get_db
+    response_cache.clear()
+    session = sync_session()
+    try:
+        yield TestClient(app), session
+    finally:
+        session.close()
+        app.dependency_overrides.pop(get_async_db, None)
+        app.dependency_overrides.pop(get_db, None)
+        response_cache.clear()
+        engine.dispose()
+
+
+def _seed_reply(db):
+    """Create one contact with a draft and a reply; return (draft_id, reply_id)."""
+    from datetime import datetime
+    from src.models import Contact, EmailDraft, Reply, ReplyIntent
+
+    contact = Contact(name="User", email="user@example.com")
+    draft = EmailDraft(contact=contact, to_email=contact.email, subject="Hello", body="Hi there")
+    reply = Reply(
+        draft=draft,
+        from_email=contact.email,
+        subject="Re: Hello",
+        body="Sounds interesting",
+        intent=ReplyIntent.INTERESTED,
+        received_at=datetime(2024, 1, 2, 3, 4, 5)
+    )
+    db.add(reply)
+    db.commit()
+    return draft.id, reply.id
+
+
+def test_get_draft_returns_stored_row(api):
+    """A stored draft serializes, including its created_at timestamp."""
+    client, db = api
+    draft_id, _ = _seed_reply(db)
+
+    response = client.get(f"/api/drafts/{draft_id}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["id"] == draft_id
+    assert body["subject"] == "Hello"
+    assert body["created_at"]
+
+
+def test_list_replies_returns_stored_row(api):
+    """A stored reply serializes, including its received_at timestamp."""
+    client, db = api
+    _, reply_id = _seed_reply(db)
+
+    response = client.get("/api/replies/")
+
+    assert response.status_code == 200
+    [reply] = response.json()
+    assert reply["id"] == reply_id
+    assert reply["received_at"] == "2024-01-02T03:04:05"
+
+
+def test_list_replies_accepts_rows_without_subject(api):
+    """Replies stored before the subject column existed have NULL there and still list."""
+    from src.models import Reply
+
+    client, db = api
+    _, reply_id = _seed_reply(db)
+    db.query(Reply).update({Reply.subject: None})
+    db.commit()
+
+    response = client.get("/api/replies/")
+
+    assert response.status_code == 200
+    [reply] = response.json()
+    assert reply["subject"] is None
+
+
+def test_approve_draft_returns_approved_draft(api):
+    """The approve endpoint returns the committed draft, not an expired empty object."""
+    client, db = api
+    draft_id, _ = _seed_reply(db)
+
+    response = client.post(f"/api/drafts/{draft_id}/approve", json={"notes": "Looks good"})
+
+    assert response.status_code == 200
+    draft = response.json()["draft"]
+    assert draft["id"] == draft_id
+    assert draft["status"] == "approved"
+
+
+def test_get_draft_not_stale_after_auto_approve(api):
+    """Approving outside the drafts endpoints still drops the cached draft response."""
+    from src.models import EmailDraft
+    from src.services.approval import ApprovalWorkflow
+
+    client, db = api
+    draft_id, _ = _seed_reply(db)
+    db.query(EmailDraft).update({EmailDraft.quality_score: 9.0})
+    db.commit()
+
+    assert client.get(f"/api/drafts/{draft_id}").json()["status"] == "pending_approval"
+
+    ApprovalWorkflow(db).auto_approve_drafts(quality_threshold=8.0)
+
+    assert client.get(f"/api/drafts/{draft_id}").json()["status"] == "approved"
+
+
+def test_list_and_get_contact_return_stored_row(api):
+    """A stored contact serializes from both the list and detail endpoints."""
+    client, db = api
+    _seed_reply(db)
+
+    listed = client.get("/api/contacts/")
+    assert listed.status_code == 200
+    [contact] = listed.json()
+    assert contact["email"] == "user@example.com"
+    assert contact["created_at"]
+
+    fetched = client.get(f"/api/contacts/{contact['id']}")
+    assert fetched.status_code == 200
+    assert fetched.json() == contact
+
+
+def test_cluster_contacts_with_stored_embeddings(api):
+    """Clustering contacts that already carry embeddings succeeds without calling OpenAI."""
+    from src.models import Contact
+
+    client, db = api
+    vectors = [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [0.1, 0.9]]
+    contacts = [
+        Contact(name=f"User{i}", email=f"user{i}@example.com", embedding=vector)
+        for i, vector in enumerate(vectors)
+    ]
+    db.add_all(contacts)
+    db.commit()
+    ids = [contact.id for contact in contacts]
+
+    response = client.post(
+        "/api/campaigns/cluster",
+        json={"contact_ids": ids, "n_clusters": 2, "auto_k": False}
+    )
+
+    assert response.status_code == 200
+    groups = sorted(sorted(cluster["contacts"]) for cluster in response.json())
+    assert groups == [ids[:2], ids[2:]]
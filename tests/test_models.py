@@ -0,0 +1,39 @@
+"""
+Column type round-trips for the real SQLAlchemy models.
+Category: Storage encoding (2 tests)
+"""
+
+import struct
+
+import numpy as np
+
+
+def test_embedding_round_trips_vector_starting_with_bracket_byte(sql_db):
+    """A packed vector whose first byte is 0x5B ("[") is not mistaken for legacy JSON."""
+    from src.models import Contact
+
+    first = struct.unpack("<f", b"[\x00\x80\x3f")[0]
+    vector = np.array([first, 0.25, -1.5], dtype=np.float32)
+    assert vector.tobytes()[:1] == b"["
+
+    sql_db.add(Contact(name="User", email="user@example.com", embedding=vector))
+    sql_db.commit()
+    sql_db.expunge_all()
+
+    loaded = sql_db.query(Contact).one().embedding
+    np.testing.assert_array_equal(loaded, vector)
+
+
+def test_embedding_reads_legacy_json_rows(sql_db):
+    """Rows written as a JSON array before the float32 switch still load."""
+    from sqlalchemy import text
+    from src.models import Contact
+
+    sql_db.add(Contact(name="User", email="user@example.com"))
+    sql_db.commit()
+    sql_db.execute(text("UPDATE contacts SET embedding = :value"), {"value": b"[0.5, 1.0]"})
+    sql_db.commit()
+    sql_db.expunge_all()
+
+    loaded = sql_db.query(Contact).one().embedding
+    np.testing.assert_array_equal(loaded, np.array([0.5, 1.0], dtype=np.float32))
@@ -0,0 +1,78 @@
+"""
+Query-count guards for the database-heavy services.
+Category: N+1 regression checks (3 tests)
+
+Each test runs a real service against in-memory SQLite at two input sizes
+and asserts the number of SQL statements does not grow with the input.
+"""
+
+import pytest
+from datetime import datetime
+from conftest import count_queries
+from test_helpers import generate_csv_with_n_contacts
+
+
+def _seed_campaign(db, n: int):
+    """Create n contacts, each with one draft and one reply."""
+    from src.models import Contact, EmailDraft, Reply, ReplyIntent
+
+    for i in range(n):
+        contact = Contact(name=f"User{i}", email=f"user{i}@example.com")
+        draft = EmailDraft(contact=contact, to_email=contact.email, subject="Hello")
+        db.add(Reply(
+            draft=draft,
+            from_email=contact.email,
+            body="Sounds interesting",
+            intent=ReplyIntent.INTERESTED,
+            received_at=datetime.utcnow()
+        ))
+    db.commit()
+    db.expunge_all()
+
+
+@pytest.mark.parametrize("n", [5, 200])
+def test_import_contacts_query_count(sql_db, n):
+    """One duplicate lookup and one bulk insert per batch, whatever the row count."""
+    from src.services.import_export import import_contacts
+
+    with count_queries(sql_db) as statements:
+        result = import_contacts(generate_csv_with_n_contacts(n), sql_db)
+
+    assert result.success_count == n
+    assert len(statements) <= 3
+
+
+@pytest.mark.parametrize("n", [5, 200])
+def test_export_campaign_data_query_count(sql_db, n):
+    """Contacts, drafts and replies load in three statements, not one per row."""
+    from src.services.import_export import export_campaign_data
+
+    _seed_campaign(sql_db, n)
+
+    with count_queries(sql_db) as statements:
+        data = export_campaign_data(sql_db)
+
+    assert len(data["contacts"]) == len(data["drafts"]) == len(data["replies"]) == n
+    assert len(statements) == 3
+
+
+@pytest.mark.parametrize("n", [1, 50])
+def test_delete_contact_data_query_count(sql_db, n):
+    """Anonymizing a contact's drafts is one UPDATE regardless of draft count."""
+    from src.models import Contact, EmailDraft
+    from src.services.import_export import delete_contact_data
+
+    contact = Contact(name="User", email="user@example.com")
+    sql_db.add_all(
+        EmailDraft(contact=contact, to_email=contact.email, subject="Hello")
+        for _ in range(n)
+    )
+    sql_db.commit()
+    contact_id = contact.id
+    sql_db.expunge_all()
+
+    with count_queries(sql_db) as statements:
+        assert delete_contact_data(sql_db, contact_id)
+
+    assert len(statements) <= 3
+    assert {d.to_email for d in sql_db.query(EmailDraft)} == {f"deleted_{contact_id}@deleted.com"}
@@ -0,0 +1,100 @@
+"""
+Behaviour checks for the real services against in-memory SQLite.
+Category: Service regressions (5 tests)
+"""
+
+import io
+
+
+def test_import_stream_keeps_numeric_values_under_capitalized_headers(sql_db):
+    """Capitalized headers are still read as text, so numeric values import as strings."""
+    from src.models import Contact
+    from src.services.import_export import import_contacts_stream
+
+    csv_bytes = (
+        b"Name,Email,Company,Title\n"
+        b"Alice,alice@example.com,123,007\n"
+        b"Bob,bob@example.com,456,42\n"
+    )
+
+    result = import_contacts_stream(io.BytesIO(csv_bytes), sql_db)
+
+    assert result.errors == []
+    assert result.success_count == 2
+    alice = sql_db.query(Contact).filter_by(email="alice@example.com").one()
+    assert (alice.company, alice.title) == ("123", "007")
+
+
+def test_approve_draft_writes_audit_row(sql_db):
+    """Approving one draft updates it and records who moved it from which status."""
+    from src.models import AuditLog, Contact, DraftStatus, EmailDraft
+    from src.services.approval import approve_draft
+
+    contact = Contact(name="User", email="user@example.com")
+    draft = EmailDraft(contact=contact, to_email=contact.email, subject="Hello")
+    sql_db.add(draft)
+    sql_db.commit()
+
+    approved = approve_draft(draft.id, user_id=7, db=sql_db, notes="Looks good")
+
+    assert approved.status == DraftStatus.APPROVED
+    assert approved.approved_by == 7
+    audit = sql_db.query(AuditLog).one()
+    assert (audit.contact_id, audit.user_id, audit.action) == (contact.id, 7, "approve_draft")
+    assert (audit.old_status, audit.new_status) == ("pending_approval", "approved")
+    assert audit.details == {"draft_id": draft.id, "notes": "Looks good"}
+
+
+def test_caps_ratio_counts_non_ascii_capitals():
+    """All-caps Cyrillic or German text scores like all-caps English."""
+    from src.utils.helpers import caps_ratio, calculate_spam_score
+
+    assert caps_ratio("ПРИВЕТ") == 1.0
+    assert caps_ratio("GRÜSSE ÄRGER") == caps_ratio("GRUSSE ARGER")
+    assert caps_ratio("Hello WORLD") == 6 / 11
+    assert calculate_spam_score("Hallo", "КУПИТЕ СЕЙЧАС") >= 3.0
+
+
+def test_fast_path_ignores_quoted_followup():
+    """Phrases from our own quoted follow-up never label the sender's reply."""
+    from src.services.followup import LATER_FOLLOWUP_BODY
+    from src.services.reply_parser import match_intent_label
+    from src.utils.helpers import strip_html
+
+    quoted = "\n".join(f"> {line}" for line in LATER_FOLLOWUP_BODY.splitlines())
+    reply = f"Yes, I'd love to chat next Tuesday!\n\nOn Mon, Jan 1, 2024 Sam wrote:\n{quoted}"
+
+    assert match_intent_label(strip_html(reply)) is None
+    assert match_intent_label(strip_html(f"Sounds good.\n{quoted}")) is None
+    assert match_intent_label("I am away until Monday but then free") is None
+    assert match_intent_label("Thanks, but I'm not interested.") == "DECLINE"
+    assert match_intent_label("I am out of the office until May 3.") == "OUT_OF_OFFICE"
+
+
+def test_generated_drafts_are_scored_for_auto_approval(sql_db):
+    """Drafts get a quality score when generated, so the auto-approval sweep can act on it."""
+    from src.models import Contact, DraftStatus, EmailTemplate
+    from src.services.approval import ApprovalWorkflow
+    from src.services.drafting import generate_email_draft
+
+    clean = Contact(name="Ann", email="ann@example.com", company="Acme")
+    spammy = Contact(name="Bob", email="bob@example.com", company="Initech")
+    sql_db.add_all([clean, spammy])
+    sql_db.commit()
+
+    good = generate_email_draft(
+        clean, EmailTemplate(subject="Idea for {{company}}", body="Hi {{name}}, quick thought on your roadmap."), sql_db
+    )
+    bad = generate_email_draft(
+        spammy, EmailTemplate(subject="URGENT FREE OFFER", body="BUY NOW!!! CLICK HERE FOR CASH"), sql_db
+    )
+
+    assert good.quality_score == 10.0
+    assert bad.quality_score < 8.0
+
+    approved = ApprovalWorkflow(sql_db).auto_approve_drafts(quality_threshold=8.0)
+
+    assert [draft.id for draft in approved] == [good.id]
+    sql_db.expire_all()
+    assert good.status == DraftStatus.APPROVED
+    assert bad.status == DraftStatus.PENDING_APPROVAL